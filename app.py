@@ -3,181 +3,102 @@ import pandas as pd
 import os
 import plotly.graph_objects as go
 import numpy as np
-from scipy.stats import poisson
 import requests
 from io import StringIO
 import hashlib
 
+from jogosdodia.bundle import bundle_pairing, open_bundle
+from jogosdodia.data import LazyData, fetch_remote, load_datasets, load_errors, lookup, lookup_many, refresh_if_stale
+from jogosdodia.profile import PROFILE_SOURCES, fixture_league, format_percent, has_source, team_profile
+from jogosdodia.scoreline import correct_score, expected_goals, score_matrix, top_scorelines
+from jogosdodia.strength import strength_lambdas
+from jogosdodia.names import LEAGUE_KEYS, resolve_leagues
+from jogosdodia.inplay import RESULTS, match_engine
+from jogosdodia.leagues import league_context
+from jogosdodia.live import live_probabilities
+from jogosdodia.firstgoal import first_goal
+from jogosdodia.goallines import GOAL_LINE_SOURCES
+from jogosdodia.blend import blend_match
+from jogosdodia.slate import evaluate_slate
+from jogosdodia.strategies import REQUIRED_COLUMNS, STRATEGIES, apply_strategies
+from jogosdodia.teams import SIDEBAR_KEYS, get_team_universe
+from jogosdodia.widgets import frequency_bar
+from jogosdodia.profiler import get_profiler
+
 
 # Configuração da página
 st.set_page_config(page_title="Football Stats", layout="wide")
 
+# Perfil opcional de cada rerun (JOGOSDODIA_PROFILE=1, ou ?profile=1 na URL com JOGOSDODIA_PROFILE_QUERY=1)
+profiler = get_profiler("app", st.query_params.get("profile"))
+
 # ----------------------------
 # CONSTANTES E CONFIGURAÇÕES
 # ----------------------------
-DATA_URLS = {
-    "main": [
-        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/equipes_casa.csv",
-        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/equipes_fora.csv",
-        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/equipes_fora_Favorito.csv",
-        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/overall_stats.csv"
-    ],
-    "first_goal": [
-        "https://raw.githubusercontent.com/scooby75/firstgoal/main/scored_first_home.csv",
-        "https://raw.githubusercontent.com/scooby75/firstgoal/main/scored_first_away.csv"
-    ],
-    "goal_minute": [
-        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/momento_do_gol_home.csv",
-        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/momento_do_gol_away.csv"
-    ],
-    "goals_half": "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/Goals_Half.csv",
-    "goals_ht": [
-        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/CV_Goals_HT_Home.csv",
-        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/CV_Goals_HT_Away.csv"
-    ],
-    "goals_per_time": [
-        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/Goals_Per_Time_Home.csv",
-        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/Goals_Per_Time_Away.csv"
-    ],
-    "ppg_ht": [
-        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/PPG_HT_Home.csv",
-        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/PPG_HT_Away.csv"
-    ],
-     "relative_form": [
-        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/Relative_Form.csv"
-        
-    ]
-}
-
 COLUMN_NAMES = {
     "home": ["Liga", "PIH", "PIH_HA", "GD_Home", "PPG_Home", "GF_AVG_Home", "GA_AVG_Home", "Odd_Justa_MO", "Odd_Justa_HA", "Rank_Home"],
     "away": ["Liga", "PIA", "PIA_HA", "GD_Away", "PPG_Away", "GF_AVG_Away", "GA_AVG_Away", "Odd_Justa_MO", "Odd_Justa_HA", "Rank_Away"],
     "overall": ["Liga", "PIO", "PIO_HA", "GD_Overall", "PPG_Overall", "GF_AVG_Overall", "Odd_Justa_MO", "Odd_Justa_HA", "Rank_Overall"]
 }
 
+# Tabelas dos perfis por time (abas de análise e modelo dos jogos do dia)
+PROFILE_KEYS = list(dict.fromkeys(key for sources in PROFILE_SOURCES.values() for _, key in sources))
+
+# Dependências de cada aba: só a aba selecionada roda, e carrega apenas estas tabelas
+TAB_DATASETS = {
+    "🎯 FT": ["home_df", "away_df", "home_fg_df", "away_fg_df", "goals_half_df",
+              "cv_home_df", "cv_away_df", "goals_per_time_home_df", "goals_per_time_away_df"],
+    "🎯 HT": PROFILE_KEYS,
+    "🧾 Analise": PROFILE_KEYS + [source["key"] for source in GOAL_LINE_SOURCES.values()],
+    "🧾 Analise HT": PROFILE_KEYS,
+    "⚽️ Jogos do Dia": PROFILE_KEYS + [key for key in LEAGUE_KEYS if key not in PROFILE_KEYS]
+}
+
 # ----------------------------
 # FUNÇÕES UTILITÁRIAS
 # ----------------------------
-@st.cache_data
-def load_csv(url):
-    """Carrega um arquivo CSV e realiza limpeza básica"""
-    try:
-        df = pd.read_csv(url, encoding="utf-8-sig")
-        df = df.dropna(axis=1, how='all')
-        df.columns = df.columns.str.strip()
-        return df
-    except Exception as e:
-        st.error(f"Erro ao carregar {url}: {str(e)}")
-        return pd.DataFrame()
-
-def normalize_columns(df):
-    """Normaliza nomes de colunas"""
-    if not df.empty:
-        df.columns = df.columns.str.strip()
-    return df
-
-def convert_percentage(value):
-    """Converte valores percentuais para float"""
-    try:
-        if isinstance(value, str):
-            return float(value.replace('%', '').replace(',', '.').strip())
-        return float(value)
-    except:
-        return None
-
+@profiler.wrap
 def generate_frequency_bar(frequency_dict):
     """Gera uma barra de frequência visual"""
-    colors = {
-        "0": "#d9534f",
-        "1": "#20de6e",
-        "2": "#16ed48",
-        "3": "#24da1e",
-        "4": "#56b72d"
-    }
-    
-    html = '<div style="display:flex; flex-wrap: wrap;">'
-    for goals, freq in frequency_dict.items():
-        try:
-            blocks = int(float(str(freq).replace(',', '.')))
-        except:
-            blocks = 0
-        for _ in range(blocks):
-            html += f'<div style="width: 6px; height: 20px; background-color: {colors[goals]}; margin: 1px;"></div>'
-    html += '</div>'
-    return html
+    return frequency_bar(frequency_dict)
 
 # ----------------------------
 # CARREGAMENTO DE DADOS
 # ----------------------------
-@st.cache_data
-def load_all_data():
-    """Carrega todos os dados necessários"""
-    data = {}
-    
-    # Carrega dados principais
-    main_data = [load_csv(url) for url in DATA_URLS["main"]]
-    data["home_df"], data["away_df"], data["away_fav_df"], data["overall_df"] = main_data
-    
-    # Carrega outros dados
-    data["home_fg_df"], data["away_fg_df"] = [load_csv(url) for url in DATA_URLS["first_goal"]]
-    data["goal_minute_home_df"], data["goal_minute_away_df"] = [load_csv(url) for url in DATA_URLS["goal_minute"]]
-    data["goals_half_df"] = load_csv(DATA_URLS["goals_half"])
-    data["cv_home_df"], data["cv_away_df"] = [load_csv(url) for url in DATA_URLS["goals_ht"]]
-    data["goals_per_time_home_df"], data["goals_per_time_away_df"] = [load_csv(url) for url in DATA_URLS["goals_per_time"]]
-    data["ppg_ht_home_df"], data["ppg_ht_away_df"] = [load_csv(url) for url in DATA_URLS["ppg_ht"]]
-    data["relative_form_df"] = load_csv(DATA_URLS["relative_form"][0]) 
-    
-    # Normaliza todas as tabelas
-    for key in data:
-        data[key] = normalize_columns(data[key])
-    
-    return data
+# Bundle pré-calculado (JOGOSDODIA_BUNDLE, gerado por ``python -m jogosdodia.build``): com ele
+# tabelas, perfis e placares já vêm prontos e nada é baixado
+if open_bundle() is None:
+    # Sem bundle, as tabelas em memória são revalidadas na origem a cada REFRESH_INTERVAL, em segundo plano
+    refresh_if_stale()
+
+# Registro preguiçoso: cada tabela é baixada na primeira vez que uma aba precisa dela
+data = LazyData()
 
-# Carrega todos os dados
-data = load_all_data()
+
+@profiler.wrap
+def carregar_tabelas(keys):
+    """Carrega ``keys`` em paralelo e mostra os erros de carga dessas tabelas"""
+    load_datasets(keys)
+    errors = load_errors()
+    for key in keys:
+        if key in errors:
+            st.error(errors[key])
 
 # ----------------------------
 # INTERFACE DO USUÁRIO
 # ----------------------------
-def get_all_teams(data):
-    """Obtém a lista de todos os times disponíveis"""
-    team_columns = [
-        ('home_df', 'Team_Home'),
-        ('away_df', 'Team_Away'),
-        ('away_fav_df', 'Team_Away_Fav'),
-        ('overall_df', 'Team_Home_Overall'),
-        ('home_fg_df', 'Team_Home'),
-        ('away_fg_df', 'Team_Away'),
-        ('goal_minute_home_df', 'Team_Home'),
-        ('goal_minute_away_df', 'Team_Away'),
-        ('goals_half_df', 'Team'),
-        ('goals_per_time_home_df', 'Team_Home'),
-        ('goals_per_time_away_df', 'Team_Away'),
-        ('ppg_ht_home_df', 'Team_Home'),
-        ('ppg_ht_away_df', 'Team_Away')
-    ]
-    
-    teams = set()
-    for df_name, col_name in team_columns:
-        df = data.get(df_name, pd.DataFrame())
-        if not df.empty and col_name in df.columns:
-            valid_teams = df[col_name].dropna().astype(str)
-            #valid_teams = valid_teams[valid_teams.str.contains(r'^[A-Za-z\s]+$', na=False)]
-            teams.update(valid_teams.tolist())
-    
-    return sorted(teams)
-
-# Sidebar - Seleção de times
-all_teams = get_all_teams(data)
-default_home = 'Bayern Munich' if 'Bayern Munich' in all_teams else 0
-default_away = 'Dortmund' if 'Dortmund' in all_teams else 0
+# Sidebar - Seleção de times (lista montada uma vez por versão dos dados)
+carregar_tabelas(SIDEBAR_KEYS["ft"])
+with profiler.section("lista de times"):
+    teams = get_team_universe(SIDEBAR_KEYS["ft"])
 
-equipe_home = st.sidebar.selectbox("🏠 Time da Casa:", all_teams, index=all_teams.index(default_home) if default_home in all_teams else 0)
-equipe_away = st.sidebar.selectbox("🛫 Time Visitante:", all_teams, index=all_teams.index(default_away) if default_away in all_teams else 0)
+equipe_home = st.sidebar.selectbox("🏠 Time da Casa:", teams.teams, index=teams.index('Bayern Munich'))
+equipe_away = st.sidebar.selectbox("🛫 Time Visitante:", teams.teams, index=teams.index('Dortmund'))
 
 # ----------------------------
 # FUNÇÕES DE ANÁLISE
 # ----------------------------
+@profiler.wrap
 def display_team_performance(team_name, team_data, is_home=True):
     """Exibe o desempenho de um time"""
     if not team_data.empty:
@@ -203,105 +124,79 @@ def display_team_performance(team_name, team_data, is_home=True):
     else:
         st.info(f"Informações do time {'da casa' if is_home else 'visitante'} não disponíveis.")
 
+@profiler.wrap
 def display_first_goal_stats(team_name, fg_data, is_home=True):
     """Exibe estatísticas de primeiro gol"""
     if not fg_data.empty:
         row = fg_data.iloc[0]
         first_goal = row['First_Gol']
         
-        try:
-            first_goal_num = convert_percentage(first_goal)
-            if is_home:
-                gol_emoji = "🟩" if first_goal_num >= 60 else "🟥"
-            else:
-                gol_emoji = "🟩" if first_goal_num <= 45 else "🟥"
-        except:
+        if pd.isna(first_goal):
             gol_emoji = "🟨"
+        elif is_home:
+            gol_emoji = "🟩" if first_goal >= 60 else "🟥"
+        else:
+            gol_emoji = "🟩" if first_goal <= 45 else "🟥"
         
         st.markdown(f"{gol_emoji} **{team_name} ({'Casa' if is_home else 'Fora'})**")
         
         cols = st.columns(3)
         cols[0].metric("Partidas", row['Matches'])
-        cols[1].metric("1º Gol", first_goal)
+        cols[1].metric("1º Gol", format_percent(first_goal))
         cols[2].metric("Total de Gols", row['Goals'])
     else:
         st.info("Sem dados.")
 
+@profiler.wrap
 def display_goals_per_half(team_name, goals_data):
     """Exibe estatísticas de gols por tempo"""
     if not goals_data.empty:
         row = goals_data.iloc[0]
         
         cols = st.columns(2)
-        first_half = row.get('1st half', 'N/A')
-        second_half = row.get('2nd half', 'N/A')
+        first_half = row.get('1st half')
+        second_half = row.get('2nd half')
         
-        if first_half != "N/A":
-            first_half_num = convert_percentage(first_half)
-            gol_emoji = "🟩" if (first_half_num >= 50 and team_name == equipe_home) or (first_half_num < 55 and team_name == equipe_away) else "🟥"
-            cols[0].metric(f"{gol_emoji} 1º Tempo", first_half)
+        if pd.notna(first_half):
+            gol_emoji = "🟩" if (first_half >= 50 and team_name == equipe_home) or (first_half < 55 and team_name == equipe_away) else "🟥"
+            cols[0].metric(f"{gol_emoji} 1º Tempo", format_percent(first_half))
         else:
-            cols[0].metric("1º Tempo", first_half)
+            cols[0].metric("1º Tempo", "N/A")
         
-        cols[1].metric("2º Tempo", second_half)
+        cols[1].metric("2º Tempo", format_percent(second_half) if pd.notna(second_half) else "N/A")
     else:
         st.info("Sem dados.")
 
+@profiler.wrap
 def display_ht_frequency(team_name, ht_data, is_home=True):
     """Exibe frequência de gols no primeiro tempo"""
     if not ht_data.empty:
         row = ht_data.iloc[0]
-        
-# Extrai valores com base no tipo de time (home/away)
-def safe_convert_percentage(value):
-    try:
-        value_str = str(value).replace('%', '').replace(',', '.').strip()
-        return float(value_str)
-    except (ValueError, TypeError):
-        return 0.0
-
-        if is_home:
-            avg_raw = row.get('Avg.', '0')
-            try:
-                avg_goals = float(str(avg_raw).replace(',', '.')) if avg_raw not in [None, ''] else 0.0
-            except ValueError:
-                avg_goals = 0.0
-        
-            goals_pct = f"{int(round(safe_convert_percentage(row.get('% Com Gols', '0'))))}%"
-            no_goals_pct = f"{int(round(safe_convert_percentage(row.get('% Sem Gols', '0'))))}%"
-        
-            freq_dict = {
-                "0": row.get('0', 0),
-                "1": row.get('1', 0),
-                "2": row.get('2', 0),
-                "3": row.get('3', 0),
-                "4": row.get('4+', 0)
-            }
-        else:
-            avg_raw = row.get('Avg..1', '0')
-            try:
-                avg_goals = float(str(avg_raw).replace(',', '.')) if avg_raw not in [None, ''] else 0.0
-            except ValueError:
-                avg_goals = 0.0
-        
-            goals_pct = f"{int(round(safe_convert_percentage(row.get('% Com Gols', '0'))))}%"
-            no_goals_pct = f"{int(round(safe_convert_percentage(row.get('% Sem Gols', '0'))))}%"
-        
-            freq_dict = {
-                "0": row.get('0.1', 0),
-                "1": row.get('1.1', 0),
-                "2": row.get('2.1', 0),
-                "3": row.get('3.1', 0),
-                "4": row.get('4+.1', 0)
-            }
+        # Colunas já numéricas (schema.py); o arquivo de fora usa o sufixo ".1"
+        suffix = "" if is_home else ".1"
+        avg_goals = row.get(f'Avg.{suffix}')
+        avg_goals = 0.0 if pd.isna(avg_goals) else avg_goals
+        com_gols = row.get('% Com Gols')
+        com_gols = 0.0 if pd.isna(com_gols) else com_gols
+        sem_gols = row.get('% Sem Gols')
+        goals_pct = f"{int(round(com_gols))}%"
+        no_goals_pct = f"{int(round(0.0 if pd.isna(sem_gols) else sem_gols))}%"
+        
+        freq_dict = {
+            "0": row.get(f'0{suffix}', 0),
+            "1": row.get(f'1{suffix}', 0),
+            "2": row.get(f'2{suffix}', 0),
+            "3": row.get(f'3{suffix}', 0),
+            "4": row.get(f'4+{suffix}', 0)
+        }
           
         # Determina emojis baseado no contexto
         if is_home:
             avg_emoji = "🟩" if avg_goals >= 0.60 else "🟥"
-            goals_emoji = "🟩" if convert_percentage(row.get('% Com Gols', '0')) >= 60 else "🟥"
+            goals_emoji = "🟩" if com_gols >= 60 else "🟥"
         else:
             avg_emoji = "🟥" if avg_goals >= 0.70 else "🟩"
-            goals_emoji = "🟥" if convert_percentage(row.get('% Com Gols', '0')) >= 50 else "🟩"
+            goals_emoji = "🟥" if com_gols >= 50 else "🟩"
         
         cols = st.columns(3)
         cols[0].metric(f"{avg_emoji} Média Gols", avg_goals)
@@ -312,10 +207,11 @@ def safe_convert_percentage(value):
     else:
         st.warning(f"Dados não encontrados para {team_name}")
 
+@profiler.wrap
 def display_goals_per_time(team_name, time_data, is_home=True):
     """Exibe gols por faixa de tempo"""
     if not time_data.empty:
-        avg_scored = time_data['AVG_Scored_Home' if is_home else 'AVG_Scored_Away'].str.extract('(\d+)').astype(float).values[0]
+        avg_scored = time_data['AVG_Scored_Home' if is_home else 'AVG_Scored_Away'].values[0]
         
         if pd.isna(avg_scored):
             st.warning(f"Valor de AVG_Scored para {team_name} é inválido.")
@@ -323,131 +219,128 @@ def display_goals_per_time(team_name, time_data, is_home=True):
             icon = "🟩" if (avg_scored <= 45 and is_home) or (avg_scored > 45 and not is_home) else "🟥"
             st.markdown(f"{icon} **{team_name} ({'Casa' if is_home else 'Fora'})**")
             
-            columns = ['League', 'GP', 'AVG_Scored_Home' if is_home else 'AVG_Scored_Away', '0-15', '16-30', '31-45']
-            st.dataframe(time_data[columns], use_container_width=True)
+            avg_column = 'AVG_Scored_Home' if is_home else 'AVG_Scored_Away'
+            columns = ['League', 'GP', avg_column, '0-15', '16-30', '31-45']
+            st.dataframe(
+                time_data[columns], use_container_width=True,
+                column_config={avg_column: st.column_config.NumberColumn(format="%d min.")}
+            )
     else:
         st.info(f"Sem dados de gols por faixa de tempo para {team_name}")
 
+@profiler.wrap
+def display_inplay_probabilities(home_team, away_team):
+    """Probabilidades ao longo do jogo (gols por faixa de 15 minutos dos dois times)"""
+    engine = match_engine(home_team, away_team)
+    if engine is None:
+        st.info("Sem gols por faixa de tempo para os dois times")
+        return
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Gol antes dos 30'", f"{engine.prob_goal(30):.0%}")
+    col2.metric("0x0 no HT", f"{engine.prob_score(45, 0, 0):.0%}")
+    col3.metric("Gol no 2º tempo", f"{engine.prob_goal(90, start=45):.0%}")
+
+    labels = {"home": home_team, "draw": "Empate", "away": away_team}
+    names = [labels[result] for result in RESULTS]
+    ht_ft = pd.DataFrame(engine.ht_ft() * 100, index=[f"HT {n}" for n in names], columns=[f"FT {n}" for n in names])
+    st.dataframe(
+        ht_ft, use_container_width=True,
+        column_config={column: st.column_config.NumberColumn(format="%.1f%%") for column in ht_ft.columns}
+    )
+
+@profiler.wrap
 def display_ht_tab(data, home_team, away_team):
     """Exibe a aba de estatísticas do primeiro tempo"""
-    home_data = data["ppg_ht_home_df"][data["ppg_ht_home_df"]['Team_Home'] == home_team]
-    away_data = data["ppg_ht_away_df"][data["ppg_ht_away_df"]['Team_Away'] == away_team]
-    cv_home_data = data["cv_home_df"][data["cv_home_df"]['Team_Home'] == home_team]
-    cv_away_data = data["cv_away_df"][data["cv_away_df"]['Team_Away'] == away_team]
-    fg_home = data["home_fg_df"][data["home_fg_df"]['Team_Home'] == home_team]
-    fg_away = data["away_fg_df"][data["away_fg_df"]['Team_Away'] == away_team]
-    gm_home = data["goal_minute_home_df"][data["goal_minute_home_df"]['Team_Home'] == home_team]
-    gm_away = data["goal_minute_away_df"][data["goal_minute_away_df"]['Team_Away'] == away_team]
+    # Os dois times na liga do confronto (times em mais de uma liga)
+    league = fixture_league(home_team, away_team)
+    home = team_profile(home_team, "home", league)
+    away = team_profile(away_team, "away", league)
     
     col_home, col_away = st.columns(2)
     
     with col_home:
         st.markdown(f"### 🏠 {home_team}")
         
-        if not home_data.empty:
-            st.metric("📈 PIH", round(home_data['PIH'].values[0], 2))
-            st.metric("🏠 PPG HT", round(home_data['PPG_HT_Home'].values[0], 2))
-            st.metric("📊 Média Gols Marcado", round(home_data['GF_AVG_Home'].values[0], 2))
-            st.metric("📊 Média Gols Sofrido", round(home_data['GA_AVG_Home'].values[0], 2))
-            st.metric("📈 Saldo de Gols", round(home_data['GD_Home'].values[0], 2))
-            st.metric("🏆 Rank", int(home_data['Rank_Home'].values[0]))
+        if has_source(home, "ht"):
+            st.metric("📈 PIH", round(home['ht_PIH'], 2))
+            st.metric("🏠 PPG HT", round(home['ht_PPG_HT_Home'], 2))
+            st.metric("📊 Média Gols Marcado", round(home['ht_GF_AVG_Home'], 2))
+            st.metric("📊 Média Gols Sofrido", round(home['ht_GA_AVG_Home'], 2))
+            st.metric("📈 Saldo de Gols", round(home['ht_GD_Home'], 2))
+            st.metric("🏆 Rank", int(home['ht_Rank_Home']))
         
-        if not fg_home.empty:
-            st.metric("⚽ 1º Gol", fg_home.iloc[0]['First_Gol'])
+        if has_source(home, "fg"):
+            st.metric("⚽ 1º Gol", format_percent(home['fg_First_Gol']))
         
-        if not gm_home.empty:
-            st.metric("⏱️ Tempo Médio 1º Gol", round(gm_home['AVG_min_scored'].values[0]))
+        if has_source(home, "gm"):
+            st.metric("⏱️ Tempo Médio 1º Gol", round(home['gm_AVG_min_scored']))
             
     with col_away:
         st.markdown(f"### 🛫 {away_team}")
         
-        if not away_data.empty:
-            st.metric("📉 PIA", round(away_data['PIA'].values[0], 2))
-            st.metric("🛫 PPG HT", round(away_data['PPG_HT_Away'].values[0], 2))
-            st.metric("📊 Média de Gols Marcado", round(away_data['GF_AVG_Away'].values[0], 2))
-            st.metric("📊 Média de Gols Sofrido", round(away_data['GA_AVG_Away'].values[0], 2))
-            st.metric("📉 Saldo de Gols", round(away_data['GD_Away'].values[0], 2))
-            st.metric("🏆 Rank", int(away_data['Rank_Away'].values[0]))
-        
-        if not fg_away.empty:
-            st.metric("⚽ 1º Gol", fg_away.iloc[0]['First_Gol'])
-        
-        if not gm_away.empty:
-            st.metric("⏱️ Tempo Médio 1º Gol", round(gm_away['AVG_min_scored'].values[0]))
-
+        if has_source(away, "ht"):
+            st.metric("📉 PIA", round(away['ht_PIA'], 2))
+            st.metric("🛫 PPG HT", round(away['ht_PPG_HT_Away'], 2))
+            st.metric("📊 Média de Gols Marcado", round(away['ht_GF_AVG_Away'], 2))
+            st.metric("📊 Média de Gols Sofrido", round(away['ht_GA_AVG_Away'], 2))
+            st.metric("📉 Saldo de Gols", round(away['ht_GD_Away'], 2))
+            st.metric("🏆 Rank", int(away['ht_Rank_Away']))
+        
+        if has_source(away, "fg"):
+            st.metric("⚽ 1º Gol", format_percent(away['fg_First_Gol']))
+        
+        if has_source(away, "gm"):
+            st.metric("⏱️ Tempo Médio 1º Gol", round(away['gm_AVG_min_scored']))
+
+def _format_z(value):
+    return "—" if pd.isna(value) else f"{value:+.2f}"
+
+
+@profiler.wrap
+def display_league_context(team_name, side):
+    """Força do time relativa à própria liga (z-scores dos agregados por liga)"""
+    context = league_context(team_name, side)
+    if context is None:
+        return
+    zscores, league = context
+    text = (
+        f"📊 **Na liga ({zscores['league']})**: PPG z {_format_z(zscores['ppg_z'])} · "
+        f"gols marcados z {_format_z(zscores['gf_z'])} · gols sofridos z {_format_z(zscores['ga_z'])}"
+    )
+    if league is not None:
+        text += (
+            f" · média PPG {'casa' if side == 'home' else 'fora'} {league[f'ppg_{side}_mean']:.2f}"
+            f" · vantagem do mandante {_format_z(league.get('home_advantage'))}"
+        )
+    st.caption(text)
+
+
+@profiler.wrap
 def display_analysis_tab(data, home_team, away_team):
     """Exibe a aba de análise detalhada"""
-    home_filtered = data["home_df"][data["home_df"]['Team_Home'] == home_team][COLUMN_NAMES["home"]]
-    away_filtered = data["away_df"][data["away_df"]['Team_Away'] == away_team][COLUMN_NAMES["away"]]
-    home_fg_data = data["home_fg_df"][data["home_fg_df"]['Team_Home'] == home_team]
-    away_fg_data = data["away_fg_df"][data["away_fg_df"]['Team_Away'] == away_team]
-    relative_form_data = data["relative_form_df"][data["relative_form_df"]['Team'] == home_team]
-    relative_form_data = data["relative_form_df"][data["relative_form_df"]['Team'] == away_team]
+    # Os dois times na liga do confronto (times em mais de uma liga)
+    league = fixture_league(home_team, away_team)
+    home = team_profile(home_team, "home", league)
+    away = team_profile(away_team, "away", league)
     
-    if not home_filtered.empty and not away_filtered.empty:
-        home_row = home_filtered.iloc[0]
-        away_row = away_filtered.iloc[0]
+    rodada_home = int(home['form_GP']) if has_source(home, "form") else "N/A"
+    rodada_away = int(away['form_GP']) if has_source(away, "form") else "N/A"
         
+    if has_source(home, "ft") and has_source(away, "ft"):
         # Coletar dados principais
-        ppg_home = home_row.get("PPG_Home", 0)
-        ppg_away = away_row.get("PPG_Away", 0)
-        gf_avg_home = home_row.get("GF_AVG_Home", 0)
-        gf_avg_away = away_row.get("GF_AVG_Away", 0)
-        ga_avg_home = home_row.get("GA_AVG_Home", 0)
-        ga_avg_away = away_row.get("GA_AVG_Away", 0)
-        odd_justa_home = home_row.get('Odd_Justa_MO', 'N/A')
-        odd_justa_away = away_row.get('Odd_Justa_MO', 'N/A')
+        ppg_home = home["ft_PPG_Home"]
+        ppg_away = away["ft_PPG_Away"]
+        gf_avg_home = home["ft_GF_AVG_Home"]
+        gf_avg_away = away["ft_GF_AVG_Away"]
+        ga_avg_home = home["ft_GA_AVG_Home"]
+        ga_avg_away = away["ft_GA_AVG_Away"]
+        odd_justa_home = home['ft_Odd_Justa_MO']
+        odd_justa_away = away['ft_Odd_Justa_MO']
         
         try:
-            rank_home = int(home_row.get('Rank_Home', 999))
-            rank_away = int(away_row.get('Rank_Away', 999))
-            rank_diff = rank_away - rank_home
-            rankings_validos = rank_home != 999 and rank_away != 999
-        except:
-            rank_home = 999
-            rank_away = 999
-            rank_diff = 0
-            rankings_validos = False
-        
-        # Rodada atual
-
-def display_analysis_tab(data, home_team, away_team):
-    """Exibe a aba de análise detalhada"""
-    relative_form = data["relative_form_df"]
-    home_filtered = data["home_df"][data["home_df"]['Team_Home'] == home_team][COLUMN_NAMES["home"]]
-    away_filtered = data["away_df"][data["away_df"]['Team_Away'] == away_team][COLUMN_NAMES["away"]]
-    home_fg_data = data["home_fg_df"][data["home_fg_df"]['Team_Home'] == home_team]
-    away_fg_data = data["away_fg_df"][data["away_fg_df"]['Team_Away'] == away_team]
-    relative_form_data = data["relative_form_df"][data["relative_form_df"]['Team'] == home_team]
-    relative_form_data = data["relative_form_df"][data["relative_form_df"]['Team'] == away_team]
-    
-    try:
-        rodada_home = relative_form[relative_form['Team'] == home_team].iloc[0]['GP']
-    except:
-        rodada_home = "N/A"
-            
-    try:
-        rodada_away = relative_form[relative_form['Team'] == away_team].iloc[0]['GP']
-    except:
-        rodada_away = "N/A"
-        
-    if not home_filtered.empty and not away_filtered.empty:
-        home_row = home_filtered.iloc[0]
-        away_row = away_filtered.iloc[0]
-        
-        # Coletar dados principais
-        ppg_home = home_row.get("PPG_Home", 0)
-        ppg_away = away_row.get("PPG_Away", 0)
-        gf_avg_home = home_row.get("GF_AVG_Home", 0)
-        gf_avg_away = away_row.get("GF_AVG_Away", 0)
-        ga_avg_home = home_row.get("GA_AVG_Home", 0)
-        ga_avg_away = away_row.get("GA_AVG_Away", 0)
-        odd_justa_home = home_row.get('Odd_Justa_MO', 'N/A')
-        odd_justa_away = away_row.get('Odd_Justa_MO', 'N/A')
-        
-        try:
-            rank_home = int(home_row.get('Rank_Home', 999))
-            rank_away = int(away_row.get('Rank_Away', 999))
+            rank_home = int(home['ft_Rank_Home'])
+            rank_away = int(away['ft_Rank_Away'])
             rank_diff = rank_away - rank_home
             rankings_validos = rank_home != 999 and rank_away != 999
         except:
@@ -487,8 +380,8 @@ def display_analysis_tab(data, home_team, away_team):
         O time da casa **{home_team}** apresenta um **{desempenho_home} desempenho** como mandante, com uma frequência de **{gf_avg_home:.2f} gols** por partida e uma média de pontos por jogo (PPG) de **{ppg_home:.2f}**. 
         """
         
-        if not home_fg_data.empty:
-            analise_home += f"O time marca o primeiro gol em **{home_fg_data.iloc[0]['First_Gol']}** das partidas e "
+        if has_source(home, "fg"):
+            analise_home += f"O time marca o primeiro gol em **{format_percent(home['fg_First_Gol'])}** das partidas e "
         
         analise_home += f"seu ranking como mandante é **{rank_home}**, indicando {vantagem_home} contra adversários de nível similar."
         
@@ -498,13 +391,15 @@ def display_analysis_tab(data, home_team, away_team):
         O time visitante **{away_team}** tem mostrado um desempenho **{desempenho_away}** como visitante, com uma frequência de **{gf_avg_away:.2f} gols** por partida e PPG de **{ppg_away:.2f}**. 
         """
         
-        if not away_fg_data.empty:
-            analise_away += f"O time marca o primeiro gol em **{away_fg_data.iloc[0]['First_Gol']}** das partidas e "
+        if has_source(away, "fg"):
+            analise_away += f"O time marca o primeiro gol em **{format_percent(away['fg_First_Gol'])}** das partidas e "
         
         analise_away += f"seu ranking como visitante é **{rank_away}**, com {desempenho_fora}."
         
         st.markdown(analise_home)
+        display_league_context(home_team, "home")
         st.markdown(analise_away)
+        display_league_context(away_team, "away")
         
         # Sugestões de apostas
         col1, col2 = st.columns(2)
@@ -547,11 +442,11 @@ def display_analysis_tab(data, home_team, away_team):
             st.markdown(f"📌 **Odd Justa:** Casa {odd_justa_home} | Fora {odd_justa_away}")
             
             # Sugestão adicional: Lay ao Visitante (HT)
-            if not home_fg_data.empty and not away_fg_data.empty:
-                home_first_goal_percentage = convert_percentage(home_fg_data.iloc[0].get('First_Gol', 0))
-                away_first_goal_percentage = convert_percentage(away_fg_data.iloc[0].get('First_Gol', 0))
+            if has_source(home, "fg") and has_source(away, "fg"):
+                home_first_goal_percentage = home['fg_First_Gol']
+                away_first_goal_percentage = away['fg_First_Gol']
                 
-                if home_first_goal_percentage is not None and away_first_goal_percentage is not None:
+                if pd.notna(home_first_goal_percentage) and pd.notna(away_first_goal_percentage):
                     if home_first_goal_percentage >= 60 and away_first_goal_percentage <= 30:
                         st.info("**✅ Aposta sugerida:** Lay ao Visitante (HT)")
                         st.markdown("""
@@ -609,64 +504,36 @@ def display_analysis_tab(data, home_team, away_team):
             if rankings_validos:
                 st.markdown(f"📊 **Ranking:** (Casa {rank_home} vs Fora {rank_away})")
         
-        # Tendência BTTS   
-        total_avg_goals = gf_avg_home + gf_avg_away        
+        # Expectativa de gols do confronto, usada nas linhas de gols e nos placares
+        max_gols = 5
+        pairing = bundle_pairing(home_team, away_team)
+        if pairing is not None:
+            # Confronto da mesma liga com bundle aberto: expectativa e matriz já calculadas
+            exp_gols_home, exp_gols_away, matriz = pairing
+        else:
+            # Expectativa de gols do modelo de força (ataque/defesa) da liga; sem um dos
+            # times no modelo, a média total de gols dividida pelo PPG
+            lambdas = strength_lambdas(home_team, away_team)
+            if lambdas is None:
+                lambdas = expected_goals(ppg_home, ppg_away, gf_avg_home, gf_avg_away)
+            exp_gols_home, exp_gols_away = lambdas
+            # Matriz de placares (Poisson) usada por todos os cálculos abaixo
+            matriz = score_matrix(exp_gols_home, exp_gols_away, max_gols)
+
+        # BTTS e Over/Under: Poisson calibrado na liga combinado com as frequências dos
+        # times (Goals_Stats), pesando pelo número de jogos (jogosdodia.blend)
+        linhas = blend_match(home_team, away_team, exp_gols_home, exp_gols_away)
 
         col1, col2 = st.columns(2)    
         
         with col1:
             st.markdown("### BTTS (Ambos Marcam)")
-            
-            if gf_avg_home >= 1.2 and gf_avg_away >= 1.2 and total_avg_goals >= 2.5:
-                st.success("**✅ Sugerido: Sim (Ambos Marcam)**")
-                st.markdown(f"""
-                📊 **Justificativa:**  
-                • Ambos os times têm média de gols ≥ 1.2.  
-                • Frequência total de gols elevada ({total_avg_goals:.2f}).  
-                • Indicativo de jogo aberto e ofensivo.  
-                """)
-            elif gf_avg_home < 1.0 or gf_avg_away < 1.0:
-                st.warning("**⚠️ Sugerido: Não (Apenas um ou nenhum marca)**")
-                st.markdown(f"""
-                📊 **Justificativa:**  
-                • Um dos times apresenta baixa frequência de gols.  
-                • Tendência de apenas um time marcar.  
-                """)
-            else:
-                st.info("**🔍 Nenhuma tendência clara para BTTS**")
-                st.markdown(f"""
-                📊 **Justificativa:**  
-                • Frequência de gols equilibrada, mas não elevadas.  
-                • Jogo pode ter gols de apenas um dos lados.  
-                """)
+            display_goal_line(linhas["btts"], "Sugerido: Sim", "Sugerido: Não", "Nenhuma tendência clara para BTTS")
         
         with col2:
             # Over/Under Gols
             st.markdown("### Over/Under 25FT")
-            total_avg_goals = gf_avg_home + gf_avg_away
-            
-            if ((ppg_home >= 1.8 or ppg_away >= 1.8) and rankings_validos and abs(rank_diff) >= 5 and total_avg_goals >= 2.8):
-                st.success(f"**✅ Over 2.5 Gols (Média: {total_avg_goals:.2f})**")
-                st.markdown("""
-                📊 **Justificativa:**  
-                • Time(s) com alto desempenho ofensivo.  
-                • Diferença de ranking significativa.  
-                • Frequência de gols esperada elevada (≥2.8).  
-                """)
-            elif total_avg_goals <= 2.0:
-                st.warning(f"**⚠️ Under 2.5 Gols (Média: {total_avg_goals:.2f})**")
-                st.markdown("""
-                📊 **Justificativa:**  
-                • Ambas as equipes com frequência de gols baixa.  
-                • Potencial para jogo com poucos gols.  
-                """)
-            else:
-                st.info(f"**🔍 Over/Under incerto (Média: {total_avg_goals:.2f})**")
-                st.markdown("""
-                📊 **Justificativa:**  
-                • Frequência de gols intermediária.  
-                • Sem tendências claras para gols.  
-                """)
+            display_goal_line(linhas["over_25"], "Over 2.5 Gols", "Under 2.5 Gols", "Over/Under incerto")
 
         col1, col2 = st.columns(2)      
 
@@ -674,18 +541,11 @@ def display_analysis_tab(data, home_team, away_team):
         with col1:
             st.markdown("### 📊 5 Placares Mais Prováveis")
             
-            # Cálculo da expectativa de gols com base no PPG e na média total de gols
-            if (ppg_home + ppg_away) > 0:
-                exp_gols_home = (ppg_home / (ppg_home + ppg_away)) * total_avg_goals
-            else:
-                exp_gols_home = 0
-            exp_gols_away = total_avg_goals - exp_gols_home
-            
+            st.caption(f"Expectativa de gols: {exp_gols_home:.2f} x {exp_gols_away:.2f}")
+
             # Probabilidade do placar 0x1 quando a casa é favorita
             if ppg_home > ppg_away:
-                prob_0_home = poisson.pmf(0, exp_gols_home)
-                prob_1_away = poisson.pmf(1, exp_gols_away)
-                prob_placar_0x1 = prob_0_home * prob_1_away
+                prob_placar_0x1 = correct_score(matriz, 0, 1)
                 st.write(f"🎯 Probabilidade do placar 0x1 (casa favorita): {prob_placar_0x1:.2%}")
             else:
                 st.write("⚠️ O time da casa não é favorito neste confronto.")
@@ -694,47 +554,69 @@ def display_analysis_tab(data, home_team, away_team):
             if gf_avg_home >= 1.6 and gf_avg_away <= 1.2:
                 st.write("💰 Lay Goleada Visitante — Odd Máxima 50")
 
-            # Gerar probabilidades de placares usando distribuição de Poisson
-            max_gols = 5
-            placares = []
-            
-            for gols_home in range(max_gols + 1):
-                for gols_away in range(max_gols + 1):
-                    prob_home = poisson.pmf(gols_home, exp_gols_home)
-                    prob_away = poisson.pmf(gols_away, exp_gols_away)
-                    prob_placar = prob_home * prob_away
-                    placares.append(((gols_home, gols_away), prob_placar))
-            
-            # Ordenar pelos placares com maior probabilidade
-            placares.sort(key=lambda x: x[1], reverse=True)
+            # Placares ordenados pela probabilidade
+            placares = top_scorelines(matriz, 5)
             
             # Exibir os 5 placares mais prováveis
             for i, ((gh, ga), prob) in enumerate(placares[:5], start=1):
                 st.write(f"{i}. {home_team} {gh} x {ga} {away_team} — Probabilidade: {prob:.2%}")
 
+@profiler.wrap
+def display_goal_line(linha, sim, nao, incerto):
+    """Sugestão para uma linha de gols pela probabilidade combinada, com os componentes"""
+    if linha.probability >= 0.6:
+        st.success(f"**✅ {sim} ({linha.probability:.0%})**")
+    elif linha.probability <= 0.4:
+        st.warning(f"**⚠️ {nao} ({linha.probability:.0%})**")
+    else:
+        st.info(f"**🔍 {incerto} ({linha.probability:.0%})**")
+
+    if pd.isna(linha.empirical):
+        frequencia = "sem dados de Goals_Stats"
+    else:
+        frequencia = f"{linha.empirical:.0%} dos jogos (peso {linha.weight:.0%})"
+    st.markdown(f"""
+    📊 **Justificativa:**  
+    • Modelo Poisson: {linha.model:.0%} (calibrado na liga: {linha.calibrated:.0%}).  
+    • Frequência dos times (casa/fora): {frequencia}.  
+    """)
+
+@profiler.wrap
+def display_live_probabilities(home_team, away_team, minute, home_goals, away_goals):
+    """Probabilidades do jogo todo a partir do minuto e do placar informados"""
+    probabilidades = live_probabilities(home_team, away_team, minute, home_goals, away_goals)
+    if probabilidades is None:
+        st.info("Sem intensidades de gol por faixa de tempo para os dois times")
+        return
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric(f"Vitória {home_team}", f"{probabilidades.home:.0%}")
+    col2.metric("Empate", f"{probabilidades.draw:.0%}")
+    col3.metric(f"Vitória {away_team}", f"{probabilidades.away:.0%}")
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Over 1.5", f"{probabilidades.over_15:.0%}")
+    col2.metric("Over 2.5", f"{probabilidades.over_25:.0%}")
+    col3.metric("Ambas Marcam", f"{probabilidades.btts:.0%}")
+    col4.metric("Gols esperados (restante)", f"{probabilidades.expected_home:.2f} x {probabilidades.expected_away:.2f}")
+
+@profiler.wrap
 def display_ht_analysis_tab(data, home_team, away_team):
     """Exibe a aba de análise detalhada do primeiro tempo"""
-    home_data = data["ppg_ht_home_df"][data["ppg_ht_home_df"]['Team_Home'] == home_team]
-    away_data = data["ppg_ht_away_df"][data["ppg_ht_away_df"]['Team_Away'] == away_team]
-    cv_home_data = data["cv_home_df"][data["cv_home_df"]['Team_Home'] == home_team]
-    cv_away_data = data["cv_away_df"][data["cv_away_df"]['Team_Away'] == away_team]
-    fg_home = data["home_fg_df"][data["home_fg_df"]['Team_Home'] == home_team]
-    fg_away = data["away_fg_df"][data["away_fg_df"]['Team_Away'] == away_team]
-    gm_home = data["goal_minute_home_df"][data["goal_minute_home_df"]['Team_Home'] == home_team]
-    gm_away = data["goal_minute_away_df"][data["goal_minute_away_df"]['Team_Away'] == away_team]
+    # Os dois times na liga do confronto (times em mais de uma liga)
+    league = fixture_league(home_team, away_team)
+    home = team_profile(home_team, "home", league)
+    away = team_profile(away_team, "away", league)
     
     # Análise qualitativa
-    if not home_data.empty and not away_data.empty:
-        home_row = home_data.iloc[0]
-        away_row = away_data.iloc[0]
-        
+    if has_source(home, "ht") and has_source(away, "ht"):
         # Variáveis principais
-        ppg_ht_home = home_row.get("PPG_HT_Home", 0)
-        ppg_ht_away = away_row.get("PPG_HT_Away", 0)
-        gf_avg_ht_home = home_row.get("GF_AVG_Home", 0)
-        gf_avg_ht_away = away_row.get("GF_AVG_Away", 0)
-        rank_home = home_row.get("Rank_Home", 999)
-        rank_away = away_row.get("Rank_Away", 999)
+        ppg_ht_home = home["ht_PPG_HT_Home"]
+        ppg_ht_away = away["ht_PPG_HT_Away"]
+        gf_avg_ht_home = home["ht_GF_AVG_Home"]
+        gf_avg_ht_away = away["ht_GF_AVG_Away"]
+        rank_home = int(home["ht_Rank_Home"])
+        rank_away = int(away["ht_Rank_Away"])
         rank_diff = rank_away - rank_home
         
         # Análise qualitativa HT
@@ -768,12 +650,12 @@ def display_ht_analysis_tab(data, home_team, away_team):
         com frequência de **{gf_avg_ht_home:.2f} gols** no 1º tempo e PPG HT de **{ppg_ht_home:.2f}**. 
         """
         
-        if not fg_home.empty:
-            primeiro_gol_home = fg_home.iloc[0]['First_Gol']
+        if has_source(home, "fg"):
+            primeiro_gol_home = format_percent(home['fg_First_Gol'])
             analise_ht_home += f"O time marca o primeiro gol em **{primeiro_gol_home}** das partidas e "
             
-        if not gm_home.empty:
-            avg_min_home = gm_home.iloc[0]['AVG_min_scored']
+        if has_source(home, "gm"):
+            avg_min_home = home['gm_AVG_min_scored']
             analise_ht_home += f"o tempo médio para marcar o primeiro gol é de **{avg_min_home:.0f} minutos**. "
             
         analise_ht_home += f"Seu ranking no 1º tempo como mandante é **{rank_home:.0f}**, indicando {vantagem_ht_home}."
@@ -784,12 +666,12 @@ def display_ht_analysis_tab(data, home_team, away_team):
         com frequência de **{gf_avg_ht_away:.0f} gols** no 1º tempo e PPG HT de **{ppg_ht_away:.2f}**. 
         """
         
-        if not fg_away.empty:
-            primeiro_gol_away = fg_away.iloc[0]['First_Gol']
+        if has_source(away, "fg"):
+            primeiro_gol_away = format_percent(away['fg_First_Gol'])
             analise_ht_away += f"O time marca o primeiro gol em **{primeiro_gol_away}** das partidas e "
             
-        if not gm_away.empty:
-            avg_min_away = gm_away.iloc[0]['AVG_min_scored']
+        if has_source(away, "gm"):
+            avg_min_away = away['gm_AVG_min_scored']
             analise_ht_away += f"o tempo médio para marcar o primeiro gol é de **{avg_min_away:.0f} minutos**. "
             
         analise_ht_away += f"Seu ranking no 1º tempo como visitante é **{rank_away:.0f}**, com {desempenho_ht_fora}."
@@ -839,14 +721,12 @@ def display_ht_analysis_tab(data, home_team, away_team):
             st.markdown("### Over/Under 0.5 HT")
             
             # Dados de frequência de gols no 1º tempo
-            if not cv_home_data.empty and not cv_away_data.empty:
+            if has_source(home, "cv") and has_source(away, "cv"):
                 try:
-                    home_percent_raw = cv_home_data.iloc[0]['% Com Gols']
-                    away_percent_raw = cv_away_data.iloc[0]['% Com Gols']
+                    home_com_gols = home['cv_% Com Gols']
+                    away_com_gols = away['cv_% Com Gols']
                     
-                    if pd.notna(home_percent_raw) and pd.notna(away_percent_raw):
-                        home_com_gols = convert_percentage(home_percent_raw)
-                        away_com_gols = convert_percentage(away_percent_raw)
+                    if pd.notna(home_com_gols) and pd.notna(away_com_gols):
                         
                         media_com_gols = (home_com_gols + away_com_gols) / 2
                         
@@ -875,38 +755,30 @@ def display_ht_analysis_tab(data, home_team, away_team):
             else:
                 st.warning("Dados de frequência de gols no 1º tempo não disponíveis")
 
-# Função para conversão segura de porcentagens
-def safe_convert_percentage(value):
-    try:
-        value_str = str(value).replace('%', '').replace(',', '.').strip()
-        return float(value_str)
-    except (ValueError, TypeError):
-        return 0.0
-
-# Tendências adicionais HT
+        # Tendências adicionais HT
         col1, col2 = st.columns(2)
         
         with col1:
             st.markdown("### Primeiro a Marcar (HT)")
             
-            if not fg_home.empty and not fg_away.empty:
-                home_fg_percent = safe_convert_percentage(fg_home.iloc[0]['First_Gol'])
-                away_fg_percent = safe_convert_percentage(fg_away.iloc[0]['First_Gol'])
+            if has_source(home, "fg") and has_source(away, "fg"):
+                home_fg_percent = home['fg_First_Gol']
+                away_fg_percent = away['fg_First_Gol']
                 
                 if home_fg_percent >= 60 and away_fg_percent <= 40:
                     st.success(f"**✅ {home_team} marca primeiro (HT)**")
                     st.markdown(f"""
                     📊 **Justificativa:**  
-                    • Casa: {home_fg_percent}% de marcar primeiro  
-                    • Visitante: {away_fg_percent}% de marcar primeiro  
+                    • Casa: {format_percent(home_fg_percent)} de marcar primeiro  
+                    • Visitante: {format_percent(away_fg_percent)} de marcar primeiro  
                     • Alta vantagem para o mandante abrir o placar  
                     """)
                 elif away_fg_percent >= 60 and home_fg_percent <= 40:
                     st.success(f"**✅ {away_team} marca primeiro (HT)**")
                     st.markdown(f"""
                     📊 **Justificativa:**  
-                    • Visitante: {away_fg_percent}% de marcar primeiro  
-                    • Casa: {home_fg_percent}% de marcar primeiro  
+                    • Visitante: {format_percent(away_fg_percent)} de marcar primeiro  
+                    • Casa: {format_percent(home_fg_percent)} de marcar primeiro  
                     • Alta vantagem para o visitante abrir o placar  
                     """)
                 else:
@@ -917,9 +789,29 @@ def safe_convert_percentage(value):
         with col2:
             st.markdown("### Tempo do Primeiro Gol")
             
-            if not gm_home.empty and not gm_away.empty:
-                avg_min_home = gm_home.iloc[0]['AVG_min_scored']
-                avg_min_away = gm_away.iloc[0]['AVG_min_scored']
+            # Riscos competitivos (jogosdodia.firstgoal): minuto e time do primeiro gol
+            primeiro_gol = first_goal(home_team, away_team)
+            if primeiro_gol is not None:
+                minuto_esperado = primeiro_gol.expected_minute
+                antes_30 = primeiro_gol.home_bands[:2].sum() + primeiro_gol.away_bands[:2].sum()
+                justificativa = f"""
+                    📊 **Justificativa:**  
+                    • Gol antes de 30': {antes_30:.1%}  
+                    • {home_team} marca primeiro: {primeiro_gol.home:.1%}  
+                    • {away_team} marca primeiro: {primeiro_gol.away:.1%}  
+                    • Sem gols: {primeiro_gol.none:.1%}  
+                    """
+
+                if antes_30 >= 0.6:
+                    st.success(f"**✅ Primeiro gol antes de 30' (Esperado: {minuto_esperado:.0f}')**")
+                elif antes_30 <= 0.4:
+                    st.warning(f"**⚠️ Primeiro gol depois de 30' (Esperado: {minuto_esperado:.0f}')**")
+                else:
+                    st.info(f"**🔍 Sem tendência clara (Esperado: {minuto_esperado:.0f}')**")
+                st.markdown(justificativa)
+            elif has_source(home, "gm") and has_source(away, "gm"):
+                avg_min_home = home['gm_AVG_min_scored']
+                avg_min_away = away['gm_AVG_min_scored']
                 media_avg_min = (avg_min_home + avg_min_away) / 2
                 
                 if media_avg_min <= 30:
@@ -942,237 +834,181 @@ def safe_convert_percentage(value):
                     st.info(f"**🔍 Sem tendência clara (Média: {media_avg_min:.0f}')**")
             else:
                 st.warning("Dados de tempo médio do primeiro gol não disponíveis")
+
+        # Recalculo ao vivo com o minuto e o placar atuais
+        with st.expander("📡 Ao Vivo: probabilidades pelo minuto e placar"):
+            col1, col2, col3 = st.columns(3)
+            minuto = col1.number_input("Minuto", min_value=0, max_value=90, value=0, key="ao_vivo_minuto")
+            gols_casa = col2.number_input(f"Gols {home_team}", min_value=0, max_value=20, value=0, key="ao_vivo_casa")
+            gols_fora = col3.number_input(f"Gols {away_team}", min_value=0, max_value=20, value=0, key="ao_vivo_fora")
+            display_live_probabilities(home_team, away_team, minuto, gols_casa, gols_fora)
         
 
 # ----------------------------
 # LAYOUT PRINCIPAL
 # ----------------------------
-tabs = st.tabs(["🎯 FT", "🎯 HT", "🧾 Analise", "🧾 Analise HT", "⚽️ Jogos do Dia"])
+tabs = st.tabs(list(TAB_DATASETS), key="aba", on_change="rerun")
+
+
+def aba_aberta(index):
+    """Indica se a aba ``index`` está selecionada; se estiver, carrega as tabelas dela"""
+    if tabs[index].open is False:
+        return False
+    carregar_tabelas(TAB_DATASETS[list(TAB_DATASETS)[index]])
+    return True
+
 
 # ABA 1 - FT   
-with tabs[0]:
-    # Dados filtrados
-    home_filtered = data["home_df"][data["home_df"]['Team_Home'] == equipe_home][COLUMN_NAMES["home"]]
-    away_filtered = data["away_df"][data["away_df"]['Team_Away'] == equipe_away][COLUMN_NAMES["away"]]
+with tabs[0], profiler.section("aba 🎯 FT"):
+    if aba_aberta(0):
+        # Dados filtrados
+        home_filtered = lookup("home_df", equipe_home)[COLUMN_NAMES["home"]]
+        away_filtered = lookup("away_df", equipe_away)[COLUMN_NAMES["away"]]
     
-    # Desempenho dos times
-    display_team_performance(equipe_home, home_filtered, is_home=True)
-    display_team_performance(equipe_away, away_filtered, is_home=False)
+        # Desempenho dos times
+        display_team_performance(equipe_home, home_filtered, is_home=True)
+        display_team_performance(equipe_away, away_filtered, is_home=False)
     
-    # Primeiro gol
-    st.markdown("### ⚽ Marca Primeiro")
-    col1, col2 = st.columns(2)
+        # Primeiro gol
+        st.markdown("### ⚽ Marca Primeiro")
+        col1, col2 = st.columns(2)
     
-    with col1:
-        home_fg_filtered = data["home_fg_df"][data["home_fg_df"]['Team_Home'] == equipe_home]
-        display_first_goal_stats(equipe_home, home_fg_filtered, is_home=True)
+        with col1:
+            home_fg_filtered = lookup("home_fg_df", equipe_home)
+            display_first_goal_stats(equipe_home, home_fg_filtered, is_home=True)
     
-    with col2:
-        away_fg_filtered = data["away_fg_df"][data["away_fg_df"]['Team_Away'] == equipe_away]
-        display_first_goal_stats(equipe_away, away_fg_filtered, is_home=False)
+        with col2:
+            away_fg_filtered = lookup("away_fg_df", equipe_away)
+            display_first_goal_stats(equipe_away, away_fg_filtered, is_home=False)
     
-    # Frequência de gols por tempo
-    st.markdown("### ⏱️ Frequência Gols 1º e 2º Tempo")
-    goals_half_filtered = data["goals_half_df"][data["goals_half_df"]['Team'].isin([equipe_home, equipe_away])]
+        # Frequência de gols por tempo
+        st.markdown("### ⏱️ Frequência Gols 1º e 2º Tempo")
+        goals_half_filtered = lookup_many("goals_half_df", [equipe_home, equipe_away])
     
-    if not goals_half_filtered.empty:
-        col1, col2, col3, col4 = st.columns(4)
+        if not goals_half_filtered.empty:
+            col1, col2, col3, col4 = st.columns(4)
         
-        with col1:
-            home_1st = goals_half_filtered[goals_half_filtered['Team'] == equipe_home]
-            display_goals_per_half(equipe_home, home_1st)
+            with col1:
+                home_1st = lookup("goals_half_df", equipe_home)
+                display_goals_per_half(equipe_home, home_1st)
         
-        with col2:
-            home_2nd = goals_half_filtered[goals_half_filtered['Team'] == equipe_home]
-            if not home_2nd.empty:
-                st.metric(f"{equipe_home} - 2º Tempo", home_2nd.iloc[0]['2nd half'])
+            with col2:
+                home_2nd = lookup("goals_half_df", equipe_home)
+                if not home_2nd.empty:
+                    st.metric(f"{equipe_home} - 2º Tempo", format_percent(home_2nd.iloc[0]['2nd half']))
         
-        with col3:
-            away_1st = goals_half_filtered[goals_half_filtered['Team'] == equipe_away]
-            display_goals_per_half(equipe_away, away_1st)
+            with col3:
+                away_1st = lookup("goals_half_df", equipe_away)
+                display_goals_per_half(equipe_away, away_1st)
         
-        with col4:
-            away_2nd = goals_half_filtered[goals_half_filtered['Team'] == equipe_away]
-            if not away_2nd.empty:
-                st.metric(f"{equipe_away} - 2º Tempo", away_2nd.iloc[0]['2nd half'])
+            with col4:
+                away_2nd = lookup("goals_half_df", equipe_away)
+                if not away_2nd.empty:
+                    st.metric(f"{equipe_away} - 2º Tempo", format_percent(away_2nd.iloc[0]['2nd half']))
     
-    # Frequência de gols HT
-    st.markdown("### 📌 Frequência Gols HT")
-    col1, col2 = st.columns(2)
+        # Frequência de gols HT
+        st.markdown("### 📌 Frequência Gols HT")
+        col1, col2 = st.columns(2)
     
-    with col1:
-        home_ht = data["cv_home_df"][data["cv_home_df"]['Team_Home'] == equipe_home]
-        display_ht_frequency(equipe_home, home_ht, is_home=True)
+        with col1:
+            home_ht = lookup("cv_home_df", equipe_home)
+            display_ht_frequency(equipe_home, home_ht, is_home=True)
     
-    with col2:
-        away_ht = data["cv_away_df"][data["cv_away_df"]['Team_Away'] == equipe_away]
-        display_ht_frequency(equipe_away, away_ht, is_home=False)
+        with col2:
+            away_ht = lookup("cv_away_df", equipe_away)
+            display_ht_frequency(equipe_away, away_ht, is_home=False)
     
-    # Gols 15min
-    st.markdown("### ⏱️ Gols 15min")
-    col1, col2 = st.columns(2)
+        # Gols 15min
+        st.markdown("### ⏱️ Gols 15min")
+        col1, col2 = st.columns(2)
     
-    with col1:
-        home_time = data["goals_per_time_home_df"][data["goals_per_time_home_df"]['Team_Home'] == equipe_home]
-        display_goals_per_time(equipe_home, home_time, is_home=True)
+        with col1:
+            home_time = lookup("goals_per_time_home_df", equipe_home)
+            display_goals_per_time(equipe_home, home_time, is_home=True)
     
-    with col2:
-        away_time = data["goals_per_time_away_df"][data["goals_per_time_away_df"]['Team_Away'] == equipe_away]
-        display_goals_per_time(equipe_away, away_time, is_home=False)
+        with col2:
+            away_time = lookup("goals_per_time_away_df", equipe_away)
+            display_goals_per_time(equipe_away, away_time, is_home=False)
+
+        # Probabilidades ao longo do jogo a partir das faixas de 15 minutos
+        st.markdown("### ⏳ Probabilidades por Minuto (HT/FT)")
+        display_inplay_probabilities(equipe_home, equipe_away)
 
 # ABA 2 - HT
-with tabs[1]:
-    display_ht_tab(data, equipe_home, equipe_away)
+with tabs[1], profiler.section("aba 🎯 HT"):
+    if aba_aberta(1):
+        display_ht_tab(data, equipe_home, equipe_away)
 
 # ABA 3 - Análise Detalhada
-with tabs[2]:
-    display_analysis_tab(data, equipe_home, equipe_away)
+with tabs[2], profiler.section("aba 🧾 Analise"):
+    if aba_aberta(2):
+        display_analysis_tab(data, equipe_home, equipe_away)
 
 # ABA 4 - Análise HT
-with tabs[3]:
-    display_ht_analysis_tab(data, equipe_home, equipe_away)
+with tabs[3], profiler.section("aba 🧾 Analise HT"):
+    if aba_aberta(3):
+        display_ht_analysis_tab(data, equipe_home, equipe_away)
 
 # ABA 5 - Jogos do Dia
-with tabs[4]:
-    import pandas as pd
-    import streamlit as st
-    import requests
-    from io import StringIO
-    from datetime import datetime
-
-    #st.title("🎯 Jogos do Dia - Filtros FootyStats")
-
-    @st.cache_data(ttl=3600)
-    def carregar_dados_footystats():
-        data_atual = datetime.today().strftime('%Y-%m-%d')
-        url = f"https://github.com/futpythontrader/YouTube/raw/main/Jogos_do_Dia/FootyStats/Jogos_do_Dia_FootyStats_{data_atual}.csv"
-        response = requests.get(url)
-        if response.status_code == 200:
-            csv_data = StringIO(response.text)
-            df = pd.read_csv(csv_data)
-            # Ajuste ligas padrão
-            rename_leagues = {
-                'SWITZERLAND 1': 'Switzerland Super League',
-                'SPAIN 1': 'Spain La Liga',
-                'ENGLAND 3': 'England EFL League One',
-                'SERBIA 1': 'Serbia SuperLiga',
-                'TURKEY 1': 'Turkey Süper Lig',
-                'PARAGUAY 1': 'Paraguay Division Profesional',
-                'POLAND 1': 'Poland Ekstraklasa',
-                'SCOTLAND 1': 'Scotland Premiership',
-                'NETHERLANDS 1': 'Netherlands Eredivisie',
-                'ITALY 2': 'Italy - Serie B'
-            }
-            df['League'] = df['League'].replace(rename_leagues)
+with tabs[4], profiler.section("aba ⚽️ Jogos do Dia"):
+    if aba_aberta(4):
+        import pandas as pd
+        import streamlit as st
+        import requests
+        from io import BytesIO
+        from datetime import datetime
+
+        #st.title("🎯 Jogos do Dia - Filtros FootyStats")
+
+        def preparar_footystats(content):
+            df = pd.read_csv(BytesIO(content))
+            # Liga no padrão dos CSVs (aliases persistidos + rapidfuzz); 'League' mantém o código do FootyStats
+            aliases = resolve_leagues(df['League'])
+            df['Liga'] = df['League'].map(aliases)
             ligas_excluidas = {
                 'USA MLS'
             }
             df = df[~df['League'].isin(ligas_excluidas)]
             return df
+
+        @st.cache_data(ttl=3600)
+        def carregar_dados_footystats():
+            data_atual = datetime.today().strftime('%Y-%m-%d')
+            url = f"https://github.com/futpythontrader/YouTube/raw/main/Jogos_do_Dia/FootyStats/Jogos_do_Dia_FootyStats_{data_atual}.csv"
+            # Requisição condicional (ETag/Last-Modified): se o arquivo não mudou, reaproveita o DataFrame já processado
+            try:
+                return fetch_remote(url, preparar_footystats)
+            except requests.HTTPError as e:
+                st.error(f"Erro ao atualizar os jogos: {e.response.status_code}")
+                return None
+
+        df_footystats = carregar_dados_footystats()
+
+        if df_footystats is not None:
+            if REQUIRED_COLUMNS.issubset(df_footystats.columns):
+                # Filtros de estratégia (jogosdodia.strategies), um por coluna
+                for col, (estrategia, jogos) in zip(st.columns(len(STRATEGIES)), apply_strategies(df_footystats)):
+                    with col:
+                        st.info(estrategia.name)
+                        st.metric("Jogos encontrados", len(jogos))
+                        if not jogos.empty:
+                            st.dataframe(jogos[list(estrategia.columns)], use_container_width=True)
+
+                # 📋 Modelo Poisson para todos os jogos do dia (mesmo cálculo da aba Analise)
+                st.markdown("### 📋 Jogos do Dia — Probabilidades do Modelo")
+                slate = evaluate_slate(df_footystats)
+                com_perfil = slate[slate['Perfil']]
+                st.metric("Jogos com perfil", f"{len(com_perfil)} / {len(slate)}")
+                if not com_perfil.empty:
+                    st.dataframe(com_perfil.drop(columns=['Perfil']).round(2), use_container_width=True)
+            else:
+                st.error("❌ As colunas necessárias não estão presentes no arquivo do FootyStats.")
         else:
-            st.error(f"Erro ao atualizar os jogos: {response.status_code}")
-            return None
+            st.warning("⚠️ Sem jogos para hoje.")
 
-    df_footystats = carregar_dados_footystats()
 
-    if df_footystats is not None:
-        colunas_necessarias = {'PPG_Home', 'PPG_Away', 'Rodada', 'Odd_H_FT', 'Odd_DC_1X', 'League',
-                               'Date', 'Time', 'Home', 'Away', 'Odd_D_FT', 'Odd_A_FT', 'Odd_A_HT'}
-        
-        if colunas_necessarias.issubset(df_footystats.columns):
-            col1, col2, col3, col4, col5 = st.columns(5)
+profiler.report(aba=st.session_state.get("aba"))
 
-            # 📈 HA 0.25
-            with col1:
-                st.info("📈 HA 0.25")
-                df_ha = df_footystats[
-                    (df_footystats['Rodada'] >= 10) &
-                    (df_footystats['Odd_H_FT'].between(1.8, 2.0)) &
-                    (df_footystats['PPG_Home'] >= 1.8) &
-                    (df_footystats['PPG_Away'] <= 1.3)
-                ]
-                st.metric("Jogos encontrados", len(df_ha))
-                if not df_ha.empty:
-                    st.dataframe(df_ha[['Time', 'Home', 'Away', 'Odd_H_FT', 'Odd_D_FT', 'Odd_A_FT', 'Odd_DC_1X']],
-                                use_container_width=True)
-
-            # 🚫 Lay Visitante
-            with col2:
-                st.info("⚠️ Lay Visitante")
-                df_lay_visit = df_footystats[
-                    (df_footystats['Rodada'] >= 5) &
-                    (df_footystats['Odd_H_FT'] <= 2.4) &
-                    (df_footystats['Odd_A_FT'] <= 12) &
-                    (df_footystats['PPG_Home'] >= 1.8) &
-                    (df_footystats['XG_Home_Pre'] >= 1.80)
-                ]
-                st.metric("Jogos encontrados", len(df_lay_visit))
-                if not df_lay_visit.empty:
-                    st.dataframe(df_lay_visit[['Time', 'Home', 'Away', 'Odd_H_FT', 'Odd_D_FT', 'Odd_A_FT']],
-                                use_container_width=True)
-
-            # 💎 Back Casa
-            with col3:
-                st.info("💎 Back Home")
-                df_lay_ht = df_footystats[
-                    (df_footystats['Rodada'] >= 5) &
-                    (df_footystats['Odd_H_FT'] >= 1.25) & (df_footystats['Odd_H_FT'] <= 1.9) &
-                    (df_footystats['PPG_Away'] <= 0.50) &
-                    (df_footystats['PPG_Home'] >= 1.50)
-                ]
-                st.metric("Jogos encontrados", len(df_lay_ht))
-                if not df_lay_ht.empty:
-                    st.dataframe(df_lay_ht[['Time', 'Home', 'Away', 'Odd_H_FT', 'Odd_D_FT', 'Odd_A_FT']],
-                                use_container_width=True)
-
-             # 🎯 Back Home
-                with col4:
-                    st.info("🎯 Back Home")
-                    df_back_home = df_footystats[
-                        (df_footystats['Rodada'] >= 5) &
-                        (df_footystats['Odd_H_FT'] >= 1.9) &
-                        (df_footystats['Odd_H_FT'] <= 2.20) &
-                        (df_footystats['PPG_Home'] >= 1.8) &
-                        (df_footystats['League'] != 'SOUTH KOREA 1') & 
-                        (df_footystats['League'] != 'AUSTRIA 1') &
-                        (df_footystats['League'] != 'CHINA 1') &                        
-                        (df_footystats['League'] != 'ENGLAND 4') &
-                        (df_footystats['League'] != 'ESTONIA 1') &
-                        (df_footystats['League'] != 'GERMANY 2') &
-                        (df_footystats['League'] != 'IRELAND 1') &
-                        (df_footystats['League'] != 'NORWAY 1') &
-                        (df_footystats['League'] != 'NORWAY 2') &
-                        (df_footystats['League'] != 'POLAND 1') &
-                        (df_footystats['League'] != 'PORTUGAL 2') &
-                        (df_footystats['League'] != 'SLOVENIA 1') &
-                        (df_footystats['League'] != 'SLOVAKIA 1') &
-                        (df_footystats['League'] != 'SWITZERLAND 1') 
-                    ]
-                    st.metric("Jogos encontrados", len(df_back_home))
-                    if not df_back_home.empty:
-                        st.dataframe(df_back_home[['Time', 'Home', 'Away', 'Odd_H_FT', 'Odd_D_FT', 'Odd_A_FT']],
-                                    use_container_width=True)
-    
-             # 💰 HA +1
-                    with col5:
-                        st.info("💰 HA +1")
-                        df_white_flag = df_footystats[                                                     
-                            (df_footystats['Rodada'] >= 5) &
-                            (df_footystats['Odd_H_FT'] >= 1.6) & (df_footystats['Odd_H_FT'] <= 2.4) &
-                            (df_footystats['Odd_D_FT'] >= 3.5) & (df_footystats['Odd_D_FT'] <= 5.5) &
-                            (df_footystats['PPG_Home'] <= 1.90) & (df_footystats['PPG_Away'] >= 1.30)
-                            
-                        ]
-                        st.metric("Jogos encontrados", len(df_white_flag))
-                        if not df_white_flag.empty:
-                            st.dataframe(df_white_flag[['Time', 'Home', 'Away', 'Odd_H_FT', 'Odd_D_FT', 'Odd_A_FT']],
-                                        use_container_width=True)
-        else:
-            st.error("❌ As colunas necessárias não estão presentes no arquivo do FootyStats.")
-    else:
-        st.warning("⚠️ Sem jogos para hoje.")
-
-    
 # Executar com variável de ambiente PORT
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 10000))
@@ -6,108 +6,43 @@ import numpy as np
 from collections import Counter
 import itertools
 import math
-from scipy.stats import poisson
+
+from jogosdodia.bundle import bundle_pairing, open_bundle
+from jogosdodia.data import load_all_data, load_errors, lookup, lookup_many, refresh_if_stale
+from jogosdodia.profile import fixture_league, format_percent, has_source, team_profile
+from jogosdodia.teams import SIDEBAR_KEYS, get_team_universe
+from jogosdodia.widgets import frequency_bar
+from jogosdodia.scoreline import correct_score, expected_goals, score_matrix, top_scorelines
+from jogosdodia.strength import strength_lambdas
+from jogosdodia.profiler import get_profiler
 
 
 
 # Configuração da página
 st.set_page_config(page_title="Football Stats", layout="wide")
 
-# ----------------------------
-# FUNÇÃO UTILITÁRIA PARA CARREGAR CSV
-# ----------------------------
-@st.cache_data
-def load_csv(url):
-    df = pd.read_csv(url, encoding="utf-8-sig")
-    df = df.dropna(axis=1, how='all')  # Remove colunas totalmente vazias
-    df.columns = df.columns.str.strip()  # Limpa os nomes das colunas
-    return df
-
-# ----------------------------
-# FUNÇÕES DE CARREGAMENTO DE DADOS
-# ----------------------------
-@st.cache_data
-def load_all_data():
-    urls = [
-        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/equipes_casa.csv",
-        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/equipes_fora.csv",
-        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/equipes_fora_Favorito.csv",
-        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/overall_stats.csv"
-    ]
-    return [load_csv(url) for url in urls]
-
-@st.cache_data
-def load_first_goal_data():
-    urls = [
-        "https://raw.githubusercontent.com/scooby75/firstgoal/main/scored_first_home.csv",
-        "https://raw.githubusercontent.com/scooby75/firstgoal/main/scored_first_away.csv"
-    ]
-    return [load_csv(url) for url in urls]
-
-@st.cache_data
-def load_goal_minute_data():
-    urls = [
-        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/momento_do_gol_home.csv",
-        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/momento_do_gol_away.csv"
-    ]
-    return [load_csv(url) for url in urls]
-
-@st.cache_data
-def load_goals_half_data():
-    return load_csv("https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/Goals_Half.csv")
-
-@st.cache_data
-def goals_ht_data():
-    urls = [
-        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/CV_Goals_HT_Home.csv",
-        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/CV_Goals_HT_Away.csv"
-    ]
-    return [load_csv(url) for url in urls]
-
-@st.cache_data
-def goals_per_time_data():
-    urls = [
-        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/Goals_Per_Time_Home.csv",
-        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/Goals_Per_Time_Away.csv"
-    ]
-    return [load_csv(url) for url in urls]
-
-@st.cache_data
-def ppg_ht_data():
-    urls = [
-        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/PPG_HT_Home.csv",
-        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/PPG_HT_Away.csv"
-    ]
-    return [load_csv(url) for url in urls]
-
-
-
-# ----------------------------
-# NORMALIZAÇÃO DE COLUNAS
-# ----------------------------
-def normalize_columns(df):
-    df.columns = df.columns.str.strip()
-    return df
+# Perfil opcional de cada rerun (JOGOSDODIA_PROFILE=1, ou ?profile=1 na URL com JOGOSDODIA_PROFILE_QUERY=1)
+profiler = get_profiler("appft", st.query_params.get("profile"))
 
 # ----------------------------
 # CARREGAMENTO DOS DADOS
 # ----------------------------
-home_df, away_df, away_fav_df, overall_df = load_all_data()
-home_fg_df, away_fg_df = load_first_goal_data()
-goal_minute_home_df, goal_minute_away_df = load_goal_minute_data()
-goals_half_df = load_goals_half_data()
-cv_home_df, cv_away_df = goals_ht_data()
-goals_per_time_home_df, goals_per_time_away_df = goals_per_time_data()
-ppg_ht_home_df, ppg_ht_away_df = ppg_ht_data()
-
-# Normalizar todas as tabelas
-all_dfs = [
-    home_df, away_df, away_fav_df, overall_df, home_fg_df, away_fg_df,
-    goal_minute_home_df, goal_minute_away_df, goals_half_df, cv_home_df, cv_away_df,
-    goals_per_time_home_df, goals_per_time_away_df, ppg_ht_home_df, ppg_ht_away_df
-]
-for df in all_dfs:
-    normalize_columns(df)
+with profiler.section("carregamento"):
+    # Com JOGOSDODIA_BUNDLE as tabelas vêm prontas do bundle (python -m jogosdodia.build)
+    if open_bundle() is None:
+        # Sem bundle, as tabelas em memória são revalidadas na origem a cada REFRESH_INTERVAL, em segundo plano
+        refresh_if_stale()
+    data = load_all_data()
+for error in load_errors().values():
+    st.error(error)
+
+home_df, away_df, away_fav_df, overall_df = data["home_df"], data["away_df"], data["away_fav_df"], data["overall_df"]
+home_fg_df, away_fg_df = data["home_fg_df"], data["away_fg_df"]
+goal_minute_home_df, goal_minute_away_df = data["goal_minute_home_df"], data["goal_minute_away_df"]
+goals_half_df = data["goals_half_df"]
+cv_home_df, cv_away_df = data["cv_home_df"], data["cv_away_df"]
+goals_per_time_home_df, goals_per_time_away_df = data["goals_per_time_home_df"], data["goals_per_time_away_df"]
+ppg_ht_home_df, ppg_ht_away_df = data["ppg_ht_home_df"], data["ppg_ht_away_df"]
 
 # ----------------------------
 # VARIÁVEIS GLOBAIS
@@ -117,35 +52,22 @@ away_columns = ["Liga", "PIA", "PIA_HA", "GD_Away", "PPG_Away", "GF_AVG_Away", "
 overall_columns = ["Liga", "PIO", "PIO_HA", "GD_Overall", "PPG_Overall", "GF_AVG_Overall", "Odd_Justa_MO", "Odd_Justa_HA", "Rank_Overall"]
 
 
-# Filtrando os nomes das equipes para garantir que são apenas letras e espaços
-all_teams = sorted(set(
-    home_df['Team_Home'].dropna().astype(str)[home_df['Team_Home'].str.contains(r'^[A-Za-z\s]+$', na=False)].tolist() +
-    away_df['Team_Away'].dropna().astype(str)[away_df['Team_Away'].str.contains(r'^[A-Za-z\s]+$', na=False)].tolist() +
-    away_fav_df['Team_Away_Fav'].dropna().astype(str)[away_fav_df['Team_Away_Fav'].str.contains(r'^[A-Za-z\s]+$', na=False)].tolist() +
-    overall_df['Team_Home_Overall'].dropna().astype(str)[overall_df['Team_Home_Overall'].str.contains(r'^[A-Za-z\s]+$', na=False)].tolist() +
-    home_fg_df['Team_Home'].dropna().astype(str)[home_fg_df['Team_Home'].str.contains(r'^[A-Za-z\s]+$', na=False)].tolist() +
-    away_fg_df['Team_Away'].dropna().astype(str)[away_fg_df['Team_Away'].str.contains(r'^[A-Za-z\s]+$', na=False)].tolist() +
-    goal_minute_home_df['Team_Home'].dropna().astype(str)[goal_minute_home_df['Team_Home'].str.contains(r'^[A-Za-z\s]+$', na=False)].tolist() +
-    goal_minute_away_df['Team_Away'].dropna().astype(str)[goal_minute_away_df['Team_Away'].str.contains(r'^[A-Za-z\s]+$', na=False)].tolist() +
-    goals_half_df['Team'].dropna().astype(str)[goals_half_df['Team'].str.contains(r'^[A-Za-z\s]+$', na=False)].tolist() +
-    goals_per_time_home_df['Team_Home'].dropna().astype(str)[goals_per_time_home_df['Team_Home'].str.contains(r'^[A-Za-z\s]+$', na=False)].tolist() +
-    goals_per_time_away_df['Team_Away'].dropna().astype(str)[goals_per_time_away_df['Team_Away'].str.contains(r'^[A-Za-z\s]+$', na=False)].tolist() +
-    ppg_ht_home_df['Team_Home'].dropna().astype(str)[ppg_ht_home_df['Team_Home'].str.contains(r'^[A-Za-z\s]+$', na=False)].tolist() +
-    ppg_ht_away_df['Team_Away'].dropna().astype(str)[ppg_ht_away_df['Team_Away'].str.contains(r'^[A-Za-z\s]+$', na=False)].tolist()
-))
+# Lista de times (montada uma vez por versão dos dados; aceita nomes com acento e número)
+with profiler.section("lista de times"):
+    teams = get_team_universe(SIDEBAR_KEYS["ft"])
 
 # Seleção dos times para a interface
-equipe_home = st.sidebar.selectbox("🏠 Time da Casa:", all_teams, index=all_teams.index('Bayern Munich') if 'Bayern Munich' in all_teams else 0)
-equipe_away = st.sidebar.selectbox("🛫 Time Visitante:", all_teams, index=all_teams.index('Dortmund') if 'Dortmund' in all_teams else 0)
+equipe_home = st.sidebar.selectbox("🏠 Time da Casa:", teams.teams, index=teams.index('Bayern Munich'))
+equipe_away = st.sidebar.selectbox("🛫 Time Visitante:", teams.teams, index=teams.index('Dortmund'))
 
 
 # ----------------------------
 # APLICAR FILTROS
 # ----------------------------
-home_filtered = home_df[home_df['Team_Home'] == equipe_home][home_columns]
-away_filtered = away_df[away_df['Team_Away'] == equipe_away][away_columns]
-away_fav_filtered = away_fav_df[away_fav_df['Team_Away_Fav'] == equipe_away][away_columns]
-overall_filtered = overall_df[overall_df['Team_Home_Overall'] == equipe_home][overall_columns]
+home_filtered = lookup("home_df", equipe_home)[home_columns]
+away_filtered = lookup("away_df", equipe_away)[away_columns]
+away_fav_filtered = lookup("away_fav_df", equipe_away)[away_columns]
+overall_filtered = lookup("overall_df", equipe_home)[overall_columns]
 
 # ----------------------------
 # INTERFACE STREAMLIT
@@ -156,44 +78,48 @@ tabs = st.tabs([
 ])
 
 # ABA 1 - Home Favorito
-with tabs[1]:
+with tabs[1], profiler.section("aba 🏠 Home"):
     st.markdown("### Home")
     st.dataframe(home_filtered, use_container_width=True)
     st.markdown("### Away")
     st.dataframe(away_filtered, use_container_width=True)
 
 # ABA 2 - Home Geral
-with tabs[2]:
+with tabs[2], profiler.section("aba 📊 Overall"):
     st.markdown("### Home - Geral")
     st.dataframe(overall_filtered, use_container_width=True)
     st.markdown("### Away")
     st.dataframe(away_filtered, use_container_width=True)
 
 # ABA 3 - Away Favorito
-with tabs[3]:
+with tabs[3], profiler.section("aba 🛫 Away"):
     st.markdown("### Away - Favorito")
     st.dataframe(away_fav_filtered, use_container_width=True)
     st.markdown("### Home")
     st.dataframe(home_filtered, use_container_width=True)
 
 # ABA 4 - First Goal
-with tabs[4]:
-    def show_team_stats(team_name, df, col_name, local):
-        stats = df[df[col_name] == team_name]
+with tabs[4], profiler.section("aba ⚽ First Goal"):
+    @profiler.wrap
+    def show_team_stats(team_name, key, local):
+        stats = lookup(key, team_name)
         if not stats.empty:
             st.markdown(f"### {team_name} ({local})")
             cols = ['Matches', 'First_Gol', 'Goals']
-            st.dataframe(stats[cols] if all(c in stats.columns for c in cols) else stats, use_container_width=True)
+            st.dataframe(
+                stats[cols] if all(c in stats.columns for c in cols) else stats, use_container_width=True,
+                column_config={"First_Gol": st.column_config.NumberColumn(format="%g%%")}
+            )
         else:
             st.warning(f"Nenhuma estatística encontrada para {team_name} ({local})")
 
-    show_team_stats(equipe_home, home_fg_df, 'Team_Home', 'Casa')
-    show_team_stats(equipe_away, away_fg_df, 'Team_Away', 'Fora')
+    show_team_stats(equipe_home, "home_fg_df", 'Casa')
+    show_team_stats(equipe_away, "away_fg_df", 'Fora')
 
 # ABA 5 - Goals Minute
-with tabs[5]:
-    home_team_data = goal_minute_home_df[goal_minute_home_df['Team_Home'] == equipe_home]
-    away_team_data = goal_minute_away_df[goal_minute_away_df['Team_Away'] == equipe_away]
+with tabs[5], profiler.section("aba ⏱️ Goals_Minute"):
+    home_team_data = lookup("goal_minute_home_df", equipe_home)
+    away_team_data = lookup("goal_minute_away_df", equipe_away)
 
     if not home_team_data.empty:
         st.success(f"🏠 **{equipe_home}** marca seu primeiro gol em média aos **{home_team_data['AVG_min_scored'].values[0]:.1f} min**.")
@@ -206,35 +132,25 @@ with tabs[5]:
         st.warning("Nenhum dado encontrado para o time visitante.")
 
 # ABA 6 - Goals Half
-with tabs[6]:
-    filtered = goals_half_df[goals_half_df['Team'].isin([equipe_home, equipe_away])]
+with tabs[6], profiler.section("aba ⚡ Goals HT/FT"):
+    filtered = lookup_many("goals_half_df", [equipe_home, equipe_away])
     if not filtered.empty:
-        st.dataframe(filtered[['League_Name', 'Team', 'Scored', '1st half', '2nd half']], use_container_width=True)
+        st.dataframe(
+            filtered[['League_Name', 'Team', 'Scored', '1st half', '2nd half']], use_container_width=True,
+            column_config={half: st.column_config.NumberColumn(format="%g%%") for half in ['1st half', '2nd half']}
+        )
     else:
         st.warning("Nenhuma estatística de Goals Half encontrada.")
 
 # ABA 7 - Goals HT
 
-with tabs[7]:
+with tabs[7], profiler.section("aba 📌 CV HT"):
+    @profiler.wrap
     def gerar_barra_frequencia(frequencia_dict):
-        cores = {
-            "0": "#d9534f",  # vermelho
-            "1": "#20de6e",  # verde
-            "2": "#16ed48",  # azul
-            "3": "#24da1e",  # laranja
-            "4": "#56b72d"   # roxo
-        }
-
-        html = '<div style="display:flex; flex-wrap: wrap;">'
-        for gols, freq in frequencia_dict.items():
-            blocos = int(freq)  # 1 bloco por %
-            for _ in range(blocos):
-                html += f'<div style="width: 6px; height: 20px; background-color: {cores[gols]}; margin: 1px;"></div>'
-        html += '</div>'
-        return html
+        return frequency_bar(frequencia_dict)
 
     # Time da casa
-    home_ht = cv_home_df[cv_home_df['Team_Home'] == equipe_home]
+    home_ht = lookup("cv_home_df", equipe_home)
     if not home_ht.empty:
         df_home = home_ht.rename(columns={
             "Avg.": "Avg",
@@ -267,7 +183,7 @@ with tabs[7]:
         st.warning("Dados não encontrados para o time da casa.")
 
     # Time visitante
-    away_ht = cv_away_df[cv_away_df['Team_Away'] == equipe_away]
+    away_ht = lookup("cv_away_df", equipe_away)
     if not away_ht.empty:
         df_away = away_ht.rename(columns={
             "Avg..1": "Avg",
@@ -298,7 +214,7 @@ with tabs[7]:
 
 # ABA 8 - Resumo     
 # ABA 8 - Resumo     
-with tabs[0]:
+with tabs[0], profiler.section("aba 🧾 Resumo"):
     # Definindo o emoji antes de usá-lo
     if not home_filtered.empty:
         row = home_filtered.iloc[0]
@@ -351,28 +267,25 @@ with tabs[0]:
     
     with col1:
         # Colocando o emoji antes do nome da equipe da casa
-        stats_home_fg = home_fg_df[home_fg_df['Team_Home'] == equipe_home]
+        stats_home_fg = lookup("home_fg_df", equipe_home)
         if not stats_home_fg.empty:
             row = stats_home_fg.iloc[0]
             partidas = row['Matches']
-            primeiro_gol = row['First_Gol']  # Este valor tem o símbolo "%" (ex: "62%")
+            primeiro_gol = row['First_Gol']  # Porcentagem numérica (ex: 62.0)
             total_gols = row['Goals']
     
             col_a, col_b, col_c = st.columns(3)
             col_a.metric("Partidas", partidas)
-            col_b.metric("1º Gol", f"{primeiro_gol}")  # Exibindo como porcentagem
+            col_b.metric("1º Gol", format_percent(primeiro_gol))  # Exibindo como porcentagem
             col_c.metric("Total de Gols", total_gols)
     
-            # Remover o símbolo "%" e converter para número
-            try:
-                primeiro_gol_num = float(primeiro_gol.replace('%', ''))  # Removendo "%" antes de converter
-                # Se o time da casa marcar o 1º gol em >= 60% das vezes
-                if primeiro_gol_num >= 60:
-                    gol_emoji = "🟩"  # Verde
-                else:
-                    gol_emoji = "🟥"  # Vermelho
-            except ValueError:
+            if pd.isna(primeiro_gol):
                 gol_emoji = "🟨"  # Caso o valor não seja numérico, emoji de alerta
+            # Se o time da casa marcar o 1º gol em >= 60% das vezes
+            elif primeiro_gol >= 60:
+                gol_emoji = "🟩"  # Verde
+            else:
+                gol_emoji = "🟥"  # Vermelho
     
             # Exibindo o nome da equipe com o emoji antes
             st.markdown(f"{gol_emoji} **{equipe_home} (Casa)**")
@@ -381,28 +294,25 @@ with tabs[0]:
     
     with col2:
         # Colocando o emoji antes do nome da equipe visitante
-        stats_away_fg = away_fg_df[away_fg_df['Team_Away'] == equipe_away]
+        stats_away_fg = lookup("away_fg_df", equipe_away)
         if not stats_away_fg.empty:
             row = stats_away_fg.iloc[0]
             partidas = row['Matches']
-            primeiro_gol = row['First_Gol']  # Este valor tem o símbolo "%" (ex: "50%")
+            primeiro_gol = row['First_Gol']  # Porcentagem numérica (ex: 50.0)
             total_gols = row['Goals']
     
             col_a, col_b, col_c = st.columns(3)
             col_a.metric("Partidas", partidas)
-            col_b.metric("1º Gol", f"{primeiro_gol}")  # Exibindo como porcentagem
+            col_b.metric("1º Gol", format_percent(primeiro_gol))  # Exibindo como porcentagem
             col_c.metric("Total de Gols", total_gols)
     
-            # Remover o símbolo "%" e converter para número
-            try:
-                primeiro_gol_num = float(primeiro_gol.replace('%', ''))  # Removendo "%" antes de converter
-                # Se o time visitante marcar o 1º gol em <= 45% das vezes
-                if primeiro_gol_num <= 45:
-                    gol_emoji = "🟩"  # Verde
-                else:
-                    gol_emoji = "🟥"  # Vermelho
-            except ValueError:
+            if pd.isna(primeiro_gol):
                 gol_emoji = "🟨"  # Caso o valor não seja numérico, emoji de alerta
+            # Se o time visitante marcar o 1º gol em <= 45% das vezes
+            elif primeiro_gol <= 45:
+                gol_emoji = "🟩"  # Verde
+            else:
+                gol_emoji = "🟥"  # Vermelho
     
             # Exibindo o nome da equipe com o emoji antes
             st.markdown(f"{gol_emoji} **{equipe_away} (Fora)**")
@@ -412,76 +322,58 @@ with tabs[0]:
 
     st.markdown("### ⏱️ Frequência Gols 1º e 2º Tempo")
 
-    goals_half_filtered = goals_half_df[goals_half_df['Team'].isin([equipe_home, equipe_away])]
+    goals_half_filtered = lookup_many("goals_half_df", [equipe_home, equipe_away])
     if not goals_half_filtered.empty:
         col1, col2, col3, col4 = st.columns(4)
     
         with col1:
             home_1st_half = goals_half_filtered[goals_half_filtered['Team'] == equipe_home]['1st half'].values[0] if equipe_home in goals_half_filtered['Team'].values else "Sem dados"
             if home_1st_half != "Sem dados":
-                # Remove o '%' e converte para float
-                home_1st_half_num = float(home_1st_half.strip('%'))  # Já está em % na base de dados
-                gol_emoji_home = "🟩" if home_1st_half_num >= 50 else "🟥"  # Se >= 50% é verde, senão vermelho
-                st.metric(f"{gol_emoji_home} {equipe_home} - 1º Tempo", home_1st_half)
+                gol_emoji_home = "🟩" if home_1st_half >= 50 else "🟥"  # Se >= 50% é verde, senão vermelho
+                st.metric(f"{gol_emoji_home} {equipe_home} - 1º Tempo", format_percent(home_1st_half))
             else:
                 st.metric(f"{equipe_home} - 1º Tempo", home_1st_half)
     
         with col2:
             home_2nd_half = goals_half_filtered[goals_half_filtered['Team'] == equipe_home]['2nd half'].values[0] if equipe_home in goals_half_filtered['Team'].values else "Sem dados"
-            st.metric(f"{equipe_home} - 2º Tempo", home_2nd_half)
+            st.metric(f"{equipe_home} - 2º Tempo", format_percent(home_2nd_half) if home_2nd_half != "Sem dados" else home_2nd_half)
     
         with col3:
             away_1st_half = goals_half_filtered[goals_half_filtered['Team'] == equipe_away]['1st half'].values[0] if equipe_away in goals_half_filtered['Team'].values else "Sem dados"
             if away_1st_half != "Sem dados":
-                # Remove o '%' e converte para float
-                away_1st_half_num = float(away_1st_half.strip('%'))  # Já está em % na base de dados
-                gol_emoji_away = "🟥" if away_1st_half_num >= 55 else "🟩"  # Se <= 50% é vermelho, senão verde
-                st.metric(f"{gol_emoji_away} {equipe_away} - 1º Tempo", away_1st_half)
+                gol_emoji_away = "🟥" if away_1st_half >= 55 else "🟩"  # Se <= 50% é vermelho, senão verde
+                st.metric(f"{gol_emoji_away} {equipe_away} - 1º Tempo", format_percent(away_1st_half))
             else:
                 st.metric(f"{equipe_away} - 1º Tempo", away_1st_half)
     
         with col4:
             away_2nd_half = goals_half_filtered[goals_half_filtered['Team'] == equipe_away]['2nd half'].values[0] if equipe_away in goals_half_filtered['Team'].values else "Sem dados"
-            st.metric(f"{equipe_away} - 2º Tempo", away_2nd_half)
+            st.metric(f"{equipe_away} - 2º Tempo", format_percent(away_2nd_half) if away_2nd_half != "Sem dados" else away_2nd_half)
     
     else:
         st.info("Sem dados.")
 
     st.markdown("### 📌 Frequência Gols HT")
 
+    @profiler.wrap
+
     def gerar_barra_frequencia(frequencia_dict):
-        cores = {
-            "0": "#d9534f",
-            "1": "#20de6e",
-            "2": "#16ed48",
-            "3": "#24da1e",
-            "4": "#56b72d"
-        }
-    
-        html = '<div style="display:flex; flex-wrap: wrap;">'
-        for gols, freq in frequencia_dict.items():
-            try:
-                blocos = int(float(str(freq).replace(',', '.')))
-            except:
-                blocos = 0
-            for _ in range(blocos):
-                html += f'<div style="width: 6px; height: 20px; background-color: {cores[gols]}; margin: 1px;"></div>'
-        html += '</div>'
-        return html
+        return frequency_bar(frequencia_dict)
     
     col1, col2 = st.columns(2)
     
     with col1:
-        home_ht = cv_home_df[cv_home_df['Team_Home'] == equipe_home]
+        home_ht = lookup("cv_home_df", equipe_home)
         if not home_ht.empty:
             df_home = home_ht.rename(columns={
                 "Avg.": "Avg", "4+": "4", "3": "3", "2": "2", "1": "1", "0": "0"
             })[["Team_Home", "Avg", "0", "1", "2", "3", "4", "Total_Jogos", "% Com Gols", "% Sem Gols", "Classificação Ofensiva"]]
     
             row = df_home.iloc[0]
-            media = float(str(row['Avg']).replace(',', '.')) if row['Avg'] else 0.0
-            com_gols = f"{int(round(float(str(row.get('% Com Gols', '0')).replace('%', '').replace(',', '.'))))}%"
-            sem_gols = f"{int(round(float(str(row.get('% Sem Gols', '0')).replace('%', '').replace(',', '.'))))}%"
+            media = 0.0 if pd.isna(row['Avg']) else row['Avg']
+            com_gols_percent = 0.0 if pd.isna(row['% Com Gols']) else row['% Com Gols']
+            com_gols = f"{int(round(com_gols_percent))}%"
+            sem_gols = f"{int(round(0.0 if pd.isna(row['% Sem Gols']) else row['% Sem Gols']))}%"
     
             # Determinando o emoji para Média de Gols
             if media >= 0.60:
@@ -490,7 +382,6 @@ with tabs[0]:
                 media_emoji = "🟥"
     
             # Determinando o emoji para Com Gols
-            com_gols_percent = float(com_gols.replace('%', ''))
             if com_gols_percent >= 60:
                 com_gols_emoji = "🟩"
             else:
@@ -507,16 +398,17 @@ with tabs[0]:
             st.warning("Dados não encontrados para o time da casa.")
     
     with col2:
-        away_ht = cv_away_df[cv_away_df['Team_Away'] == equipe_away]
+        away_ht = lookup("cv_away_df", equipe_away)
         if not away_ht.empty:
             df_away = away_ht.rename(columns={
                 "Avg..1": "Avg", "0.1": "0", "1.1": "1", "2.1": "2", "3.1": "3", "4+.1": "4"
             })[["Team_Away", "Avg", "0", "1", "2", "3", "4", "Total_Jogos", "% Com Gols", "% Sem Gols", "Classificação Ofensiva"]]
     
             row = df_away.iloc[0]
-            media = float(str(row['Avg']).replace(',', '.')) if row['Avg'] else 0.0
-            com_gols = f"{int(round(float(str(row.get('% Com Gols', '0')).replace('%', '').replace(',', '.'))))}%"
-            sem_gols = f"{int(round(float(str(row.get('% Sem Gols', '0')).replace('%', '').replace(',', '.'))))}%"
+            media = 0.0 if pd.isna(row['Avg']) else row['Avg']
+            com_gols_percent = 0.0 if pd.isna(row['% Com Gols']) else row['% Com Gols']
+            com_gols = f"{int(round(com_gols_percent))}%"
+            sem_gols = f"{int(round(0.0 if pd.isna(row['% Sem Gols']) else row['% Sem Gols']))}%"
     
             # Determinando o emoji para Média de Gols
             if media >= 0.70:
@@ -525,8 +417,7 @@ with tabs[0]:
                 media_emoji_away = "🟩"
     
             # Determinando o emoji para Com Gols
-            com_gols_percent_away = float(com_gols.replace('%', ''))
-            if com_gols_percent_away >= 50:
+            if com_gols_percent >= 50:
                 com_gols_emoji_away = "🟥"
             else:
                 com_gols_emoji_away = "🟩"
@@ -549,10 +440,10 @@ with tabs[0]:
     
     with col1:
         # Filtrando os dados do time da casa
-        filtered_home = goals_per_time_home_df[goals_per_time_home_df['Team_Home'] == equipe_home]
+        filtered_home = lookup("goals_per_time_home_df", equipe_home)
         if not filtered_home.empty:
-            # Remover a parte de texto (" min.") da coluna AVG_Scored e converter para numérico
-            avg_scored_home = filtered_home['AVG_Scored_Home'].str.extract('(\d+)').astype(float).values[0]
+            # AVG_Scored já vem em minutos (numérico) do esquema de ingestão
+            avg_scored_home = filtered_home['AVG_Scored_Home'].values[0]
             
             # Verificando se o valor é válido
             if pd.isna(avg_scored_home):
@@ -561,16 +452,19 @@ with tabs[0]:
                 # Definindo o ícone com base no valor de AVG_Scored
                 home_icon = "🟩" if avg_scored_home <= 45 else "🟥"
                 st.markdown(f"{home_icon} **{equipe_home} (Casa)**")
-                st.dataframe(filtered_home[['League', 'GP', 'AVG_Scored_Home', '0-15', '16-30', '31-45']], use_container_width=True)
+                st.dataframe(
+                    filtered_home[['League', 'GP', 'AVG_Scored_Home', '0-15', '16-30', '31-45']], use_container_width=True,
+                    column_config={"AVG_Scored_Home": st.column_config.NumberColumn(format="%d min.")}
+                )
         else:
             st.info("Sem dados de gols por faixa de tempo para o time da casa.")
     
     with col2:
         # Filtrando os dados do time visitante
-        filtered_away = goals_per_time_away_df[goals_per_time_away_df['Team_Away'] == equipe_away]
+        filtered_away = lookup("goals_per_time_away_df", equipe_away)
         if not filtered_away.empty:
-            # Remover a parte de texto (" min.") da coluna AVG_Scored e converter para numérico
-            avg_scored_away = filtered_away['AVG_Scored_Away'].str.extract('(\d+)').astype(float).values[0]
+            # AVG_Scored já vem em minutos (numérico) do esquema de ingestão
+            avg_scored_away = filtered_away['AVG_Scored_Away'].values[0]
             
             # Verificando se o valor é válido
             if pd.isna(avg_scored_away):
@@ -579,23 +473,20 @@ with tabs[0]:
                 # Definindo o ícone com base no valor de AVG_Scored
                 away_icon = "🟥" if avg_scored_away <= 45 else "🟩"
                 st.markdown(f"{away_icon} **{equipe_away} (Fora)**")
-                st.dataframe(filtered_away[['League', 'GP', 'AVG_Scored_Away', '0-15', '16-30', '31-45']], use_container_width=True)
+                st.dataframe(
+                    filtered_away[['League', 'GP', 'AVG_Scored_Away', '0-15', '16-30', '31-45']], use_container_width=True,
+                    column_config={"AVG_Scored_Away": st.column_config.NumberColumn(format="%d min.")}
+                )
         else:
             st.info("Sem dados de gols por faixa de tempo para o time visitante.")
 
 
 # ABA 9 - Goals Per Time
     
-    with tabs[8]:
-        goals_per_time_home_df, goals_per_time_away_df = goals_per_time_data()
-    
-        # Limpeza dos nomes de times
-        goals_per_time_home_df['Team_Home'] = goals_per_time_home_df['Team_Home'].astype(str).str.strip()
-        goals_per_time_away_df['Team_Away'] = goals_per_time_away_df['Team_Away'].astype(str).str.strip()
-    
+    with tabs[8], profiler.section("aba 📊 Goals Per Time"):
         # Filtrando os dados para os times selecionados
-        filtered_home = goals_per_time_home_df[goals_per_time_home_df['Team_Home'] == equipe_home]
-        filtered_away = goals_per_time_away_df[goals_per_time_away_df['Team_Away'] == equipe_away]
+        filtered_home = lookup("goals_per_time_home_df", equipe_home)
+        filtered_away = lookup("goals_per_time_away_df", equipe_away)
     
         # Verificando se ambos os dataframes têm dados
         if not filtered_home.empty and not filtered_away.empty:
@@ -607,98 +498,64 @@ with tabs[0]:
             st.warning("Nenhuma estatística encontrada para os times selecionados.")
 
 # ABA 11 - WTF
-    with tabs[9]:
-        # Coleta de dados
-        home_data = ppg_ht_home_df[ppg_ht_home_df['Team_Home'] == equipe_home]
-        away_data = ppg_ht_away_df[ppg_ht_away_df['Team_Away'] == equipe_away]
-        cv_home_data = cv_home_df[cv_home_df['Team_Home'] == equipe_home]
-        cv_away_data = cv_away_df[cv_away_df['Team_Away'] == equipe_away]
-        fg_home = home_fg_df[home_fg_df['Team_Home'] == equipe_home]
-        fg_away = away_fg_df[away_fg_df['Team_Away'] == equipe_away]
-        gm_home = goal_minute_home_df[goal_minute_home_df['Team_Home'] == equipe_home]
-        gm_away = goal_minute_away_df[goal_minute_away_df['Team_Away'] == equipe_away]
-    
+    with tabs[9], profiler.section("aba ⚠️ HTF"):
+        # Coleta de dados (perfil por time: PPG HT, CV, 1º gol e minuto médio)
+        # Os dois times na liga do confronto (times em mais de uma liga)
+        league = fixture_league(equipe_home, equipe_away)
+        home = team_profile(equipe_home, "home", league)
+        away = team_profile(equipe_away, "away", league)
+
         col_home, col_away = st.columns(2)
-    
+
         with col_home:
             st.markdown(f"### 🏠 {equipe_home}")
             
             # Exibe as métricas para o time da casa
-            #st.metric("📅 Jogos (GP)", int(home_data['GP'].values[0]) if not home_data.empty else 0)
-            st.metric("📈 PIH", round(home_data['PIH'].values[0], 2) if not home_data.empty else 0)
-            st.metric("🏠 PPG HT", round(home_data['PPG_HT_Home'].values[0], 2) if not home_data.empty else 0)
-            st.metric("📊 Média Gols", round(home_data['GF_AVG_Home'].values[0], 2) if not home_data.empty else 0)
-            st.metric("📈 Saldo de Gols", round(home_data['GD_Home'].values[0], 2) if not home_data.empty else 0)
-            st.metric("🏆 Rank", int(home_data['Rank_Home'].values[0]) if not home_data.empty else "—")
-    
-            # Verifica e extrai o primeiro gol se disponível
-            if not fg_home.empty:
-                row = fg_home.iloc[0]
-                primeiro_gol = row['First_Gol']  # Valor como string (ex: "62%")
-                partidas = row['Matches']  # Para mostrar quantas partidas o time jogou
-    
-                # Exibe o primeiro gol, removendo o símbolo de "%" caso necessário
-                try:
-                    st.metric("⚽ 1º Gol", primeiro_gol)
-                except Exception as e:
-                    st.metric("⚽ 1º Gol", "Erro")
-                    st.write(f"Erro ao processar 1º gol: {e}")
-            else:
-                st.metric("⚽ 1º Gol", "—")
-    
+            tem_ht = has_source(home, "ht")
+            st.metric("📈 PIH", round(home['ht_PIH'], 2) if tem_ht else 0)
+            st.metric("🏠 PPG HT", round(home['ht_PPG_HT_Home'], 2) if tem_ht else 0)
+            st.metric("📊 Média Gols", round(home['ht_GF_AVG_Home'], 2) if tem_ht else 0)
+            st.metric("📈 Saldo de Gols", round(home['ht_GD_Home'], 2) if tem_ht else 0)
+            st.metric("🏆 Rank", int(home['ht_Rank_Home']) if tem_ht else "—")
+
+            # Primeiro gol (já convertido para número no perfil)
+            st.metric("⚽ 1º Gol", format_percent(home['fg_First_Gol']) if has_source(home, "fg") else "—")
+
             # Exibe o minuto médio para o time da casa
-            st.metric("⏱️ Tempo Médio 1º Gol", round(gm_home['AVG_min_scored'].values[0], 1) if not gm_home.empty else "—")
-    
+            st.metric("⏱️ Tempo Médio 1º Gol", round(home['gm_AVG_min_scored'], 1) if has_source(home, "gm") else "—")
+
         with col_away:
             st.markdown(f"### 🛫 {equipe_away}")
             
             # Exibe as métricas para o time visitante
-            #st.metric("📅 Jogos (GP)", int(away_data['GP'].values[0]) if not away_data.empty else 0)
-            st.metric("📉 PIA", round(away_data['PIA'].values[0], 2) if not away_data.empty else 0)
-            st.metric("🛫 PPG HT", round(away_data['PPG_HT_Away'].values[0], 2) if not away_data.empty else 0)
-            st.metric("📊 Média de Gols", round(away_data['GF_AVG_Away'].values[0], 2) if not away_data.empty else 0)
-            st.metric("📉 Saldo de Gols", round(away_data['GD_Away'].values[0], 2) if not away_data.empty else 0)
-            st.metric("🏆 Rank", int(away_data['Rank_Away'].values[0]) if not away_data.empty else "—")
-    
-            # Verifica e extrai o primeiro gol se disponível
-            if not fg_away.empty:
-                row = fg_away.iloc[0]
-                primeiro_gol = row['First_Gol']  # Valor como string (ex: "62%")
-                partidas = row['Matches']  # Para mostrar quantas partidas o time jogou
-    
-                # Exibe o primeiro gol, removendo o símbolo de "%" caso necessário
-                try:
-                    st.metric("⚽ 1º Gol", primeiro_gol)
-                except Exception as e:
-                    st.metric("⚽ 1º Gol", "Erro")
-                    st.write(f"Erro ao processar 1º gol: {e}")
-            else:
-                st.metric("⚽ 1º Gol", "—")
-    
+            tem_ht = has_source(away, "ht")
+            st.metric("📉 PIA", round(away['ht_PIA'], 2) if tem_ht else 0)
+            st.metric("🛫 PPG HT", round(away['ht_PPG_HT_Away'], 2) if tem_ht else 0)
+            st.metric("📊 Média de Gols", round(away['ht_GF_AVG_Away'], 2) if tem_ht else 0)
+            st.metric("📉 Saldo de Gols", round(away['ht_GD_Away'], 2) if tem_ht else 0)
+            st.metric("🏆 Rank", int(away['ht_Rank_Away']) if tem_ht else "—")
+
+            # Primeiro gol (já convertido para número no perfil)
+            st.metric("⚽ 1º Gol", format_percent(away['fg_First_Gol']) if has_source(away, "fg") else "—")
+
             # Exibe o minuto médio para o time visitante
-            st.metric("⏱️ Tempo Médio 1º Gol", round(gm_away['AVG_min_scored'].values[0], 1) if not gm_away.empty else "—")
+            st.metric("⏱️ Tempo Médio 1º Gol", round(away['gm_AVG_min_scored'], 1) if has_source(away, "gm") else "—")
 
 
 
 # ABA 10 - Síntese Detalhada
-    with tabs[10]:
+    with tabs[10], profiler.section("aba Sintese"):
     
-        # Verificar se temos dados suficientes
-        # Função para converter "60%", "42,7%" etc. em float
-        def converter_percentual(valor):
-            try:
-                return float(str(valor).replace('%', '').replace(',', '.'))
-            except:
-                return None
-        
         # Verificar se temos dados suficientes
         if not home_filtered.empty and not away_filtered.empty:
             home_row = home_filtered.iloc[0]
             away_row = away_filtered.iloc[0]
         
             # Coletar dados adicionais
-            home_fg_data = home_fg_df[home_fg_df['Team_Home'] == equipe_home].iloc[0] if not home_fg_df.empty and equipe_home in home_fg_df['Team_Home'].values else None
-            away_fg_data = away_fg_df[away_fg_df['Team_Away'] == equipe_away].iloc[0] if not away_fg_df.empty and equipe_away in away_fg_df['Team_Away'].values else None
+            home_fg_rows = lookup("home_fg_df", equipe_home)
+            away_fg_rows = lookup("away_fg_df", equipe_away)
+            home_fg_data = home_fg_rows.iloc[0] if not home_fg_rows.empty else None
+            away_fg_data = away_fg_rows.iloc[0] if not away_fg_rows.empty else None
         
             # Dados de ranking
             try:
@@ -709,11 +566,8 @@ with tabs[0]:
                 rank_home = 999
                 rank_away = 999
                 rank_diff = 0
-            # Carregar dados
-            equipes_casa, equipes_fora, equipes_fora_fav, overall_stats = load_all_data()
-            
             # Rodada atual a partir da coluna GP
-            rodada_atual = overall_stats['GP'].max()
+            rodada_atual = overall_df['GP'].max()
         
             # Variáveis principais
             ppg_home = home_row.get("PPG_Home", 0)
@@ -755,7 +609,7 @@ with tabs[0]:
             """
         
             if home_fg_data is not None:
-                analise_home += f"O time marca o primeiro gol em **{home_fg_data['First_Gol']}** das partidas e "
+                analise_home += f"O time marca o primeiro gol em **{format_percent(home_fg_data['First_Gol'])}** das partidas e "
         
             analise_home += f"seu ranking como mandante é **{rank_home}**, indicando {vantagem_home} contra adversários de nível similar."
         
@@ -766,7 +620,7 @@ with tabs[0]:
             """
         
             if away_fg_data is not None:
-                analise_away += f"O time marca o primeiro gol em **{away_fg_data['First_Gol']}** das partidas e "
+                analise_away += f"O time marca o primeiro gol em **{format_percent(away_fg_data['First_Gol'])}** das partidas e "
         
             analise_away += f"seu ranking como visitante é **{rank_away}**, com {desempenho_fora}."
         
@@ -816,10 +670,10 @@ with tabs[0]:
         
                 # Sugestão adicional: Lay ao Visitante (HT)
                 if home_fg_data is not None and away_fg_data is not None:
-                    home_first_goal_percentage = converter_percentual(home_fg_data.get('First_Gol', 0))
-                    away_first_goal_percentage = converter_percentual(away_fg_data.get('First_Gol', 0))
+                    home_first_goal_percentage = home_fg_data.get('First_Gol')
+                    away_first_goal_percentage = away_fg_data.get('First_Gol')
         
-                    if home_first_goal_percentage is not None and away_first_goal_percentage is not None:
+                    if pd.notna(home_first_goal_percentage) and pd.notna(away_first_goal_percentage):
                         if home_first_goal_percentage >= 60 and away_first_goal_percentage <= 30:
                             st.info("**✅ Aposta sugerida:** Lay ao Visitante (HT)")
                             st.markdown("""
@@ -886,22 +740,13 @@ with tabs[0]:
             col1, col2 = st.columns(2)    
             
             with col1:
-                # Função para converter string percentual em número decimal
-                def converter_percentual(valor):
-                    try:
-                        if isinstance(valor, str) and '%' in valor:
-                            return float(valor.replace('%', '').strip()) / 100
-                        return float(valor) / 100 if float(valor) > 1 else float(valor)
-                    except Exception:
-                        return np.nan
-            
                 # Filtrar os dados das equipes
-                filtered = goals_half_df[goals_half_df['Team'].isin([equipe_home, equipe_away])]
+                filtered = lookup_many("goals_half_df", [equipe_home, equipe_away])
             
                 if not filtered.empty:
-                    # Aplicar a conversão e obter os valores de frequência
-                    freq_ht_home = filtered.loc[filtered['Team'] == equipe_home, '1st half'].map(converter_percentual).values
-                    freq_ht_away = filtered.loc[filtered['Team'] == equipe_away, '1st half'].map(converter_percentual).values
+                    # Frequências do 1º tempo (porcentagem numérica -> fração)
+                    freq_ht_home = filtered.loc[filtered['Team'] == equipe_home, '1st half'].to_numpy(dtype=float) / 100
+                    freq_ht_away = filtered.loc[filtered['Team'] == equipe_away, '1st half'].to_numpy(dtype=float) / 100
             
                     # Verificar se os valores foram corretamente extraídos
                     if freq_ht_home.size > 0 and freq_ht_away.size > 0 and not np.isnan(freq_ht_home[0]) and not np.isnan(freq_ht_away[0]):
@@ -990,18 +835,25 @@ with tabs[0]:
             with col2:
                 st.markdown("### 📊 5 Placares Mais Prováveis")
                 
-                # Cálculo da expectativa de gols com base no PPG e na média total de gols
-                if (ppg_home + ppg_away) > 0:
-                    exp_gols_home = (ppg_home / (ppg_home + ppg_away)) * total_avg_goals
+                # Confronto da mesma liga com bundle aberto: expectativa e matriz já calculadas
+                max_gols = 5
+                pairing = bundle_pairing(equipe_home, equipe_away)
+                if pairing is not None:
+                    exp_gols_home, exp_gols_away, matriz = pairing
                 else:
-                    exp_gols_home = 0
-                exp_gols_away = total_avg_goals - exp_gols_home
-                
+                    # Expectativa de gols do modelo de força (ataque/defesa) da liga; sem um dos
+                    # times no modelo, a média total de gols dividida pelo PPG
+                    lambdas = strength_lambdas(equipe_home, equipe_away)
+                    if lambdas is None:
+                        lambdas = expected_goals(ppg_home, ppg_away, gf_avg_home, gf_avg_away)
+                    exp_gols_home, exp_gols_away = lambdas
+                    # Matriz de placares (Poisson) usada por todos os cálculos abaixo
+                    matriz = score_matrix(exp_gols_home, exp_gols_away, max_gols)
+                st.caption(f"Expectativa de gols: {exp_gols_home:.2f} x {exp_gols_away:.2f}")
+
                 # Probabilidade do placar 0x1 quando a casa é favorita
                 if ppg_home > ppg_away:
-                    prob_0_home = poisson.pmf(0, exp_gols_home)
-                    prob_1_away = poisson.pmf(1, exp_gols_away)
-                    prob_placar_0x1 = prob_0_home * prob_1_away
+                    prob_placar_0x1 = correct_score(matriz, 0, 1)
                     st.write(f"🎯 Probabilidade do placar 0x1 (casa favorita): {prob_placar_0x1:.2%}")
                 else:
                     st.write("⚠️ O time da casa não é favorito neste confronto.")
@@ -1014,19 +866,8 @@ with tabs[0]:
                     st.write("💰 Lay Goleada Visitante — Odd Máxima 50")
 
                 
-                # Gerar probabilidades de placares usando distribuição de Poisson
-                max_gols = 5
-                placares = []
-                
-                for gols_home in range(max_gols + 1):
-                    for gols_away in range(max_gols + 1):
-                        prob_home = poisson.pmf(gols_home, exp_gols_home)
-                        prob_away = poisson.pmf(gols_away, exp_gols_away)
-                        prob_placar = prob_home * prob_away
-                        placares.append(((gols_home, gols_away), prob_placar))
-                
-                # Ordenar pelos placares com maior probabilidade
-                placares.sort(key=lambda x: x[1], reverse=True)
+                # Placares ordenados pela probabilidade
+                placares = top_scorelines(matriz, 5)
                 
                 # Exibir os 5 placares mais prováveis
                 for i, ((gh, ga), prob) in enumerate(placares[:5], start=1):
@@ -1034,6 +875,8 @@ with tabs[0]:
             
                 
 
+profiler.report()
+
 # Executar com variável de ambiente PORT
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 10000))
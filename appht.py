@@ -8,111 +8,38 @@ import itertools
 import math
 from scipy.stats import poisson
 
+from jogosdodia.bundle import open_bundle
+from jogosdodia.data import load_datasets, load_errors, lookup, lookup_many, refresh_if_stale
+from jogosdodia.profile import fixture_league, format_percent, has_source, team_profile
+from jogosdodia.teams import SIDEBAR_KEYS, get_team_universe
+from jogosdodia.widgets import frequency_bar
+
 # Configuração da página
 st.set_page_config(page_title="Football Stats HT", layout="wide")
 
-# ----------------------------
-# FUNÇÃO UTILITÁRIA PARA CARREGAR CSV
-# ----------------------------
-@st.cache_data
-def load_csv(url):
-    df = pd.read_csv(url, encoding="utf-8-sig")
-    df = df.dropna(axis=1, how='all')  # Remove colunas totalmente vazias
-    df.columns = df.columns.str.strip()  # Limpa os nomes das colunas
-    return df
-
-# ----------------------------
-# FUNÇÕES DE CARREGAMENTO DE DADOS
-# ----------------------------
-
-@st.cache_data
-def load_first_goal_data():
-    urls = [
-        "https://raw.githubusercontent.com/scooby75/firstgoal/main/scored_first_home.csv",
-        "https://raw.githubusercontent.com/scooby75/firstgoal/main/scored_first_away.csv"
-    ]
-    return [load_csv(url) for url in urls]
-
-@st.cache_data
-def load_goal_minute_data():
-    urls = [
-        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/momento_do_gol_home.csv",
-        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/momento_do_gol_away.csv"
-    ]
-    return [load_csv(url) for url in urls]
-
-@st.cache_data
-def load_goals_half_data():
-    return load_csv("https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/Goals_Half.csv")
-
-@st.cache_data
-def goals_ht_data():
-    urls = [
-        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/CV_Goals_HT_Home.csv",
-        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/CV_Goals_HT_Away.csv"
-    ]
-    return [load_csv(url) for url in urls]
-
-@st.cache_data
-def goals_per_time_data():
-    urls = [
-        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/Goals_Per_Time_Home.csv",
-        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/Goals_Per_Time_Away.csv"
-    ]
-    return [load_csv(url) for url in urls]
-
-@st.cache_data
-def ppg_ht_data():
-    urls = [
-        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/PPG_HT_Home.csv",
-        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/PPG_HT_Away.csv"
-    ]
-    return [load_csv(url) for url in urls]
-
-# ----------------------------
-# NORMALIZAÇÃO DE COLUNAS
-# ----------------------------
-def normalize_columns(df):
-    df.columns = df.columns.str.strip()
-    return df
-
 # ----------------------------
 # CARREGAMENTO DOS DADOS
 # ----------------------------
-
-home_fg_df, away_fg_df = load_first_goal_data()
-goal_minute_home_df, goal_minute_away_df = load_goal_minute_data()
-goals_half_df = load_goals_half_data()
-cv_home_df, cv_away_df = goals_ht_data()
-goals_per_time_home_df, goals_per_time_away_df = goals_per_time_data()
-ppg_ht_home_df, ppg_ht_away_df = ppg_ht_data()
-
-# Normalizar todas as tabelas
-all_dfs = [
-    home_fg_df, away_fg_df, goal_minute_home_df, goal_minute_away_df, goals_half_df, cv_home_df, cv_away_df,
-    goals_per_time_home_df, goals_per_time_away_df, ppg_ht_home_df, ppg_ht_away_df
-]
-for df in all_dfs:
-    normalize_columns(df)
+# Com JOGOSDODIA_BUNDLE as tabelas vêm prontas do bundle (python -m jogosdodia.build)
+if open_bundle() is None:
+    # Sem bundle, as tabelas em memória são revalidadas na origem a cada REFRESH_INTERVAL, em segundo plano
+    refresh_if_stale()
+# Só as tabelas que este app usa: a lista de times e as de CV HT (os perfis carregam as suas)
+HT_KEYS = SIDEBAR_KEYS["ht"] + ["cv_home_df", "cv_away_df"]
+load_datasets(HT_KEYS)
+errors = load_errors()
+for key in HT_KEYS:
+    if key in errors:
+        st.error(errors[key])
 
 # ----------------------------
 # Lista de times para seleção
 # ----------------------------
-all_teams = sorted(set(
-    home_fg_df['Team_Home'].dropna().astype(str)[home_fg_df['Team_Home'].str.contains(r'^[A-Za-z\s]+$', na=False)].tolist() +
-    away_fg_df['Team_Away'].dropna().astype(str)[away_fg_df['Team_Away'].str.contains(r'^[A-Za-z\s]+$', na=False)].tolist() +
-    goal_minute_home_df['Team_Home'].dropna().astype(str)[goal_minute_home_df['Team_Home'].str.contains(r'^[A-Za-z\s]+$', na=False)].tolist() +
-    goal_minute_away_df['Team_Away'].dropna().astype(str)[goal_minute_away_df['Team_Away'].str.contains(r'^[A-Za-z\s]+$', na=False)].tolist() +
-    goals_half_df['Team'].dropna().astype(str)[goals_half_df['Team'].str.contains(r'^[A-Za-z\s]+$', na=False)].tolist() +
-    goals_per_time_home_df['Team_Home'].dropna().astype(str)[goals_per_time_home_df['Team_Home'].str.contains(r'^[A-Za-z\s]+$', na=False)].tolist() +
-    goals_per_time_away_df['Team_Away'].dropna().astype(str)[goals_per_time_away_df['Team_Away'].str.contains(r'^[A-Za-z\s]+$', na=False)].tolist() +
-    ppg_ht_home_df['Team_Home'].dropna().astype(str)[ppg_ht_home_df['Team_Home'].str.contains(r'^[A-Za-z\s]+$', na=False)].tolist() +
-    ppg_ht_away_df['Team_Away'].dropna().astype(str)[ppg_ht_away_df['Team_Away'].str.contains(r'^[A-Za-z\s]+$', na=False)].tolist()
-))
+teams = get_team_universe(SIDEBAR_KEYS["ht"])
 
 # Seleção dos times para a interface
-equipe_home = st.sidebar.selectbox("🏠 Time da Casa:", all_teams, index=all_teams.index('Bayern Munich') if 'Bayern Munich' in all_teams else 0)
-equipe_away = st.sidebar.selectbox("🛫 Time Visitante:", all_teams, index=all_teams.index('Dortmund') if 'Dortmund' in all_teams else 0)
+equipe_home = st.sidebar.selectbox("🏠 Time da Casa:", teams.teams, index=teams.index('Bayern Munich'))
+equipe_away = st.sidebar.selectbox("🛫 Time Visitante:", teams.teams, index=teams.index('Dortmund'))
 
 # ----------------------------
 # INTERFACE STREAMLIT
@@ -123,15 +50,11 @@ tabs = st.tabs([
 
 #ABA 0 - Analitico
 with tabs[0]:
-    # Coleta de dados
-    home_data = ppg_ht_home_df[ppg_ht_home_df['Team_Home'] == equipe_home]
-    away_data = ppg_ht_away_df[ppg_ht_away_df['Team_Away'] == equipe_away]
-    cv_home_data = cv_home_df[cv_home_df['Team_Home'] == equipe_home]
-    cv_away_data = cv_away_df[cv_away_df['Team_Away'] == equipe_away]
-    fg_home = home_fg_df[home_fg_df['Team_Home'] == equipe_home]
-    fg_away = away_fg_df[away_fg_df['Team_Away'] == equipe_away]
-    gm_home = goal_minute_home_df[goal_minute_home_df['Team_Home'] == equipe_home]
-    gm_away = goal_minute_away_df[goal_minute_away_df['Team_Away'] == equipe_away]
+    # Coleta de dados (perfil por time: PPG HT, CV, 1º gol e minuto médio)
+    # Os dois times na liga do confronto (times em mais de uma liga)
+    league = fixture_league(equipe_home, equipe_away)
+    home = team_profile(equipe_home, "home", league)
+    away = team_profile(equipe_away, "away", league)
 
     col_home, col_away = st.columns(2)
 
@@ -139,65 +62,41 @@ with tabs[0]:
         st.markdown(f"### 🏠 {equipe_home}")
         
         # Exibe as métricas para o time da casa
-        #st.metric("📅 Jogos (GP)", int(home_data['GP'].values[0]) if not home_data.empty else 0)
-        st.metric("📈 PIH", round(home_data['PIH'].values[0], 2) if not home_data.empty else 0)
-        st.metric("🏠 PPG HT", round(home_data['PPG_HT_Home'].values[0], 2) if not home_data.empty else 0)
-        st.metric("📊 Média Gols", round(home_data['GF_AVG_Home'].values[0], 2) if not home_data.empty else 0)
-        st.metric("📈 Saldo de Gols", round(home_data['GD_Home'].values[0], 2) if not home_data.empty else 0)
-        st.metric("🏆 Rank", int(home_data['Rank_Home'].values[0]) if not home_data.empty else "—")
-
-        # Verifica e extrai o primeiro gol se disponível
-        if not fg_home.empty:
-            row = fg_home.iloc[0]
-            primeiro_gol = row['First_Gol']  # Valor como string (ex: "62%")
-            partidas = row['Matches']  # Para mostrar quantas partidas o time jogou
-
-            # Exibe o primeiro gol, removendo o símbolo de "%" caso necessário
-            try:
-                st.metric("⚽ 1º Gol", primeiro_gol)
-            except Exception as e:
-                st.metric("⚽ 1º Gol", "Erro")
-                st.write(f"Erro ao processar 1º gol: {e}")
-        else:
-            st.metric("⚽ 1º Gol", "—")
+        tem_ht = has_source(home, "ht")
+        st.metric("📈 PIH", round(home['ht_PIH'], 2) if tem_ht else 0)
+        st.metric("🏠 PPG HT", round(home['ht_PPG_HT_Home'], 2) if tem_ht else 0)
+        st.metric("📊 Média Gols", round(home['ht_GF_AVG_Home'], 2) if tem_ht else 0)
+        st.metric("📈 Saldo de Gols", round(home['ht_GD_Home'], 2) if tem_ht else 0)
+        st.metric("🏆 Rank", int(home['ht_Rank_Home']) if tem_ht else "—")
+
+        # Primeiro gol (já convertido para número no perfil)
+        st.metric("⚽ 1º Gol", format_percent(home['fg_First_Gol']) if has_source(home, "fg") else "—")
 
         # Exibe o minuto médio para o time da casa
-        st.metric("⏱️ Tempo Médio 1º Gol", round(gm_home['AVG_min_scored'].values[0], 1) if not gm_home.empty else "—")
+        st.metric("⏱️ Tempo Médio 1º Gol", round(home['gm_AVG_min_scored'], 1) if has_source(home, "gm") else "—")
 
     with col_away:
         st.markdown(f"### 🛫 {equipe_away}")
         
         # Exibe as métricas para o time visitante
-        #st.metric("📅 Jogos (GP)", int(away_data['GP'].values[0]) if not away_data.empty else 0)
-        st.metric("📉 PIA", round(away_data['PIA'].values[0], 2) if not away_data.empty else 0)
-        st.metric("🛫 PPG HT", round(away_data['PPG_HT_Away'].values[0], 2) if not away_data.empty else 0)
-        st.metric("📊 Média de Gols", round(away_data['GF_AVG_Away'].values[0], 2) if not away_data.empty else 0)
-        st.metric("📉 Saldo de Gols", round(away_data['GD_Away'].values[0], 2) if not away_data.empty else 0)
-        st.metric("🏆 Rank", int(away_data['Rank_Away'].values[0]) if not away_data.empty else "—")
-
-        # Verifica e extrai o primeiro gol se disponível
-        if not fg_away.empty:
-            row = fg_away.iloc[0]
-            primeiro_gol = row['First_Gol']  # Valor como string (ex: "62%")
-            partidas = row['Matches']  # Para mostrar quantas partidas o time jogou
-
-            # Exibe o primeiro gol, removendo o símbolo de "%" caso necessário
-            try:
-                st.metric("⚽ 1º Gol", primeiro_gol)
-            except Exception as e:
-                st.metric("⚽ 1º Gol", "Erro")
-                st.write(f"Erro ao processar 1º gol: {e}")
-        else:
-            st.metric("⚽ 1º Gol", "—")
+        tem_ht = has_source(away, "ht")
+        st.metric("📉 PIA", round(away['ht_PIA'], 2) if tem_ht else 0)
+        st.metric("🛫 PPG HT", round(away['ht_PPG_HT_Away'], 2) if tem_ht else 0)
+        st.metric("📊 Média de Gols", round(away['ht_GF_AVG_Away'], 2) if tem_ht else 0)
+        st.metric("📉 Saldo de Gols", round(away['ht_GD_Away'], 2) if tem_ht else 0)
+        st.metric("🏆 Rank", int(away['ht_Rank_Away']) if tem_ht else "—")
+
+        # Primeiro gol (já convertido para número no perfil)
+        st.metric("⚽ 1º Gol", format_percent(away['fg_First_Gol']) if has_source(away, "fg") else "—")
 
         # Exibe o minuto médio para o time visitante
-        st.metric("⏱️ Tempo Médio 1º Gol", round(gm_away['AVG_min_scored'].values[0], 1) if not gm_away.empty else "—")
+        st.metric("⏱️ Tempo Médio 1º Gol", round(away['gm_AVG_min_scored'], 1) if has_source(away, "gm") else "—")
 
 
 # ABA 1 - H2H (índice 1)
 with tabs[1]:
-    home_stats = ppg_ht_home_df[ppg_ht_home_df['Team_Home'] == equipe_home]
-    away_stats = ppg_ht_away_df[ppg_ht_away_df['Team_Away'] == equipe_away]
+    home_stats = lookup("ppg_ht_home_df", equipe_home)
+    away_stats = lookup("ppg_ht_away_df", equipe_away)
 
     if not home_stats.empty:
         
@@ -213,22 +112,25 @@ with tabs[1]:
 
 # ABA 2 - First Goal
 with tabs[2]:
-    def show_team_stats(team_name, df, col_name, local):
-        stats = df[df[col_name] == team_name]
+    def show_team_stats(team_name, key, local):
+        stats = lookup(key, team_name)
         if not stats.empty:
             st.markdown(f"### {team_name} ({local})")
             cols = ['Matches', 'First_Gol', 'Goals']
-            st.dataframe(stats[cols] if all(c in stats.columns for c in cols) else stats, use_container_width=True)
+            st.dataframe(
+                stats[cols] if all(c in stats.columns for c in cols) else stats, use_container_width=True,
+                column_config={"First_Gol": st.column_config.NumberColumn(format="%g%%")}
+            )
         else:
             st.warning(f"Nenhuma estatística encontrada para {team_name} ({local})")
 
-    show_team_stats(equipe_home, home_fg_df, 'Team_Home', 'Casa')
-    show_team_stats(equipe_away, away_fg_df, 'Team_Away', 'Fora')
+    show_team_stats(equipe_home, "home_fg_df", 'Casa')
+    show_team_stats(equipe_away, "away_fg_df", 'Fora')
 
 # ABA 3 - Goals Minute
 with tabs[3]:
-    home_team_data = goal_minute_home_df[goal_minute_home_df['Team_Home'] == equipe_home]
-    away_team_data = goal_minute_away_df[goal_minute_away_df['Team_Away'] == equipe_away]
+    home_team_data = lookup("goal_minute_home_df", equipe_home)
+    away_team_data = lookup("goal_minute_away_df", equipe_away)
 
     if not home_team_data.empty:
         st.success(f"🏠 **{equipe_home}** marca seu primeiro gol em média aos **{home_team_data['AVG_min_scored'].values[0]:.1f} min**.")
@@ -242,9 +144,12 @@ with tabs[3]:
 
 # ABA 4 - Goals Half
 with tabs[4]:
-    filtered = goals_half_df[goals_half_df['Team'].isin([equipe_home, equipe_away])]
+    filtered = lookup_many("goals_half_df", [equipe_home, equipe_away])
     if not filtered.empty:
-        st.dataframe(filtered[['League_Name', 'Team', 'Scored', '1st half', '2nd half']], use_container_width=True)
+        st.dataframe(
+            filtered[['League_Name', 'Team', 'Scored', '1st half', '2nd half']], use_container_width=True,
+            column_config={half: st.column_config.NumberColumn(format="%g%%") for half in ['1st half', '2nd half']}
+        )
     else:
         st.warning("Nenhuma estatística de Goals Half encontrada.")
 
@@ -252,24 +157,10 @@ with tabs[4]:
 
 with tabs[5]:
     def gerar_barra_frequencia(frequencia_dict):
-        cores = {
-            "0": "#d9534f",  # vermelho
-            "1": "#20de6e",  # verde
-            "2": "#16ed48",  # azul
-            "3": "#24da1e",  # laranja
-            "4": "#56b72d"   # roxo
-        }
-
-        html = '<div style="display:flex; flex-wrap: wrap;">'
-        for gols, freq in frequencia_dict.items():
-            blocos = int(freq)  # 1 bloco por %
-            for _ in range(blocos):
-                html += f'<div style="width: 6px; height: 20px; background-color: {cores[gols]}; margin: 1px;"></div>'
-        html += '</div>'
-        return html
+        return frequency_bar(frequencia_dict)
 
     # Time da casa
-    home_ht = cv_home_df[cv_home_df['Team_Home'] == equipe_home]
+    home_ht = lookup("cv_home_df", equipe_home)
     if not home_ht.empty:
         df_home = home_ht.rename(columns={
             "Avg.": "Avg",
@@ -302,7 +193,7 @@ with tabs[5]:
         st.warning("Dados não encontrados para o time da casa.")
 
     # Time visitante
-    away_ht = cv_away_df[cv_away_df['Team_Away'] == equipe_away]
+    away_ht = lookup("cv_away_df", equipe_away)
     if not away_ht.empty:
         df_away = away_ht.rename(columns={
             "Avg..1": "Avg",
@@ -333,15 +224,9 @@ with tabs[5]:
 # ABA 6 - Goals Per Time
 
 with tabs[6]:
-    goals_per_time_home_df, goals_per_time_away_df = goals_per_time_data()
-    
-    # Limpeza dos nomes de times
-    goals_per_time_home_df['Team_Home'] = goals_per_time_home_df['Team_Home'].astype(str).str.strip()
-    goals_per_time_away_df['Team_Away'] = goals_per_time_away_df['Team_Away'].astype(str).str.strip()
-    
     # Filtrando os dados para os times selecionados
-    filtered_home = goals_per_time_home_df[goals_per_time_home_df['Team_Home'] == equipe_home]
-    filtered_away = goals_per_time_away_df[goals_per_time_away_df['Team_Away'] == equipe_away]
+    filtered_home = lookup("goals_per_time_home_df", equipe_home)
+    filtered_away = lookup("goals_per_time_away_df", equipe_away)
     
     # Verificando se ambos os dataframes têm dados
     if not filtered_home.empty and not filtered_away.empty:
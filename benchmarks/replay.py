@@ -0,0 +1,155 @@
+"""Replay de jogos ao vivo sintéticos contra ``live.live_probabilities``.
+
+Sorteia confrontos entre times com intensidades por faixa, simula os gols
+minuto a minuto com o próprio modelo (Poisson com a intensidade de cada
+faixa) e reproduz os jogos como um feed ao vivo: a cada minuto, todos os
+jogos em andamento são consultados com o placar daquele momento.
+
+Verifica, em cada consulta:
+
+- casa + empate + fora = 1 e as linhas de over decrescentes;
+- no minuto 90 o resultado e os overs batem com o placar final (0 ou 1);
+- probabilidades de gol restante zeradas no fim.
+
+E mede a latência de cada consulta e o Brier score do 1X2 nos minutos 0,
+45 e 75 (deve cair conforme o jogo avança). Sai com código 1 se alguma
+verificação falhar::
+
+    python benchmarks/replay.py --matches 50 --seed 7
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cache isolado: os snapshots do usuário não entram no replay
+os.environ.setdefault("JOGOSDODIA_CACHE_DIR", tempfile.mkdtemp(prefix="jogosdodia-replay-"))
+sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+
+from jogosdodia.data import set_base_url  # noqa: E402
+from jogosdodia.inplay import FULL_TIME  # noqa: E402
+from jogosdodia.live import LIVE_LINES, get_live_rates, live_match, live_probabilities  # noqa: E402
+
+CHECKPOINTS = (0, 45, 75)
+TOLERANCE = 1e-6
+
+
+# ----------------------------
+# JOGOS SINTÉTICOS
+# ----------------------------
+def synthetic_matches(count, seed):
+    """Confrontos sorteados e os gols de cada um: ``[(casa, fora, [(minuto, lado), ...]), ...]``"""
+    rng = np.random.default_rng(seed)
+    home_teams = get_live_rates("home").index.to_numpy()
+    away_teams = get_live_rates("away").index.to_numpy()
+    matches = []
+    while len(matches) < count:
+        home, away = rng.choice(home_teams), rng.choice(away_teams)
+        if home == away:
+            continue
+        engine = live_match(home, away).engine
+        events = []
+        for minute in range(int(FULL_TIME)):
+            mu_home, mu_away = engine.expected_goals(minute, minute + 1)
+            events += [(minute + 1, "home")] * rng.poisson(mu_home)
+            events += [(minute + 1, "away")] * rng.poisson(mu_away)
+        matches.append((home, away, events))
+    return matches
+
+
+# ----------------------------
+# REPLAY
+# ----------------------------
+def _check(probabilities, minute, home_goals, away_goals):
+    """Lista de problemas de uma consulta (vazia se está tudo certo)"""
+    problems = []
+    if abs(probabilities.home + probabilities.draw + probabilities.away - 1) > TOLERANCE:
+        problems.append("1X2 não soma 1")
+    overs = [probabilities.over_05, probabilities.over_15, probabilities.over_25, probabilities.over_35]
+    if any(later > earlier + TOLERANCE for earlier, later in zip(overs, overs[1:])):
+        problems.append("overs não decrescentes")
+    if minute >= FULL_TIME:
+        result = np.sign(home_goals - away_goals)
+        expected = (float(result > 0), float(result == 0), float(result < 0))
+        if any(abs(p - e) > TOLERANCE for p, e in zip(probabilities[:3], expected)):
+            problems.append("1X2 final diferente do placar")
+        if any(abs(p - float(home_goals + away_goals > line)) > TOLERANCE for p, line in zip(overs, LIVE_LINES)):
+            problems.append("over final diferente do placar")
+        if probabilities.home_goal or probabilities.away_goal:
+            problems.append("gol restante no minuto 90")
+    return problems
+
+
+def replay(matches):
+    """Reproduz ``matches`` minuto a minuto; retorna latências, Brier por minuto e problemas"""
+    latencies = []
+    forecasts = {minute: [] for minute in CHECKPOINTS}
+    problems = []
+    scores = [[0, 0] for _ in matches]
+    for minute in range(int(FULL_TIME) + 1):
+        for index, (home, away, events) in enumerate(matches):
+            for event_minute, side in events:
+                if event_minute == minute:
+                    scores[index][0 if side == "home" else 1] += 1
+            home_goals, away_goals = scores[index]
+            start = time.perf_counter()
+            probabilities = live_probabilities(home, away, minute, home_goals, away_goals)
+            latencies.append(time.perf_counter() - start)
+            problems += [f"{home} x {away} {minute}': {p}" for p in _check(probabilities, minute, home_goals, away_goals)]
+            if minute in forecasts:
+                forecasts[minute].append(probabilities[:3])
+
+    brier = {}
+    for minute, predictions in forecasts.items():
+        outcomes = [np.sign(h - a) for h, a in scores]
+        actual = np.array([[r > 0, r == 0, r < 0] for r in outcomes], dtype=float)
+        brier[minute] = float(np.mean(np.sum((np.array(predictions) - actual) ** 2, axis=1)))
+    return latencies, brier, problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--matches", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="JSON com latências e Brier score")
+    args = parser.parse_args(argv)
+
+    set_base_url(ROOT)
+    matches = synthetic_matches(args.matches, args.seed)
+    latencies, brier, problems = replay(matches)
+    if any(later > earlier for earlier, later in zip(brier.values(), list(brier.values())[1:])):
+        problems.append("Brier não cai ao longo do jogo")
+
+    latencies_us = sorted(latency * 1e6 for latency in latencies)
+    summary = {
+        "matches": len(matches),
+        "calls": len(latencies),
+        "latency_us": {
+            "median": statistics.median(latencies_us),
+            "p99": latencies_us[int(len(latencies_us) * 0.99) - 1],
+            "max": latencies_us[-1]
+        },
+        "brier": brier,
+        "problems": problems
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=1)
+
+    print(f"{summary['calls']} consultas em {summary['matches']} jogos: "
+          f"mediana {summary['latency_us']['median']:.1f} µs, p99 {summary['latency_us']['p99']:.1f} µs")
+    print("Brier 1X2: " + ", ".join(f"{minute}' {value:.3f}" for minute, value in brier.items()))
+    for problem in problems[:20]:
+        print(f"FALHA {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+"""Benchmarks dos caminhos quentes do jogosdodia, sem Streamlit e sem rede.
+
+Serve os CSVs do próprio repositório por um servidor HTTP local (ou direto
+do disco com ``--files``) e mede:
+
+- ``load_all_data`` a frio (sem snapshots) e a quente (snapshots em disco);
+- a lista de times da barra lateral (``teams.build_team_universe``) e a
+  mesma lista já em cache (``get_team_universe``, o custo de cada rerun);
+- a consulta de um time em todas as tabelas (``lookup``);
+- os 5 placares mais prováveis (``score_matrix`` + ``top_scorelines``);
+- os filtros de estratégia do FootyStats num slate sintético de 5 mil jogos;
+- a geração do bundle pré-calculado (``build.build_bundle``, tabelas já em
+  memória) e a sua abertura num processo (``Bundle.install``);
+- o pico de memória (tracemalloc) da carga e o tamanho do dicionário ``data``
+  (total e por tabela, antes/depois da compactação de tipos).
+
+O resultado vai para um JSON (``--output``); com ``--baseline`` cada medida
+é comparada com a de uma execução anterior::
+
+    python benchmarks/run.py --output benchmarks/atual.json --baseline benchmarks/baseline.json
+"""
+import argparse
+import functools
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cache isolado: os snapshots e aliases do usuário não entram na medida
+os.environ.setdefault("JOGOSDODIA_CACHE_DIR", tempfile.mkdtemp(prefix="jogosdodia-bench-"))
+sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from jogosdodia import data as data_module  # noqa: E402
+from jogosdodia.blend import blend_goal_lines, calibration_inputs, fit_calibration  # noqa: E402
+from jogosdodia.build import build_bundle  # noqa: E402
+from jogosdodia.bundle import Bundle, bundle_path  # noqa: E402
+from jogosdodia.data import (  # noqa: E402
+    DATASETS, clear_cache, get_snapshot_store, load_all_data, lookup, memory_report, set_base_url
+)
+from jogosdodia.firstgoal import first_goal_slate, get_first_goal_curves  # noqa: E402
+from jogosdodia.scoreline import score_matrix, top_scorelines  # noqa: E402
+from jogosdodia.strategies import apply_strategies  # noqa: E402
+from jogosdodia.teams import SIDEBAR_KEYS, build_team_universe, get_team_universe  # noqa: E402
+
+SLATE_SIZE = 5000
+LOOKUP_TEAM = "Arsenal"
+
+
+# ----------------------------
+# SERVIDOR LOCAL
+# ----------------------------
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_directory(directory):
+    """Servidor HTTP em thread servindo ``directory``; retorna ``(servidor, url)``"""
+    handler = functools.partial(_QuietHandler, directory=directory)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+# ----------------------------
+# MEDIÇÃO
+# ----------------------------
+def measure(func, repeat, setup=None):
+    """Executa ``func`` ``repeat`` vezes; retorna min/mediana/max em segundos"""
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return {"min": min(times), "median": statistics.median(times), "max": max(times), "repeat": repeat}
+
+
+def synthetic_slate(size=SLATE_SIZE, seed=42):
+    """Jogos do dia sintéticos com as colunas usadas pelos filtros de estratégia"""
+    rng = np.random.default_rng(seed)
+    leagues = np.array(["ENGLAND 1", "SPAIN 1", "GERMANY 2", "NORWAY 1", "BRAZIL 1", "ITALY 2"])
+    odd_home = rng.uniform(1.2, 6.0, size).round(2)
+    return pd.DataFrame({
+        "Date": "2025-01-01",
+        "Time": "16:00",
+        "League": rng.choice(leagues, size),
+        "Home": [f"Home {i}" for i in range(size)],
+        "Away": [f"Away {i}" for i in range(size)],
+        "Rodada": rng.integers(1, 38, size),
+        "PPG_Home": rng.uniform(0, 3, size).round(2),
+        "PPG_Away": rng.uniform(0, 3, size).round(2),
+        "XG_Home_Pre": rng.uniform(0.3, 3, size).round(2),
+        "Odd_H_FT": odd_home,
+        "Odd_D_FT": rng.uniform(2.8, 6.0, size).round(2),
+        "Odd_A_FT": rng.uniform(1.2, 15.0, size).round(2),
+        "Odd_DC_1X": (odd_home / 2 + 0.5).round(2),
+        "Odd_A_HT": rng.uniform(1.5, 15.0, size).round(2),
+    })
+
+
+def frames_memory(frames):
+    return int(sum(df.memory_usage(deep=True).sum() for df in frames.values()))
+
+
+def run(repeat):
+    store = get_snapshot_store()
+    results = {}
+
+    def cold():
+        clear_cache()
+        store.clear()
+
+    results["load_all_data_cold"] = measure(load_all_data, repeat, setup=cold)
+    results["load_all_data_warm"] = measure(load_all_data, repeat, setup=clear_cache)
+
+    clear_cache()
+    tracemalloc.start()
+    data = load_all_data()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    results["memory"] = {
+        "load_peak_bytes": peak,
+        "data_bytes": frames_memory(data),
+        # Antes/depois de schema.compact, por tabela
+        "datasets": memory_report()
+    }
+
+    results["get_all_teams"] = measure(lambda: build_team_universe(SIDEBAR_KEYS["ft"]), repeat * 5)
+    results["get_all_teams_cached"] = measure(lambda: get_team_universe(SIDEBAR_KEYS["ft"]), repeat * 20)
+    results["lookup_all_tables"] = measure(
+        lambda: [lookup(key, LOOKUP_TEAM) for key in DATASETS], repeat * 20
+    )
+    results["top5_scorelines"] = measure(
+        lambda: top_scorelines(score_matrix(1.6, 1.1), 5), repeat * 200
+    )
+    slate = synthetic_slate()
+    results["strategy_filters_5k"] = measure(lambda: apply_strategies(slate), repeat * 20)
+
+    # Primeiro gol para 5k confrontos reais sorteados (curvas já em cache)
+    rng = np.random.default_rng(42)
+    home_teams = rng.choice(list(get_first_goal_curves("home").teams), SLATE_SIZE)
+    away_teams = rng.choice(list(get_first_goal_curves("away").teams), SLATE_SIZE)
+    results["first_goal_slate_5k"] = measure(lambda: first_goal_slate(home_teams, away_teams), repeat * 5)
+
+    # Calibração por liga (etapa do bundle) e linhas de gols combinadas para os mesmos confrontos
+    lambda_home = rng.uniform(0.5, 2.5, SLATE_SIZE)
+    lambda_away = rng.uniform(0.3, 2.0, SLATE_SIZE)
+    results["fit_calibration"] = measure(lambda: fit_calibration(calibration_inputs()), repeat)
+    results["blend_goal_lines_5k"] = measure(
+        lambda: blend_goal_lines(home_teams, away_teams, lambda_home, lambda_away), repeat * 5
+    )
+
+    bundle_dir = tempfile.mkdtemp(prefix="jogosdodia-bundle-")
+    results["build_bundle"] = measure(lambda: build_bundle(bundle_dir), repeat)
+    results["open_bundle"] = measure(lambda: Bundle(bundle_path(bundle_dir)).install(), repeat)
+    return results
+
+
+def compare(current, baseline):
+    """Linhas ``medida: atual vs baseline (variação)`` para as medidas de tempo"""
+    lines = []
+    for name, values in current.items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous or "median" not in values:
+            continue
+        change = values["median"] / previous["median"] - 1 if previous["median"] else float("nan")
+        lines.append(
+            f"{name:<22} {values['median'] * 1000:10.3f} ms  vs {previous['median'] * 1000:10.3f} ms  ({change:+.1%})"
+        )
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", default=os.path.join(ROOT, "benchmarks", "resultado.json"))
+    parser.add_argument("--baseline", help="JSON de uma execução anterior para comparação")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--files", action="store_true", help="lê os CSVs do disco em vez do servidor HTTP local")
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.files:
+        set_base_url(ROOT)
+    else:
+        server, url = serve_directory(ROOT)
+        set_base_url(url)
+
+    try:
+        results = run(args.repeat)
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    report = {
+        "created": time.time(),
+        "source": "files" if args.files else "http",
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "max_workers": data_module.MAX_WORKERS,
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=1)
+
+    for name, values in results.items():
+        if "median" in values:
+            print(f"{name:<22} {values['median'] * 1000:10.3f} ms (min {values['min'] * 1000:.3f} ms)")
+    print(f"{'memory':<22} pico {results['memory']['load_peak_bytes'] / 2**20:.1f} MiB, "
+          f"data {results['memory']['data_bytes'] / 2**20:.1f} MiB")
+
+    if args.baseline and os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print("\nComparação com", args.baseline)
+        for line in compare(results, baseline):
+            print(line)
+    print(f"\nResultado gravado em {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""Pacote compartilhado pelos apps Streamlit do jogosdodia."""
+from .blend import (
+    MARKETS,
+    BlendedProbability,
+    Calibration,
+    blend_goal_lines,
+    blend_match,
+    calibration_inputs,
+    fit_calibration,
+    get_calibration,
+    match_leagues,
+    model_probabilities,
+)
+from .bundle import Bundle, bundle_pairing, open_bundle
+from .data import (
+    DATA_URLS,
+    DATASETS,
+    Dataset,
+    LazyData,
+    cache_stats,
+    clear_cache,
+    data_version,
+    fetch_remote,
+    get_dataset,
+    get_snapshot_store,
+    load_all_data,
+    load_csv,
+    load_datasets,
+    load_errors,
+    load_timings,
+    lookup,
+    lookup_many,
+    memory_report,
+    parse_csv,
+    parse_failures,
+    preload_tables,
+    refresh_data,
+    refresh_if_stale,
+    set_base_url,
+    table_versions,
+)
+from .firstgoal import (
+    FirstGoal,
+    FirstGoalCurves,
+    build_first_goal_curves,
+    first_goal,
+    first_goal_slate,
+    get_first_goal_curves,
+)
+from .goallines import (
+    GOAL_LINES,
+    GoalLineStore,
+    GoalLines,
+    build_goal_line_store,
+    get_goal_line_store,
+    goal_lines,
+    team_goal_lines,
+)
+from .inplay import RESULTS, InPlayEngine, build_band_rates, get_band_rates, match_engine, transition_matrix
+from .leagues import (
+    build_league_aliases,
+    build_league_table,
+    build_league_zscores,
+    get_league_aliases,
+    get_league_table,
+    get_league_zscores,
+    league_context,
+    league_from_code,
+)
+from .live import LIVE_LINES, LiveMatch, LiveProbabilities, build_live_rates, get_live_rates, live_match, live_probabilities
+from .names import NameResolver, normalize_name, resolve_league_teams, resolve_leagues, resolve_teams
+from .profile import (
+    build_team_profiles,
+    fixture_league,
+    format_percent,
+    get_league_profiles,
+    get_team_profiles,
+    has_source,
+    primary_profiles,
+    source_keys,
+    team_profile,
+)
+from .schema import SCHEMAS, compact, ingest, percent_columns
+from .scoreline import (
+    AsianHandicap,
+    asian_handicap,
+    btts,
+    correct_score,
+    expected_goals,
+    fair_odds,
+    match_odds,
+    over_under,
+    poisson_pmf,
+    score_matrix,
+    top_scorelines,
+)
+from .slate import evaluate_slate
+from .snapshot import SnapshotStore
+from .strategies import STRATEGIES, Strategy, apply_strategies
+from .strength import StrengthFit, StrengthModel, fit_strengths, get_strength_model, strength_inputs, strength_lambdas
+from .teams import SIDEBAR_KEYS, TeamUniverse, build_team_universe, get_team_universe
+from .widgets import frequency_bar
+
+__all__ = [
+    "AsianHandicap",
+    "BlendedProbability",
+    "Bundle",
+    "Calibration",
+    "DATA_URLS",
+    "DATASETS",
+    "Dataset",
+    "FirstGoal",
+    "FirstGoalCurves",
+    "GOAL_LINES",
+    "GoalLineStore",
+    "GoalLines",
+    "InPlayEngine",
+    "LIVE_LINES",
+    "LazyData",
+    "LiveMatch",
+    "LiveProbabilities",
+    "MARKETS",
+    "NameResolver",
+    "RESULTS",
+    "SCHEMAS",
+    "SIDEBAR_KEYS",
+    "STRATEGIES",
+    "SnapshotStore",
+    "Strategy",
+    "StrengthFit",
+    "StrengthModel",
+    "TeamUniverse",
+    "apply_strategies",
+    "asian_handicap",
+    "blend_goal_lines",
+    "blend_match",
+    "btts",
+    "build_band_rates",
+    "build_first_goal_curves",
+    "build_goal_line_store",
+    "build_league_aliases",
+    "build_league_table",
+    "build_league_zscores",
+    "build_live_rates",
+    "build_team_profiles",
+    "build_team_universe",
+    "bundle_pairing",
+    "cache_stats",
+    "calibration_inputs",
+    "clear_cache",
+    "compact",
+    "correct_score",
+    "data_version",
+    "evaluate_slate",
+    "expected_goals",
+    "fair_odds",
+    "fetch_remote",
+    "first_goal",
+    "first_goal_slate",
+    "fit_calibration",
+    "fit_strengths",
+    "fixture_league",
+    "format_percent",
+    "frequency_bar",
+    "get_band_rates",
+    "get_calibration",
+    "get_dataset",
+    "get_first_goal_curves",
+    "get_goal_line_store",
+    "get_league_aliases",
+    "get_league_profiles",
+    "get_league_table",
+    "get_league_zscores",
+    "get_live_rates",
+    "get_snapshot_store",
+    "get_strength_model",
+    "get_team_profiles",
+    "get_team_universe",
+    "goal_lines",
+    "has_source",
+    "ingest",
+    "league_context",
+    "league_from_code",
+    "live_match",
+    "live_probabilities",
+    "load_all_data",
+    "load_csv",
+    "load_datasets",
+    "load_errors",
+    "load_timings",
+    "lookup",
+    "lookup_many",
+    "match_engine",
+    "match_leagues",
+    "match_odds",
+    "memory_report",
+    "model_probabilities",
+    "normalize_name",
+    "open_bundle",
+    "over_under",
+    "parse_csv",
+    "parse_failures",
+    "percent_columns",
+    "poisson_pmf",
+    "preload_tables",
+    "primary_profiles",
+    "refresh_data",
+    "refresh_if_stale",
+    "resolve_league_teams",
+    "resolve_leagues",
+    "resolve_teams",
+    "score_matrix",
+    "set_base_url",
+    "source_keys",
+    "strength_inputs",
+    "strength_lambdas",
+    "table_versions",
+    "team_goal_lines",
+    "team_profile",
+    "top_scorelines",
+    "transition_matrix",
+]
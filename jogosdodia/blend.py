@@ -0,0 +1,315 @@
+"""Probabilidades de linhas de gols combinando o modelo Poisson e as frequências dos times.
+
+Para cada mercado de ``MARKETS`` (Over 1.5/2.5/3.5 e ambos marcam):
+
+1. **Modelo**: a probabilidade da matriz de placares Poisson com os λ do
+   confronto (``scoreline``).
+2. **Calibração por liga**: o Poisson erra de forma sistemática em algumas
+   ligas (jogos mais "fechados" ou mais abertos do que as médias sugerem).
+   Para cada time dos arquivos ``Goals_Stats`` (casa e fora), o modelo com
+   as médias de gols marcados/sofridos do time naquele lado é comparado com
+   a frequência observada do mercado; uma regressão isotônica ponderada por
+   ``GP`` (pool adjacent violators) dá a curva modelo -> observado de cada
+   liga (nome canônico, ``leagues.get_league_aliases``), puxada para a curva
+   geral por ``G / (G + LEAGUE_PRIOR_GAMES)`` (``G`` = jogos da liga).
+   Fontes sem coluna de liga ficam fora do ajuste.
+3. **Frequência dos times**: a média das frequências do mandante em casa e
+   do visitante fora (``goallines``), com peso ``n / (n + PRIOR_GAMES)``, ``n``
+   o menor ``GP`` dos dois; o resto do peso fica com o modelo calibrado.
+
+As frequências de um time entram no passo 3; se também moldassem a curva
+do passo 2, o mesmo dado contaria duas vezes. Por isso o ajuste é cruzado:
+cada time cai num de ``CALIBRATION_FOLDS`` grupos (hash do nome) e há um
+conjunto de curvas para cada par de grupos, ajustado sem os times desses
+dois grupos; um jogo usa as curvas do par dos seus dois times. As curvas
+ficam numa matriz ``float32`` (pares x ligas x mercados x
+``CALIBRATION_POINTS``) e são aplicadas com interpolação linear vetorizada.
+
+A liga de cada jogo (curva e linha de frequência dos times, que podem estar
+em mais de uma liga) é a dada pelo chamador ou, sem ela, a liga do perfil
+do mandante (``profile.get_team_profiles``), senão a do visitante.
+
+As curvas são ajustadas fora dos apps, na geração do bundle
+(``python -m jogosdodia.build``); sem bundle, ``get_calibration`` ajusta na
+primeira consulta e guarda por ``data_version``.
+"""
+import threading
+import zlib
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from .data import DATASETS, data_version, get_dataset, load_datasets
+from .goallines import FIELDS, GOAL_LINE_SOURCES, get_goal_line_store, team_goal_lines
+from .profile import get_league_profiles, get_team_profiles, source_keys
+from .scoreline import btts, over_under, score_matrix
+
+# Mercado -> linha de gols (``None`` para ambos marcam)
+MARKETS = {"over_15": 1.5, "over_25": 2.5, "over_35": 3.5, "btts": None}
+
+# Pontos de cada curva de calibração, de 0 a 1
+CALIBRATION_POINTS = 21
+
+# Jogos que a frequência dos times precisa para pesar metade contra o modelo
+PRIOR_GAMES = 10.0
+
+# Jogos que a curva de uma liga precisa para pesar metade contra a curva geral
+LEAGUE_PRIOR_GAMES = 150.0
+
+# Grupos de times do ajuste cruzado (curvas para cada par de grupos)
+CALIBRATION_FOLDS = 4
+
+# Linha da curva geral na matriz (ligas sem curva própria e times sem liga)
+GLOBAL = "*"
+
+_FIELD_INDEX = {name: index for index, name in enumerate(FIELDS.values())}
+
+# Pares de grupos (i <= j): um conjunto de curvas, ajustado sem os dois, para cada par
+_FOLD_PAIRS = [(i, j) for i in range(CALIBRATION_FOLDS) for j in range(i, CALIBRATION_FOLDS)]
+
+
+def _pair_rows():
+    rows = np.zeros((CALIBRATION_FOLDS, CALIBRATION_FOLDS), dtype=int)
+    for row, (first, second) in enumerate(_FOLD_PAIRS):
+        rows[first, second] = rows[second, first] = row
+    return rows
+
+
+_PAIR_ROWS = _pair_rows()
+
+# Médias de gols (marcados, sofridos) de cada lado nos perfis
+_PROFILE_GOALS = {
+    "home": ("ft_GF_AVG_Home", "ft_GA_AVG_Home"),
+    "away": ("ft_GF_AVG_Away", "ft_GA_AVG_Away")
+}
+
+
+class Calibration(NamedTuple):
+    """Curvas ``curves[par de grupos, liga, mercado, ponto]`` e a linha de cada liga"""
+    leagues: dict
+    curves: np.ndarray
+
+    def apply(self, market, probabilities, league_rows, pair_rows):
+        """Probabilidades de ``market`` calibradas pela curva da liga e do par de grupos de cada posição"""
+        probabilities = np.asarray(probabilities, dtype=float)
+        position = np.clip(np.nan_to_num(probabilities), 0.0, 1.0) * (CALIBRATION_POINTS - 1)
+        lower = np.minimum(position.astype(int), CALIBRATION_POINTS - 2)
+        fraction = position - lower
+        curves = self.curves[np.asarray(pair_rows), np.asarray(league_rows), list(MARKETS).index(market)]
+        calibrated = (
+            np.take_along_axis(curves, lower[..., None], axis=-1)[..., 0] * (1 - fraction)
+            + np.take_along_axis(curves, lower[..., None] + 1, axis=-1)[..., 0] * fraction
+        )
+        return np.where(np.isnan(probabilities), np.nan, calibrated)
+
+    def league_rows(self, leagues):
+        """Linha da curva de cada liga de ``leagues`` (a geral para ligas sem curva)"""
+        return np.array([self.leagues.get(league, 0) for league in leagues], dtype=int)
+
+    @staticmethod
+    def pair_rows(home_teams, away_teams):
+        """Linha das curvas ajustadas sem os grupos do mandante e do visitante de cada jogo"""
+        return _PAIR_ROWS[team_folds(home_teams), team_folds(away_teams)]
+
+
+class BlendedProbability(NamedTuple):
+    """Componentes de um mercado (escalares de um jogo ou arrays de uma rodada)"""
+    model: float
+    calibrated: float
+    empirical: float
+    weight: float
+    probability: float
+
+
+# ----------------------------
+# MODELO
+# ----------------------------
+def model_probabilities(lambda_home, lambda_away) -> dict:
+    """Probabilidade Poisson de cada mercado para os λ dados (escalares ou arrays)"""
+    matrices = score_matrix(np.asarray(lambda_home, dtype=float), np.asarray(lambda_away, dtype=float))
+    return {
+        market: btts(matrices) if line is None else over_under(matrices, line)[0]
+        for market, line in MARKETS.items()
+    }
+
+
+# ----------------------------
+# CALIBRAÇÃO POR LIGA
+# ----------------------------
+def _isotonic(x, y, weights):
+    """Regressão isotônica crescente ponderada; retorna ``(x, y)`` dos blocos"""
+    order = np.argsort(x, kind="stable")
+    blocks = []
+    for xi, yi, wi in zip(x[order], y[order], weights[order]):
+        blocks.append([xi * wi, yi * wi, wi])
+        while len(blocks) > 1 and blocks[-2][1] / blocks[-2][2] >= blocks[-1][1] / blocks[-1][2]:
+            sx, sy, sw = blocks.pop()
+            blocks[-1][0] += sx
+            blocks[-1][1] += sy
+            blocks[-1][2] += sw
+    blocks = np.array(blocks)
+    return blocks[:, 0] / blocks[:, 2], blocks[:, 1] / blocks[:, 2]
+
+
+def _curve(x, y, weights):
+    grid = np.linspace(0.0, 1.0, CALIBRATION_POINTS)
+    return np.interp(grid, *_isotonic(x, y, weights))
+
+
+def team_folds(teams):
+    """Grupo do ajuste cruzado de cada time (estável entre processos)"""
+    return np.array(
+        [zlib.crc32(str(team).encode("utf-8")) % CALIBRATION_FOLDS for team in teams], dtype=int
+    ).reshape(-1)
+
+
+def calibration_inputs():
+    """Por (time, liga) e lado: liga, ``GP``, probabilidades do modelo e frequências observadas"""
+    rows = []
+    for side, goals in _PROFILE_GOALS.items():
+        key = GOAL_LINE_SOURCES[side]["key"]
+        # Sem a coluna de liga não há curva por liga: a fonte fica fora do ajuste
+        if DATASETS[key].league_column not in get_dataset(key).columns:
+            continue
+        store = get_goal_line_store(side)
+        profiles = get_league_profiles(side)
+        if not store.rows or profiles.empty or any(column not in profiles.columns for column in goals):
+            continue
+        keys = list(store.rows)
+        teams = np.array([team for team, _ in keys], dtype=object)
+        leagues = np.array([league for _, league in keys], dtype=object)
+        profiles = profiles.reindex(pd.MultiIndex.from_tuples(keys, names=profiles.index.names))
+
+        model = model_probabilities(*(profiles[column].to_numpy(dtype=float) for column in goals))
+        observed = store.values[[store.rows[key] for key in keys]].astype(float)
+        rows.append({
+            "team": teams,
+            "league": leagues,
+            "games": observed[:, _FIELD_INDEX["games"]],
+            **{f"model_{market}": model[market] for market in MARKETS},
+            **{f"observed_{market}": observed[:, _FIELD_INDEX[market]] for market in MARKETS}
+        })
+    if not rows:
+        return {}
+    return {column: np.concatenate([row[column] for row in rows]) for column in rows[0]}
+
+
+def _league_curves(inputs, leagues, train):
+    """Curvas ``(ligas, mercados, pontos)`` ajustadas só com as linhas ``train``"""
+    curves = np.tile(np.linspace(0.0, 1.0, CALIBRATION_POINTS), (len(leagues), len(MARKETS), 1))
+    games = np.nan_to_num(inputs["games"])
+    for market_index, market in enumerate(MARKETS):
+        x, y = inputs[f"model_{market}"], inputs[f"observed_{market}"]
+        valid = train & ~(np.isnan(x) | np.isnan(y)) & (games > 0)
+        if not valid.any():
+            continue
+        overall = _curve(x[valid], y[valid], games[valid])
+        curves[:, market_index] = overall
+        for row, league in enumerate(leagues[1:], start=1):
+            in_league = valid & (inputs["league"] == league)
+            if in_league.any():
+                weight = games[in_league].sum() / (games[in_league].sum() + LEAGUE_PRIOR_GAMES)
+                league_curve = _curve(x[in_league], y[in_league], games[in_league])
+                curves[row, market_index] = weight * league_curve + (1 - weight) * overall
+    return curves
+
+
+def fit_calibration(inputs) -> Calibration:
+    """Curvas de calibração por liga e par de grupos a partir de ``calibration_inputs()``"""
+    if not inputs:
+        identity = np.linspace(0.0, 1.0, CALIBRATION_POINTS)
+        curves = np.tile(identity, (len(_FOLD_PAIRS), 1, len(MARKETS), 1))
+        return Calibration({GLOBAL: 0}, curves.astype(np.float32))
+
+    leagues = [GLOBAL, *sorted(set(inputs["league"]))]
+    folds = team_folds(inputs["team"])
+    curves = np.stack([
+        _league_curves(inputs, leagues, (folds != first) & (folds != second))
+        for first, second in _FOLD_PAIRS
+    ])
+    return Calibration({league: row for row, league in enumerate(leagues)}, curves.astype(np.float32))
+
+
+# ----------------------------
+# COMBINAÇÃO
+# ----------------------------
+def match_leagues(home_teams, away_teams):
+    """Liga de cada confronto: a do perfil do mandante, senão a do visitante (``None`` sem nenhuma)"""
+    home = get_team_profiles("home")
+    away = get_team_profiles("away")
+    if "league" not in home.columns or "league" not in away.columns:
+        return np.full(len(home_teams), None, dtype=object)
+    home_league = home["league"].reindex(pd.Index(home_teams, dtype=object)).to_numpy(dtype=object)
+    away_league = away["league"].reindex(pd.Index(away_teams, dtype=object)).to_numpy(dtype=object)
+    leagues = np.where(pd.isna(home_league), away_league, home_league)
+    return np.where(pd.isna(leagues), None, leagues)
+
+
+def blend_goal_lines(home_teams, away_teams, lambda_home, lambda_away, leagues=None) -> dict:
+    """``BlendedProbability`` (arrays por jogo) de cada mercado para uma rodada
+
+    ``leagues``: liga canônica de cada jogo (jogos sem ela usam ``match_leagues``).
+    Jogos sem frequência de algum time ficam só com o modelo calibrado
+    (``weight`` 0); jogos sem λ ficam com ``NaN``.
+    """
+    fallback = match_leagues(home_teams, away_teams)
+    leagues = fallback if leagues is None else [
+        league if isinstance(league, str) else default for league, default in zip(leagues, fallback)
+    ]
+    calibration = get_calibration()
+    league_rows = calibration.league_rows(leagues)
+    pair_rows = calibration.pair_rows(home_teams, away_teams)
+    model = model_probabilities(lambda_home, lambda_away)
+    home = team_goal_lines(home_teams, "home", leagues)
+    away = team_goal_lines(away_teams, "away", leagues)
+
+    games = np.fmin(home[:, _FIELD_INDEX["games"]], away[:, _FIELD_INDEX["games"]])
+    weight = np.nan_to_num(games / (games + PRIOR_GAMES))
+    blended = {}
+    for market in MARKETS:
+        calibrated = calibration.apply(market, model[market], league_rows, pair_rows)
+        empirical = (home[:, _FIELD_INDEX[market]] + away[:, _FIELD_INDEX[market]]) / 2
+        market_weight = np.where(np.isnan(empirical), 0.0, weight)
+        probability = market_weight * np.nan_to_num(empirical) + (1 - market_weight) * calibrated
+        blended[market] = BlendedProbability(model[market], calibrated, empirical, market_weight, probability)
+    return blended
+
+
+def blend_match(home_team, away_team, lambda_home, lambda_away, league=None) -> dict:
+    """``BlendedProbability`` (escalares) de cada mercado para um confronto"""
+    leagues = None if league is None else [league]
+    blended = blend_goal_lines([home_team], [away_team], [lambda_home], [lambda_away], leagues)
+    return {
+        market: BlendedProbability(*(float(value[0]) for value in values))
+        for market, values in blended.items()
+    }
+
+
+# ----------------------------
+# CACHE POR VERSÃO DOS DADOS
+# ----------------------------
+_calibration = None
+_lock = threading.Lock()
+
+
+def _source_keys():
+    return list(dict.fromkeys(source_keys() + [source["key"] for source in GOAL_LINE_SOURCES.values()]))
+
+
+def get_calibration() -> Calibration:
+    """``fit_calibration`` dos dados atuais, refeita só quando algum CSV usado muda"""
+    global _calibration
+    keys = _source_keys()
+    load_datasets(keys)
+    version = data_version(keys)
+
+    cached = _calibration
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    with _lock:
+        cached = _calibration
+        if cached is None or cached[0] != version:
+            cached = _calibration = (version, fit_calibration(calibration_inputs()))
+    return cached[1]
@@ -0,0 +1,207 @@
+"""Geração do bundle de artefatos pré-calculados, fora dos apps.
+
+    python -m jogosdodia.build --output bundle
+    JOGOSDODIA_BUNDLE=bundle streamlit run app.py
+
+Lê todos os CSVs do registro e grava em ``<output>/<data_version>/`` as
+tabelas já tipadas, o universo de times de cada app, os agregados e z-scores
+por liga, os perfis por time, os gols por faixa de 15 minutos, o ajuste do
+modelo de força, a matriz de placares de cada confronto casa x fora dentro
+de cada liga, as curvas de calibração das linhas de gols, as frequências de
+linhas de gols por time, as intensidades ao vivo e as curvas de primeiro gol
+(layout em ``bundle``). A gravação é num diretório temporário renomeado no fim, e só
+então ``LATEST`` passa a apontar para a nova versão.
+
+O tempo de cada etapa e o tamanho de cada arquivo ficam no ``manifest.json``
+e são impressos ao fim, para acompanhar o custo da geração.
+"""
+import argparse
+import json
+import logging
+import os
+import shutil
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+from pyarrow import feather
+
+from .blend import CALIBRATION_FOLDS, calibration_inputs, fit_calibration
+from .bundle import BUNDLE_FORMAT, LATEST, MANIFEST, SCORE_GOALS
+from .data import DATASETS, data_version, load_all_data, load_errors, set_base_url, table_versions
+from .firstgoal import build_first_goal_curves
+from .goallines import GOAL_LINE_SOURCES, build_goal_line_store
+from .inplay import INPLAY_SOURCES, build_band_rates
+from .leagues import LEAGUE_SOURCES, build_league_table, build_league_zscores
+from .live import build_live_rates
+from .profile import PROFILE_SOURCES, build_team_profiles
+from .scoreline import score_matrix
+from .strength import StrengthModel, fit_strengths, strength_inputs
+from .teams import SIDEBAR_KEYS, build_team_universe
+
+logger = logging.getLogger(__name__)
+
+
+@contextmanager
+def _stage(timings, name):
+    start = time.perf_counter()
+    yield
+    timings[name] = time.perf_counter() - start
+    logger.info("%s: %.3fs", name, timings[name])
+
+
+def _write_frame(path, name, df):
+    os.makedirs(os.path.dirname(os.path.join(path, name)), exist_ok=True)
+    feather.write_feather(df, os.path.join(path, f"{name}.feather"))
+
+
+def league_pairings(model) -> pd.DataFrame:
+    """Confrontos casa x fora entre times da mesma liga, com os λ do modelo
+
+    Um confronto que existe em mais de uma liga aparece uma vez só; os λ são
+    os de ``model.lambdas`` (a primeira liga em comum dos dois times).
+    """
+    fit_teams = model.fit.teams
+    homes, aways, league_names = [], [], []
+    for league, names in fit_teams.groupby("league", sort=False)["team"]:
+        names = names.to_numpy(dtype=object)
+        home, away = np.meshgrid(np.arange(len(names)), np.arange(len(names)), indexing="ij")
+        different = home != away
+        homes.append(names[home[different]])
+        aways.append(names[away[different]])
+        league_names.append(np.full(different.sum(), league, dtype=object))
+    if not homes:
+        return pd.DataFrame(columns=["league", "home", "away", "lambda_home", "lambda_away"])
+
+    pairings = pd.DataFrame({
+        "league": np.concatenate(league_names),
+        "home": np.concatenate(homes),
+        "away": np.concatenate(aways)
+    }).drop_duplicates(["home", "away"], ignore_index=True)
+    pairings["lambda_home"], pairings["lambda_away"] = model.lambdas_many(pairings["home"], pairings["away"])
+    return pairings
+
+
+def build_bundle(output, max_goals=SCORE_GOALS) -> dict:
+    """Gera o bundle da versão atual dos dados em ``output``; retorna o manifesto"""
+    timings = {}
+    with _stage(timings, "tables"):
+        frames = load_all_data()
+    version = data_version(list(DATASETS))
+    path = os.path.join(output, version)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+
+    with _stage(timings, "write_tables"):
+        for key, df in frames.items():
+            _write_frame(tmp, f"tables/{key}", df.reset_index(drop=True))
+
+    rejected = {}
+    with _stage(timings, "teams"):
+        for group, keys in SIDEBAR_KEYS.items():
+            universe = build_team_universe(keys)
+            _write_frame(tmp, f"teams_{group}", universe.coverage.reset_index())
+            rejected[group] = list(universe.rejected)
+
+    with _stage(timings, "leagues"):
+        _write_frame(tmp, "leagues", build_league_table().reset_index())
+        for side in LEAGUE_SOURCES:
+            _write_frame(tmp, f"zscores_{side}", build_league_zscores(side).reset_index())
+
+    with _stage(timings, "profiles"):
+        for side in PROFILE_SOURCES:
+            _write_frame(tmp, f"profiles_{side}", build_team_profiles(side).reset_index())
+        for side in INPLAY_SOURCES:
+            _write_frame(tmp, f"band_rates_{side}", build_band_rates(side).reset_index())
+
+    with _stage(timings, "strength"):
+        fit = fit_strengths(strength_inputs())
+        _write_frame(tmp, "strength_teams", fit.teams)
+        _write_frame(tmp, "strength_leagues", fit.leagues.reset_index())
+
+    with _stage(timings, "scorelines"):
+        pairings = league_pairings(StrengthModel(fit))
+        matrices = score_matrix(
+            pairings["lambda_home"].to_numpy(dtype=float), pairings["lambda_away"].to_numpy(dtype=float), max_goals
+        )
+        _write_frame(tmp, "pairings", pairings)
+        np.save(os.path.join(tmp, "scorelines.npy"), matrices)
+
+    with _stage(timings, "goal_lines"):
+        for side in GOAL_LINE_SOURCES:
+            store = build_goal_line_store(side)
+            lines = pd.DataFrame(store.values, columns=list(store.fields))
+            lines.insert(0, "league", [league for _, league in store.rows])
+            lines.insert(0, "team", [team for team, _ in store.rows])
+            _write_frame(tmp, f"goal_lines_{side}", lines)
+
+    with _stage(timings, "live"):
+        for side in PROFILE_SOURCES:
+            _write_frame(tmp, f"live_rates_{side}", build_live_rates(side).reset_index())
+            curves = build_first_goal_curves(side)
+            _write_frame(tmp, f"first_goal_{side}", pd.DataFrame({
+                "team": list(curves.teams),
+                "scored_first": curves.scored_first,
+                "matches": curves.matches,
+            }))
+            np.save(os.path.join(tmp, f"first_goal_{side}.npy"), np.stack([curves.scored, curves.conceded]))
+
+    with _stage(timings, "calibration"):
+        calibration = fit_calibration(calibration_inputs())
+        np.save(os.path.join(tmp, "calibration.npy"), calibration.curves)
+
+    sizes = {
+        os.path.relpath(os.path.join(directory, name), tmp): os.path.getsize(os.path.join(directory, name))
+        for directory, _, names in os.walk(tmp) for name in names
+    }
+    manifest = {
+        "format": BUNDLE_FORMAT,
+        "version": version,
+        "created": time.time(),
+        "tables": {key: table_versions()[key] for key in frames},
+        "errors": load_errors(),
+        "rejected": rejected,
+        "strength": {"iterations": fit.iterations, "converged": fit.converged},
+        "scorelines": {"pairings": len(pairings), "max_goals": max_goals},
+        "calibration": {"leagues": list(calibration.leagues), "folds": CALIBRATION_FOLDS},
+        "timings": timings,
+        "sizes": sizes
+    }
+    with open(os.path.join(tmp, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp, path)
+    latest = os.path.join(output, f"{LATEST}.{os.getpid()}.tmp")
+    with open(latest, "w", encoding="utf-8") as f:
+        f.write(version)
+    os.replace(latest, os.path.join(output, LATEST))
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", default="bundle", help="diretório raiz dos bundles (padrão: ./bundle)")
+    parser.add_argument("--base-url", help="URL ou diretório dos CSVs (padrão: o do pacote)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+    if args.base_url:
+        set_base_url(args.base_url)
+
+    start = time.perf_counter()
+    manifest = build_bundle(args.output)
+    elapsed = time.perf_counter() - start
+
+    for name, seconds in manifest["timings"].items():
+        print(f"{name:<14} {seconds * 1000:10.1f} ms")
+    total_size = sum(manifest["sizes"].values())
+    print(f"bundle {manifest['version']}: {manifest['scorelines']['pairings']} confrontos, "
+          f"{total_size / 2**20:.1f} MiB em {elapsed:.2f}s -> {os.path.join(args.output, manifest['version'])}")
+    if manifest["errors"]:
+        print(f"tabelas com erro: {', '.join(sorted(manifest['errors']))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""Leitura do bundle de artefatos pré-calculados (``python -m jogosdodia.build``).
+
+Um bundle é um diretório por versão dos dados (``data_version`` de todas as
+tabelas do registro)::
+
+    <raiz>/LATEST                   versão mais recente
+    <raiz>/<versão>/manifest.json   formato, versões das tabelas, tempos da geração
+                    tables/<chave>.feather       tabelas tipadas e compactadas
+                    teams_<grupo>.feather        universo de times de cada app
+                    leagues.feather, zscores_<lado>.feather
+                    profiles_<lado>.feather      perfis por (time, liga)
+                    band_rates_<lado>.feather    gols por faixa de 15 minutos (``inplay``)
+                    live_rates_<lado>.feather    intensidades ao vivo por time (``live``)
+                    first_goal_<lado>.feather, first_goal_<lado>.npy
+                                                 curvas de primeiro gol (``firstgoal``)
+                    goal_lines_<lado>.feather    linhas de gols por (time, liga) (``goallines``)
+                    strength_teams.feather, strength_leagues.feather
+                    pairings.feather, scorelines.npy
+                    calibration.npy              curvas por par de grupos e liga (``blend``)
+
+``pairings`` tem uma linha por confronto casa x fora entre times da mesma
+liga, com os λ do modelo de força; a linha ``i`` corresponde à matriz de
+placares ``scorelines[i]``.
+
+Com ``JOGOSDODIA_BUNDLE=<raiz>``, ``open_bundle()`` (chamado no início de cada
+app) preenche o cache das tabelas e os caches derivados (perfis, gols por
+faixa, intensidades ao vivo, primeiro gol, linhas de gols, times, ligas,
+modelo de força, calibração) a partir do bundle: nada é
+baixado nem calculado, e ``bundle_pairing(casa, fora)`` devolve λ e matriz
+prontos. Sem a variável os apps seguem carregando os CSVs como antes.
+"""
+import json
+import logging
+import os
+import threading
+
+import numpy as np
+
+from . import blend, firstgoal, goallines, inplay, leagues, live, profile, strength, teams
+from .data import data_version, preload_tables
+
+try:
+    from pyarrow import feather
+except ImportError:  # pragma: no cover - pyarrow vem com o streamlit
+    feather = None
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_ENV = "JOGOSDODIA_BUNDLE"
+BUNDLE_FORMAT = 6
+LATEST = "LATEST"
+MANIFEST = "manifest.json"
+
+# Gols por lado nas matrizes do bundle (as abas de análise usam 0 a 5)
+SCORE_GOALS = 5
+
+
+def bundle_path(root, version=None):
+    """Diretório da versão ``version`` do bundle em ``root`` (``LATEST`` por padrão)"""
+    if version is None:
+        with open(os.path.join(root, LATEST), encoding="utf-8") as f:
+            version = f.read().strip()
+    return os.path.join(root, version)
+
+
+def read_frame(path, name, index=None):
+    """``<name>.feather`` do bundle ``path`` como DataFrame (com ``index`` como índice)"""
+    df = feather.read_table(os.path.join(path, f"{name}.feather"), memory_map=True).to_pandas()
+    return df.set_index(index) if index else df
+
+
+class Bundle:
+    """Bundle aberto: manifesto e matrizes de placares por confronto"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, MANIFEST), encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        if self.manifest.get("format") != BUNDLE_FORMAT:
+            raise ValueError(f"Formato de bundle {self.manifest.get('format')!r} em {path}, esperado {BUNDLE_FORMAT}")
+        self.version = self.manifest["version"]
+
+        pairings = read_frame(path, "pairings")
+        self.lambdas = pairings[["lambda_home", "lambda_away"]].to_numpy(dtype=float)
+        self.scorelines = np.load(os.path.join(path, "scorelines.npy"), mmap_mode="r")
+        self._rows = dict(zip(zip(pairings["home"].tolist(), pairings["away"].tolist()), range(len(pairings))))
+
+    def pairing(self, home_team, away_team):
+        """``(λ_casa, λ_fora, matriz)`` do confronto, ou ``None`` fora das ligas do bundle"""
+        row = self._rows.get((home_team, away_team))
+        if row is None:
+            return None
+        lambda_home, lambda_away = self.lambdas[row]
+        return float(lambda_home), float(lambda_away), np.array(self.scorelines[row])
+
+    def install(self):
+        """Preenche o cache das tabelas e os caches derivados com o conteúdo do bundle"""
+        versions = self.manifest["tables"]
+        preload_tables({key: read_frame(self.path, f"tables/{key}") for key in versions}, versions)
+
+        for side in profile.PROFILE_SOURCES:
+            version = data_version(profile.source_keys(side))
+            profile._profiles[side] = (version, read_frame(self.path, f"profiles_{side}", ["team", "league"]))
+
+        for side, source in inplay.INPLAY_SOURCES.items():
+            version = data_version([source["key"]])
+            inplay._rates[side] = (version, read_frame(self.path, f"band_rates_{side}", "team"))
+
+        for side in profile.PROFILE_SOURCES:
+            version = data_version(profile.source_keys())
+            live._rates[side] = (version, read_frame(self.path, f"live_rates_{side}", "team"))
+            first = read_frame(self.path, f"first_goal_{side}")
+            scored, conceded = np.load(os.path.join(self.path, f"first_goal_{side}.npy"))
+            firstgoal._curves[side] = (version, firstgoal.FirstGoalCurves(
+                dict(zip(first["team"].tolist(), range(len(first)))), scored, conceded,
+                first["scored_first"].to_numpy(), first["matches"].to_numpy()
+            ))
+
+        for side in goallines.GOAL_LINE_SOURCES:
+            lines = read_frame(self.path, f"goal_lines_{side}")
+            team_names = lines["team"].tolist()
+            league_names = [league if isinstance(league, str) else None for league in lines["league"].tolist()]
+            first = {}
+            for row, team in enumerate(team_names):
+                first.setdefault(team, row)
+            fields = list(goallines.FIELDS.values())
+            goallines._stores[side] = (data_version(goallines._store_keys(side)), goallines.GoalLineStore(
+                first, dict(zip(fields, range(len(fields)))), lines[fields].to_numpy(dtype=np.float32),
+                dict(zip(zip(team_names, league_names), range(len(team_names))))
+            ))
+
+        for group, keys in teams.SIDEBAR_KEYS.items():
+            keys = tuple(dict.fromkeys(keys))
+            coverage = read_frame(self.path, f"teams_{group}", "team")
+            team_names = np.array(coverage.index.tolist(), dtype=object)
+            universe = teams.TeamUniverse(
+                keys, team_names, dict(zip(team_names.tolist(), range(len(team_names)))),
+                coverage, tuple(self.manifest["rejected"][group])
+            )
+            teams._universes[keys] = (data_version(keys), universe)
+
+        league_keys = [source["key"] for source in leagues.LEAGUE_SOURCES.values()]
+        version = data_version(league_keys)
+        leagues._tables["leagues"] = (version, read_frame(self.path, "leagues", "league"))
+        for side in leagues.LEAGUE_SOURCES:
+            leagues._tables[f"zscores_{side}"] = (version, read_frame(self.path, f"zscores_{side}", "team"))
+
+        fit = strength.StrengthFit(
+            read_frame(self.path, "strength_teams"),
+            read_frame(self.path, "strength_leagues", "league"),
+            self.manifest["strength"]["iterations"],
+            self.manifest["strength"]["converged"]
+        )
+        version = data_version([source["key"] for source in strength.STRENGTH_SOURCES.values()])
+        strength._model = (version, strength.StrengthModel(fit))
+
+        blend._calibration = (data_version(blend._source_keys()), blend.Calibration(
+            {league: row for row, league in enumerate(self.manifest["calibration"]["leagues"])},
+            np.load(os.path.join(self.path, "calibration.npy"))
+        ))
+
+
+# ----------------------------
+# BUNDLE DO PROCESSO
+# ----------------------------
+_bundle = None
+_lock = threading.Lock()
+
+
+def open_bundle(root=None):
+    """Abre e instala o bundle de ``root`` (padrão: ``JOGOSDODIA_BUNDLE``) uma vez por processo
+
+    Retorna o ``Bundle`` ou ``None`` quando não há bundle configurado ou ele
+    não pode ser lido (os apps seguem com os CSVs).
+    """
+    global _bundle
+    if _bundle is not None:
+        return _bundle
+    root = root or os.environ.get(BUNDLE_ENV)
+    if not root or feather is None:
+        return None
+
+    with _lock:
+        if _bundle is None:
+            try:
+                bundle = Bundle(bundle_path(root))
+                bundle.install()
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning("Bundle ilegível em %s: %s", root, e)
+                return None
+            logger.info("Bundle %s aberto (%s)", bundle.version, bundle.path)
+            _bundle = bundle
+    return _bundle
+
+
+def bundle_pairing(home_team, away_team):
+    """``Bundle.pairing`` do bundle aberto no processo (``None`` sem bundle)"""
+    return _bundle.pairing(home_team, away_team) if _bundle is not None else None
@@ -0,0 +1,596 @@
+"""Camada de acesso aos dados compartilhada por app.py, appft.py e appht.py.
+
+Cada CSV de ``DATA_URLS`` é baixado e processado uma única vez por processo;
+todas as páginas e sessões recebem as mesmas instâncias de ``DataFrame``,
+que devem ser tratadas como somente leitura.
+"""
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from io import BytesIO
+from typing import Optional
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+from .index import build_team_index, rows_for, rows_for_many
+from .schema import SCHEMA_VERSION, compact, ingest
+from .snapshot import SnapshotStore
+
+logger = logging.getLogger(__name__)
+
+# ----------------------------
+# CONSTANTES E CONFIGURAÇÕES
+# ----------------------------
+DATA_URLS = {
+    "main": [
+        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/equipes_casa.csv",
+        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/equipes_fora.csv",
+        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/equipes_fora_Favorito.csv",
+        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/overall_stats.csv"
+    ],
+    "first_goal": [
+        "https://raw.githubusercontent.com/scooby75/firstgoal/main/scored_first_home.csv",
+        "https://raw.githubusercontent.com/scooby75/firstgoal/main/scored_first_away.csv"
+    ],
+    "goal_minute": [
+        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/momento_do_gol_home.csv",
+        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/momento_do_gol_away.csv"
+    ],
+    "goals_half": [
+        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/Goals_Half.csv"
+    ],
+    "goals_ht": [
+        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/CV_Goals_HT_Home.csv",
+        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/CV_Goals_HT_Away.csv"
+    ],
+    "goals_per_time": [
+        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/Goals_Per_Time_Home.csv",
+        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/Goals_Per_Time_Away.csv"
+    ],
+    "goals_stats": [
+        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/Goals_Stats_Home.csv",
+        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/Goals_Stats_Away.csv",
+        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/Goals_Stats_Overall.csv"
+    ],
+    "ppg_ht": [
+        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/PPG_HT_Home.csv",
+        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/PPG_HT_Away.csv"
+    ],
+    "relative_form": [
+        "https://raw.githubusercontent.com/scooby75/jogosdodia/refs/heads/main/Relative_Form.csv"
+    ]
+}
+
+# Chave no dicionário ``data`` de cada URL, na mesma ordem de DATA_URLS,
+# com a coluna de time e a coluna de liga de cada tabela
+DATA_KEYS = {
+    "main": [
+        ("home_df", "Team_Home", "Liga"),
+        ("away_df", "Team_Away", "Liga"),
+        ("away_fav_df", "Team_Away_Fav", "Liga"),
+        ("overall_df", "Team_Home_Overall", "Liga")
+    ],
+    "first_goal": [
+        ("home_fg_df", "Team_Home", "League"),
+        ("away_fg_df", "Team_Away", "League")
+    ],
+    "goal_minute": [
+        ("goal_minute_home_df", "Team_Home", "league"),
+        ("goal_minute_away_df", "Team_Away", "league")
+    ],
+    "goals_half": [
+        ("goals_half_df", "Team", "League_Name")
+    ],
+    "goals_ht": [
+        ("cv_home_df", "Team_Home", None),
+        ("cv_away_df", "Team_Away", None)
+    ],
+    "goals_per_time": [
+        ("goals_per_time_home_df", "Team_Home", "League"),
+        ("goals_per_time_away_df", "Team_Away", "League")
+    ],
+    "goals_stats": [
+        ("goals_stats_home_df", "Team_Home", "League_Name"),
+        ("goals_stats_away_df", "Team_Away", "League_Name"),
+        ("goals_stats_overall_df", "Team_Overall", "League_Name")
+    ],
+    "ppg_ht": [
+        ("ppg_ht_home_df", "Team_Home", "League"),
+        ("ppg_ht_away_df", "Team_Away", "League")
+    ],
+    "relative_form": [
+        ("relative_form_df", "Team", "League")
+    ]
+}
+
+
+@dataclass(frozen=True)
+class Dataset:
+    """Entrada do registro: uma tabela CSV e suas colunas de chave"""
+    key: str
+    group: str
+    url: str
+    team_column: Optional[str]
+    league_column: Optional[str]
+
+
+def _build_registry():
+    registry = {}
+    for group, urls in DATA_URLS.items():
+        for url, (key, team_column, league_column) in zip(urls, DATA_KEYS[group]):
+            registry[key] = Dataset(key, group, url, team_column, league_column)
+    return registry
+
+
+DATASETS = _build_registry()
+
+# Tempo limite (segundos) de cada download e número máximo de downloads simultâneos
+HTTP_TIMEOUT = 30
+MAX_WORKERS = 16
+
+# Diretório dos arquivos persistidos entre execuções (aliases de nomes, snapshots)
+CACHE_DIR = os.environ.get("JOGOSDODIA_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "jogosdodia"))
+
+# Idade máxima (segundos) de um snapshot usado sem consultar a origem; 0 desativa os snapshots
+SNAPSHOT_MAX_AGE = float(os.environ.get("JOGOSDODIA_SNAPSHOT_MAX_AGE", 3600))
+
+# Intervalo (segundos) entre revalidações das tabelas em memória (``refresh_if_stale``); 0 desativa
+REFRESH_INTERVAL = float(os.environ.get("JOGOSDODIA_REFRESH_INTERVAL", 900))
+
+# ----------------------------
+# CACHE DO PROCESSO
+# ----------------------------
+# Chave -> (DataFrame, índice por time): os dois são trocados numa única atribuição
+_cache = {}
+_errors = {}
+_timings = {}
+_versions = {}
+_failures = {}
+_memory = {}
+_stats = Counter()
+_remote = {}
+_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_session = None
+_last_refresh = None
+_refreshing = threading.Event()
+_refresh_lock = threading.Lock()
+_snapshots = SnapshotStore(os.path.join(CACHE_DIR, "snapshots") if SNAPSHOT_MAX_AGE > 0 else None)
+
+
+def _get_session():
+    """Sessão HTTP com pool de conexões compartilhada pelos downloads"""
+    global _session
+    if _session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=MAX_WORKERS)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _session = session
+    return _session
+
+
+def set_base_url(base_url):
+    """Aponta todas as tabelas para ``base_url`` (mesmo nome de arquivo) e limpa o cache
+
+    Usado para servir os CSVs do próprio repositório, por exemplo em benchmarks.
+    """
+    base_url = base_url.rstrip("/")
+    for key, dataset in list(DATASETS.items()):
+        filename = dataset.url.rsplit("/", 1)[-1]
+        DATASETS[key] = replace(dataset, url=f"{base_url}/{filename}")
+    clear_cache()
+
+
+def _read_bytes(url):
+    """Conteúdo bruto de uma URL HTTP(S) ou de um caminho local"""
+    content, _ = _download(url)
+    return content
+
+
+def _download(url, validators=None):
+    """Baixa ``url``; com ``validators`` faz uma requisição condicional.
+
+    Retorna ``(conteúdo, validadores)``; o conteúdo é ``None`` quando o
+    servidor responde 304 (arquivo não mudou desde os validadores enviados).
+    """
+    if not url.startswith(("http://", "https://")):
+        with open(url, "rb") as f:
+            return f.read(), {}
+
+    headers = {}
+    if validators:
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+    response = _get_session().get(url, headers=headers, timeout=HTTP_TIMEOUT)
+    if response.status_code == 304 and headers:
+        return None, validators
+    response.raise_for_status()
+    return response.content, {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified")
+    }
+
+
+def _count(event):
+    with _stats_lock:
+        _stats[event] += 1
+
+
+def parse_csv(content):
+    """Converte o conteúdo de um CSV em DataFrame e realiza limpeza básica"""
+    df = pd.read_csv(BytesIO(content), encoding="utf-8-sig")
+    df = df.dropna(axis=1, how='all')
+    df.columns = df.columns.str.strip()
+    return df
+
+
+def load_csv(url):
+    """Carrega um arquivo CSV e realiza limpeza básica"""
+    return parse_csv(_read_bytes(url))
+
+
+def _clean(dataset, df):
+    """Limpa, tipa e compacta a tabela conforme o esquema do grupo
+
+    Retorna ``(df, falhas, memória)``, com a memória (bytes) antes e depois de ``compact``.
+    """
+    team_column = dataset.team_column
+    if team_column in df.columns and pd.api.types.is_string_dtype(df[team_column]):
+        df[team_column] = df[team_column].str.strip()
+    result = ingest(dataset.group, df)
+    if result.failure_count:
+        logger.info("%s: %d células fora do formato esperado", dataset.key, result.failure_count)
+    failures = {"count": result.failure_count, "cells": [list(cell) for cell in result.failures]}
+
+    before = int(result.frame.memory_usage(deep=True).sum())
+    df = compact(result.frame, [c for c in (team_column, dataset.league_column) if c])
+    memory = {"before": before, "after": int(df.memory_usage(deep=True).sum())}
+    logger.info("%s: %d KiB -> %d KiB em memória", dataset.key, memory["before"] // 1024, memory["after"] // 1024)
+    return df, failures, memory
+
+
+def _load_dataset(dataset, max_age=None):
+    """``(DataFrame, versão)`` da tabela; em caso de falha, ``(vazio, "erro")``
+
+    A versão não é gravada aqui: quem chama a guarda com a tabela, em ``_store``.
+    """
+    max_age = SNAPSHOT_MAX_AGE if max_age is None else max_age
+    start = time.perf_counter()
+    df = failures = memory = None
+    try:
+        # Snapshot recente em disco: nenhum acesso à rede
+        entry = _snapshots.entry(dataset.key, dataset.url)
+        if entry is not None and entry.get("schema") != SCHEMA_VERSION:
+            # Snapshot gravado com outras regras de conversão: processa de novo
+            entry = None
+        if entry is not None and _snapshots.age(entry) < max_age:
+            df = _snapshots.read(dataset.key, entry["version"])
+            version = entry["version"]
+            if df is not None:
+                _count("snapshot")
+
+        if df is None:
+            # Snapshot antigo: requisição condicional com o ETag/Last-Modified guardados
+            content, validators = _download(dataset.url, entry)
+            if content is None:
+                df = _snapshots.read(dataset.key, entry["version"])
+                version = entry["version"]
+                if df is not None:
+                    _snapshots.touch(dataset.key, **validators)
+                    _count("not_modified")
+                else:
+                    content, validators = _download(dataset.url)
+
+        if df is None:
+            version = hashlib.sha1(content).hexdigest()
+            if entry is not None and entry["version"] == version:
+                # Conteúdo igual ao do snapshot: reaproveita a tabela já processada
+                df = _snapshots.read(dataset.key, version)
+                if df is not None:
+                    _snapshots.touch(dataset.key, **validators)
+                    _count("unchanged")
+            if df is None:
+                df, failures, memory = _clean(dataset, parse_csv(content))
+                _snapshots.write(
+                    dataset.key, version, df, source=dataset.url,
+                    schema=SCHEMA_VERSION, failures=failures, memory=memory, **validators
+                )
+                _count("downloaded")
+    except Exception as e:
+        logger.warning("Erro ao carregar %s: %s", dataset.url, e)
+        _errors[dataset.key] = f"Erro ao carregar {dataset.url}: {str(e)}"
+        _count("errors")
+        return pd.DataFrame(), "erro"
+    finally:
+        _timings[dataset.key] = time.perf_counter() - start
+
+    # Tabela vinda do snapshot: as falhas são as registradas quando ele foi gravado
+    _failures[dataset.key] = failures if failures is not None else entry.get("failures")
+    _memory[dataset.key] = memory if memory is not None else entry.get("memory")
+    _errors.pop(dataset.key, None)
+    return df, version
+
+
+def _store(key, df, version):
+    """Guarda a tabela e o seu índice por time no cache, depois a sua versão (com ``_lock``)
+
+    Tabela e índice entram juntos numa tupla, então quem lê o cache sem a
+    trava nunca combina o índice novo com a tabela antiga. A versão é trocada
+    por último: quem lê a versão nova (``data_version``) já encontra a tabela
+    nova no cache, então nenhum cache derivado guarda dados antigos sob a
+    versão nova.
+    """
+    _cache[key] = (df, build_team_index(df, DATASETS[key].team_column))
+    _versions[key] = version
+
+
+def _entry(key):
+    """``(DataFrame, índice)`` da tabela ``key``, carregada na primeira chamada"""
+    entry = _cache.get(key)
+    if entry is not None:
+        return entry
+
+    dataset = DATASETS[key]
+    with _lock:
+        entry = _cache.get(key)
+        if entry is None:
+            df, version = _load_dataset(dataset)
+            _store(key, df, version)
+            entry = _cache[key]
+    return entry
+
+
+def get_dataset(key) -> pd.DataFrame:
+    """Retorna a tabela ``key`` do registro, carregando-a na primeira chamada"""
+    return _entry(key)[0]
+
+
+def lookup(key, team) -> pd.DataFrame:
+    """Linhas do time ``team`` na tabela ``key``, em O(1) pelo índice por time"""
+    return rows_for(*_entry(key), team)
+
+
+def lookup_many(key, teams) -> pd.DataFrame:
+    """Linhas de vários times na tabela ``key`` (equivalente a ``isin``)"""
+    return rows_for_many(*_entry(key), teams)
+
+
+def _fetch_all(keys, max_age=None):
+    """Baixa as tabelas ``keys`` em paralelo; retorna {chave: (DataFrame, versão)}"""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(keys))) as pool:
+        futures = {key: pool.submit(_load_dataset, DATASETS[key], max_age) for key in keys}
+        loaded = {key: future.result() for key, future in futures.items()}
+    logger.info(
+        "%d tabelas carregadas em %.3fs (soma dos downloads: %.3fs)",
+        len(keys), time.perf_counter() - start, sum(_timings[key] for key in keys)
+    )
+    return loaded
+
+
+def load_datasets(keys) -> dict:
+    """Retorna {chave: DataFrame} para ``keys``; as que faltam são baixadas juntas, em paralelo"""
+    keys = list(dict.fromkeys(keys))
+    if any(key not in _cache for key in keys):
+        with _lock:
+            missing = [key for key in keys if key not in _cache]
+            if missing:
+                for key, (df, version) in _fetch_all(missing).items():
+                    _store(key, df, version)
+    return {key: _cache[key][0] for key in keys}
+
+
+def preload_tables(frames, versions):
+    """Coloca tabelas já processadas no cache, sem baixar nada
+
+    ``frames`` é ``{chave: DataFrame}`` e ``versions`` ``{chave: versão}``, as
+    mesmas versões de ``data_version`` do processo que gerou as tabelas (ex.:
+    um bundle de ``python -m jogosdodia.build``).
+    """
+    with _lock:
+        for key, df in frames.items():
+            _errors.pop(key, None)
+            _store(key, df, versions[key])
+
+
+def load_all_data() -> dict:
+    """Retorna o dicionário ``data`` com todas as tabelas do registro
+
+    As tabelas ainda não carregadas são baixadas de uma vez, em paralelo.
+    """
+    return load_datasets(DATASETS)
+
+
+class LazyData(Mapping):
+    """Dicionário ``data`` que só carrega cada tabela no primeiro acesso
+
+    Substitui ``load_all_data()`` nos apps: uma sessão paga apenas pelas
+    tabelas das abas que renderiza. Para carregar várias de uma vez (em
+    paralelo) antes de usá-las, chame ``load_datasets``.
+    """
+
+    def __getitem__(self, key):
+        if key not in DATASETS:
+            raise KeyError(key)
+        return get_dataset(key)
+
+    def __iter__(self):
+        return iter(DATASETS)
+
+    def __len__(self):
+        return len(DATASETS)
+
+    def loaded(self):
+        """Chaves das tabelas já carregadas neste processo"""
+        return [key for key in DATASETS if key in _cache]
+
+
+def refresh_data() -> list:
+    """Revalida na origem as tabelas já carregadas e troca só as que mudaram
+
+    Usa requisições condicionais: arquivos inalterados respondem 304 e a
+    tabela em memória (e o ``data_version``) continua a mesma. As versões
+    novas só entram junto com as tabelas, sob ``_lock``. Retorna as chaves
+    das tabelas atualizadas.
+    """
+    global _last_refresh
+    keys = [key for key in DATASETS if key in _cache]
+    loaded = _fetch_all(keys, max_age=0) if keys else {}
+    changed = []
+    with _lock:
+        for key, (df, version) in loaded.items():
+            if key in _cache and version == "erro":
+                # Falha na revalidação: mantém a tabela anterior (o erro fica em load_errors)
+                continue
+            if key not in _cache or _versions.get(key) != version:
+                _store(key, df, version)
+                changed.append(key)
+        _last_refresh = time.time()
+    return changed
+
+
+def _refresh_in_background():
+    try:
+        changed = refresh_data()
+        if changed:
+            logger.info("Tabelas atualizadas na origem: %s", ", ".join(changed))
+    except Exception as e:
+        logger.warning("Falha ao revalidar as tabelas: %s", e)
+    finally:
+        _refreshing.clear()
+
+
+def refresh_if_stale(max_age=None) -> bool:
+    """Dispara ``refresh_data`` numa thread se a última revalidação tem mais de ``max_age`` segundos
+
+    Chamado no início de cada rerun dos apps: não espera a revalidação (o
+    rerun usa as tabelas atuais; os seguintes, as novas) e nunca roda duas
+    ao mesmo tempo. O intervalo conta a partir da primeira chamada. Retorna
+    se uma revalidação foi iniciada.
+    """
+    global _last_refresh
+    max_age = REFRESH_INTERVAL if max_age is None else max_age
+    now = time.time()
+    with _refresh_lock:
+        if _last_refresh is None:
+            _last_refresh = now
+        if max_age <= 0 or now - _last_refresh < max_age or _refreshing.is_set():
+            return False
+        _refreshing.set()
+    threading.Thread(target=_refresh_in_background, name="jogosdodia-refresh", daemon=True).start()
+    return True
+
+
+def fetch_remote(url, parse=parse_csv):
+    """Conteúdo de ``url`` já processado por ``parse``, revalidado a cada chamada
+
+    Guarda o resultado e os validadores (ETag/Last-Modified) da última URL
+    (a do dia: as anteriores não são mais pedidas); quando a origem responde
+    304 devolve o mesmo objeto, sem baixar nem processar de novo. Erros HTTP
+    propagam como ``requests.HTTPError``.
+    """
+    cached = _remote.get(url)
+    content, validators = _download(url, cached[0] if cached else None)
+    if content is None:
+        _count("not_modified")
+        return cached[1]
+
+    value = parse(content)
+    _remote.clear()
+    _remote[url] = (validators, value)
+    _count("downloaded")
+    return value
+
+
+def cache_stats() -> dict:
+    """Contadores de acertos/erros do cache de dados desde o início do processo
+
+    ``snapshot``: lido do disco sem rede; ``not_modified``: origem respondeu
+    304; ``unchanged``: baixado, mas igual ao snapshot (sem novo parse);
+    ``downloaded``: baixado e processado; ``errors``: falhas de carga.
+    """
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["hits"] = sum(stats.get(k, 0) for k in ("snapshot", "not_modified", "unchanged"))
+    stats["misses"] = stats.get("downloaded", 0)
+    return stats
+
+
+def load_errors() -> dict:
+    """Mensagens de erro das tabelas que não puderam ser carregadas"""
+    return dict(_errors)
+
+
+def parse_failures() -> dict:
+    """Células que não seguiram o formato do esquema, por tabela
+
+    ``{chave: {"count": total, "cells": [[linha, coluna, valor], ...]}}``,
+    só com as tabelas que tiveram alguma falha.
+    """
+    return {key: failures for key, failures in _failures.items() if failures and failures["count"]}
+
+
+def memory_report() -> dict:
+    """Memória (bytes) de cada tabela carregada, com os tipos padrão e compactada
+
+    ``{chave: {"before": bytes, "after": bytes}}``; ``before`` é a tabela já
+    tipada pelo esquema, antes de ``schema.compact``.
+    """
+    return {key: dict(memory) for key, memory in _memory.items() if memory}
+
+
+def data_version(keys=None) -> str:
+    """Identificador do conteúdo das tabelas ``keys`` (todas as carregadas por padrão)
+
+    Muda sempre que algum dos CSVs é recarregado com conteúdo diferente;
+    serve de chave para os artefatos derivados (perfis, índices, modelos).
+    """
+    versions = dict(_versions)
+    digest = hashlib.sha1()
+    for key in sorted(versions if keys is None else keys):
+        digest.update(f"{key}={versions.get(key, '')};".encode())
+    return digest.hexdigest()[:16]
+
+
+def table_versions() -> dict:
+    """Versão (hash do conteúdo de origem) de cada tabela carregada; ``"erro"`` nas que falharam"""
+    return dict(_versions)
+
+
+def get_snapshot_store() -> SnapshotStore:
+    """Armazenamento em disco usado pelas tabelas e pelos artefatos derivados"""
+    return _snapshots
+
+
+def load_timings() -> dict:
+    """Tempo (segundos) do último download + parse de cada tabela"""
+    return dict(_timings)
+
+
+def clear_cache():
+    """Descarta as tabelas em memória; a próxima chamada recarrega tudo"""
+    with _lock:
+        _cache.clear()
+        _errors.clear()
+        _timings.clear()
+        _versions.clear()
+        _failures.clear()
+        _memory.clear()
+        _remote.clear()
+    with _stats_lock:
+        _stats.clear()
+
+
+if os.environ.get("JOGOSDODIA_DATA_URL"):
+    set_base_url(os.environ["JOGOSDODIA_DATA_URL"])
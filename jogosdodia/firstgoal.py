@@ -0,0 +1,209 @@
+"""Primeiro gol do jogo: minuto e time, num modelo de riscos competitivos.
+
+Cada lado do confronto tem uma intensidade de gol por minuto (a mesma de
+``live``: gols por faixa de ``Goals_Per_Time_*`` ou, sem faixas, a média de
+gols distribuída no tempo com o minuto médio de ``momento_do_gol_*``). O
+primeiro gol acontece no minuto ``t`` pelo mandante com densidade
+
+    h_casa(t) · S(t),   S(t) = exp(-∫₀ᵗ (h_casa + h_fora))
+
+e o simétrico para o visitante; ``S(90)`` é a chance de 0x0.
+
+``scored_first_*`` (``Perc.``/``Matches``, "3 out of 8") corrige a divisão
+entre os dois lados sem mexer na intensidade total (logo, sem mexer no
+minuto do primeiro gol): a fatia do mandante em cada minuto é deslocada em
+log-odds na direção da fatia empírica ``p_casa / (p_casa + p_fora)``, com
+peso ``n / (n + PRIOR_MATCHES)`` pelo menor número de jogos dos dois times.
+
+Por time ficam em cache (``data_version`` dos perfis) as curvas de
+sobrevivência minuto a minuto, como intensidade acumulada em ``float32``
+(``S = exp(-H)``), de gols marcados e sofridos. A intensidade acumulada do
+confronto é a média das curvas dos dois times, então uma rodada inteira é
+só indexação e aritmética em arrays ``(jogos, 91)``.
+"""
+import threading
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from .data import data_version, load_datasets
+from .inplay import BAND_MINUTES, FULL_TIME
+from .live import get_live_rates
+from .profile import get_team_profiles, source_keys
+from .schema import TIME_BANDS
+
+# Jogos "a priori" que a porcentagem de primeiro gol precisa para pesar metade
+PRIOR_MATCHES = 10.0
+
+MINUTES = int(FULL_TIME)
+
+
+class FirstGoalCurves(NamedTuple):
+    """Curvas de um lado: intensidade acumulada por minuto (0 a 90) e primeiro gol"""
+    teams: dict
+    scored: np.ndarray
+    conceded: np.ndarray
+    scored_first: np.ndarray
+    matches: np.ndarray
+
+
+class FirstGoal(NamedTuple):
+    """Primeiro gol de um confronto (escalares) ou de uma rodada (arrays por jogo)
+
+    ``home``/``away``/``none``: quem marca primeiro (ou 0x0), somando 1.
+    ``expected_minute``/``median_minute``: minuto do primeiro gol, dado que sai gol.
+    ``home_bands``/``away_bands``: P(primeiro gol do lado em cada faixa de 15 minutos).
+    """
+    home: float
+    away: float
+    none: float
+    expected_minute: float
+    median_minute: float
+    home_bands: np.ndarray
+    away_bands: np.ndarray
+
+
+# ----------------------------
+# CURVAS POR TIME
+# ----------------------------
+def _cumulative(rates):
+    """Intensidade acumulada por minuto (``(n, 91)``) de gols por jogo em cada faixa"""
+    per_minute = np.repeat(np.stack(rates) / BAND_MINUTES, int(BAND_MINUTES), axis=1)
+    return np.concatenate([np.zeros((len(per_minute), 1)), np.cumsum(per_minute, axis=1)], axis=1)
+
+
+def build_first_goal_curves(side) -> FirstGoalCurves:
+    """Curvas de sobrevivência e contagens de primeiro gol dos times de ``side``"""
+    rates = get_live_rates(side)
+    if rates.empty:
+        empty = np.zeros((0, MINUTES + 1), dtype=np.float32)
+        return FirstGoalCurves({}, empty, empty, np.zeros(0, dtype=np.float32), np.zeros(0, dtype=np.float32))
+
+    profiles = get_team_profiles(side)
+    profiles = profiles.set_axis(profiles.index.astype("str")).reindex(rates.index)
+    counts = []
+    for column in ("fg_Matches_Scored_First", "fg_Matches_Total"):
+        values = profiles[column].to_numpy(dtype=float) if column in profiles else np.full(len(rates), np.nan)
+        counts.append(np.nan_to_num(values, nan=0.0).astype(np.float32))
+
+    return FirstGoalCurves(
+        dict(zip(rates.index.tolist(), range(len(rates)))),
+        _cumulative(rates["scored"].tolist()).astype(np.float32),
+        _cumulative(rates["conceded"].tolist()).astype(np.float32),
+        *counts
+    )
+
+
+# ----------------------------
+# RISCOS COMPETITIVOS
+# ----------------------------
+def _logit(p):
+    return np.log(p) - np.log1p(-p)
+
+
+def first_goal_from_hazards(home_cumulative, away_cumulative, shift=0.0) -> FirstGoal:
+    """``FirstGoal`` por jogo a partir das intensidades acumuladas ``(jogos, 91)`` de cada lado
+
+    ``shift`` (por jogo) desloca em log-odds a fatia do mandante em cada minuto.
+    """
+    home_hazard = np.diff(home_cumulative, axis=1)
+    away_hazard = np.diff(away_cumulative, axis=1)
+    total = home_hazard + away_hazard
+    with np.errstate(divide="ignore", invalid="ignore"):
+        share = np.where(total > 0, home_hazard / total, 0.5)
+    share = 1.0 / (1.0 + np.exp(-(_logit(np.clip(share, 1e-9, 1 - 1e-9)) + np.asarray(shift)[..., None])))
+
+    survival = np.exp(-(home_cumulative + away_cumulative))
+    density = survival[:, :-1] - survival[:, 1:]
+    home = density * share
+    away = density - home
+    none = survival[:, -1]
+
+    scored = 1.0 - none
+    with np.errstate(divide="ignore", invalid="ignore"):
+        expected = (density @ (np.arange(MINUTES) + 0.5)) / scored
+        median = (np.cumsum(density, axis=1) < scored[:, None] / 2).sum(axis=1) + 0.5
+    median = np.where(scored > 0, median, np.nan)
+
+    bands = (len(home), len(TIME_BANDS), int(BAND_MINUTES))
+    return FirstGoal(
+        home.sum(axis=1), away.sum(axis=1), none, expected, median,
+        home.reshape(bands).sum(axis=2), away.reshape(bands).sum(axis=2)
+    )
+
+
+def _empirical_shift(home, away, home_cumulative, away_cumulative):
+    """Deslocamento em log-odds da fatia do mandante em direção a ``scored_first``"""
+    home_rate = (home["first"] + 0.5) / (home["matches"] + 1.0)
+    away_rate = (away["first"] + 0.5) / (away["matches"] + 1.0)
+    empirical = home_rate / (home_rate + away_rate)
+
+    model = first_goal_from_hazards(home_cumulative, away_cumulative)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        modelled = np.clip(model.home / (model.home + model.away), 1e-6, 1 - 1e-6)
+    matches = np.minimum(home["matches"], away["matches"])
+    weight = matches / (matches + PRIOR_MATCHES)
+    return np.nan_to_num(weight * (_logit(empirical) - _logit(modelled)))
+
+
+def first_goal_slate(home_teams, away_teams) -> FirstGoal:
+    """``FirstGoal`` com arrays para os jogos ``home_teams[i]`` x ``away_teams[i]``
+
+    Jogos com algum time sem curvas ficam com ``NaN``.
+    """
+    home_curves = get_first_goal_curves("home")
+    away_curves = get_first_goal_curves("away")
+    home_rows = np.array([home_curves.teams.get(team, -1) for team in home_teams], dtype=int)
+    away_rows = np.array([away_curves.teams.get(team, -1) for team in away_teams], dtype=int)
+    known = (home_rows >= 0) & (away_rows >= 0)
+    home_rows, away_rows = home_rows[known], away_rows[known]
+
+    # Intensidade do confronto: média do que um marca com o que o outro sofre
+    home_cumulative = (home_curves.scored[home_rows].astype(float) + away_curves.conceded[away_rows]) / 2
+    away_cumulative = (away_curves.scored[away_rows].astype(float) + home_curves.conceded[home_rows]) / 2
+    shift = _empirical_shift(
+        {"first": home_curves.scored_first[home_rows], "matches": home_curves.matches[home_rows]},
+        {"first": away_curves.scored_first[away_rows], "matches": away_curves.matches[away_rows]},
+        home_cumulative, away_cumulative
+    )
+    known_result = first_goal_from_hazards(home_cumulative, away_cumulative, shift)
+
+    result = []
+    for values in known_result:
+        full = np.full((len(known), *values.shape[1:]), np.nan)
+        full[known] = values
+        result.append(full)
+    return FirstGoal(*result)
+
+
+def first_goal(home_team, away_team):
+    """``FirstGoal`` do confronto com escalares (``None`` sem um dos times)"""
+    slate = first_goal_slate([home_team], [away_team])
+    if np.isnan(slate.none[0]):
+        return None
+    return FirstGoal(*(float(values[0]) if values.ndim == 1 else values[0] for values in slate))
+
+
+# ----------------------------
+# CACHE POR VERSÃO DOS DADOS
+# ----------------------------
+_curves = {}
+_lock = threading.Lock()
+
+
+def get_first_goal_curves(side) -> FirstGoalCurves:
+    """``build_first_goal_curves(side)``, refeitas só quando algum CSV dos perfis muda"""
+    keys = source_keys()
+    load_datasets(keys)
+    version = data_version(keys)
+
+    cached = _curves.get(side)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    with _lock:
+        cached = _curves.get(side)
+        if cached is None or cached[0] != version:
+            cached = _curves[side] = (version, build_first_goal_curves(side))
+    return cached[1]
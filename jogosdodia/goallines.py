@@ -0,0 +1,190 @@
+"""Frequências de linhas de gols por time (``Goals_Stats_Home/Away/Overall``).
+
+Cada arquivo traz, por time, a porcentagem dos jogos com 0.5+ … 5.5+ gols,
+ambos marcam (``BTS``), sem sofrer gol (``CS``), sem marcar (``FTS``),
+vitória sem sofrer (``WTN``) e derrota sem marcar (``LTN``), além de ``GP``
+e da média de gols (``Avg``). O esquema (``goals_stats``) já converte as
+porcentagens na carga; aqui elas viram probabilidades (0 a 1) numa matriz
+``float32`` por lado, com dicionários (time, liga canônica) -> linha e time
+-> primeira linha, então cada consulta é uma busca em dicionário e uma
+indexação. O mesmo nome de time pode estar em mais de uma liga; com a liga
+do jogo, vale a linha daquela liga.
+
+``goal_lines(casa, fora)`` combina os dois times como a média das
+frequências do mandante em casa e do visitante fora; um time sem linha no
+arquivo do seu lado usa a do arquivo geral (``Overall``).
+"""
+import threading
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from .data import DATASETS, data_version, get_dataset, load_datasets
+from .leagues import LEAGUE_KEYS, get_league_aliases
+
+# Linhas de over (gols no jogo) e as colunas de cada uma nos arquivos
+GOAL_LINES = (0.5, 1.5, 2.5, 3.5, 4.5, 5.5)
+
+GOAL_LINE_SOURCES = {
+    "home": {"key": "goals_stats_home_df", "team": "Team_Home"},
+    "away": {"key": "goals_stats_away_df", "team": "Team_Away"},
+    "overall": {"key": "goals_stats_overall_df", "team": "Team_Overall"}
+}
+
+# Coluna do CSV -> campo da matriz (porcentagens em ``PERCENT_FIELDS``)
+FIELDS = {
+    "GP": "games",
+    "Avg": "avg_goals",
+    **{f"{line}+": f"over_{str(line).replace('.', '')}" for line in GOAL_LINES},
+    "BTS": "btts",
+    "CS": "clean_sheet",
+    "FTS": "failed_to_score",
+    "WTN": "win_to_nil",
+    "LTN": "lose_to_nil"
+}
+PERCENT_FIELDS = [name for column, name in FIELDS.items() if column not in ("GP", "Avg")]
+
+
+class GoalLineStore(NamedTuple):
+    """Matriz ``values[linha, campo]``, primeira linha de cada time e linha de cada (time, liga)"""
+    teams: dict
+    fields: dict
+    values: np.ndarray
+    rows: dict
+
+    def row(self, team, league=None):
+        """Linha de ``team`` em ``league`` ou, sem ela, a primeira do time (``None`` sem o time)"""
+        row = self.rows.get((team, league))
+        return self.teams.get(team) if row is None else row
+
+    def get(self, team, field, league=None):
+        """Valor de ``field`` para ``team`` (``NaN`` sem o time)"""
+        row = self.row(team, league)
+        return np.nan if row is None else float(self.values[row, self.fields[field]])
+
+
+class GoalLines(NamedTuple):
+    """Frequências combinadas de um confronto (probabilidades de 0 a 1)"""
+    over_05: float
+    over_15: float
+    over_25: float
+    over_35: float
+    over_45: float
+    over_55: float
+    btts: float
+    home_scores: float
+    away_scores: float
+    avg_goals: float
+    games: float
+
+
+# ----------------------------
+# TABELA POR LADO
+# ----------------------------
+def build_goal_line_store(side) -> GoalLineStore:
+    """``GoalLineStore`` do arquivo de ``side``; time repetido na mesma liga vale a primeira linha"""
+    source = GOAL_LINE_SOURCES[side]
+    names = list(FIELDS.values())
+    fields = dict(zip(names, range(len(names))))
+    df = get_dataset(source["key"])
+    if df.empty or any(column not in df.columns for column in [source["team"], *FIELDS]):
+        return GoalLineStore({}, fields, np.zeros((0, len(names)), dtype=np.float32), {})
+
+    frame = df.dropna(subset=[source["team"]])
+    teams = frame[source["team"]].astype("str")
+    league_column = DATASETS[source["key"]].league_column
+    if league_column in frame.columns:
+        raw = frame[league_column].astype("str")
+        leagues = raw.map(get_league_aliases(source["key"])).fillna(raw)
+    else:
+        leagues = pd.Series(None, index=frame.index, dtype=object)
+    unique = ~pd.DataFrame({"team": teams, "league": leagues}).duplicated().to_numpy()
+    frame, teams, leagues = frame[unique], teams[unique].tolist(), leagues[unique].tolist()
+
+    values = frame[list(FIELDS)].to_numpy(dtype=float)
+    percent = [names.index(name) for name in PERCENT_FIELDS]
+    values[:, percent] /= 100
+    first = {}
+    for row, team in enumerate(teams):
+        first.setdefault(team, row)
+    return GoalLineStore(first, fields, values.astype(np.float32), dict(zip(zip(teams, leagues), range(len(teams)))))
+
+
+# ----------------------------
+# CACHE POR VERSÃO DOS DADOS
+# ----------------------------
+_stores = {}
+_lock = threading.Lock()
+
+
+def _store_keys(side):
+    """Tabelas da ``GoalLineStore`` de ``side`` (o arquivo e os que dão a liga canônica)"""
+    return list(dict.fromkeys([GOAL_LINE_SOURCES[side]["key"]] + LEAGUE_KEYS))
+
+
+def get_goal_line_store(side) -> GoalLineStore:
+    """``build_goal_line_store(side)``, refeita só quando o arquivo do lado muda"""
+    keys = _store_keys(side)
+    load_datasets(keys)
+    version = data_version(keys)
+
+    cached = _stores.get(side)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    with _lock:
+        cached = _stores.get(side)
+        if cached is None or cached[0] != version:
+            cached = _stores[side] = (version, build_goal_line_store(side))
+    return cached[1]
+
+
+def _team_row(team, side, league=None):
+    """Linha de ``team`` no arquivo de ``side`` ou, sem ela, no geral (``None`` sem nenhuma)"""
+    for store in (get_goal_line_store(side), get_goal_line_store("overall")):
+        row = store.row(team, league)
+        if row is not None:
+            return store.values[row]
+    return None
+
+
+def team_goal_lines(teams, side, leagues=None) -> np.ndarray:
+    """Linhas de ``teams`` no arquivo de ``side`` (ou no geral): ``(n, campos)``, ``NaN`` sem o time
+
+    ``leagues`` (ligas canônicas, uma por time) escolhe a linha do time na liga do jogo.
+    """
+    stores = (get_goal_line_store(side), get_goal_line_store("overall"))
+    leagues = [None] * len(teams) if leagues is None else leagues
+    values = np.full((len(teams), len(FIELDS)), np.nan)
+    for index, (team, league) in enumerate(zip(teams, leagues)):
+        for store in stores:
+            row = store.row(team, league)
+            if row is not None:
+                values[index] = store.values[row]
+                break
+    return values
+
+
+def goal_lines(home_team, away_team, league=None):
+    """``GoalLines`` do confronto (na liga ``league``, se dada), ou ``None`` se algum time não está nos arquivos"""
+    home = _team_row(home_team, "home", league)
+    away = _team_row(away_team, "away", league)
+    if home is None or away is None:
+        return None
+
+    fields = get_goal_line_store("home").fields
+    match = (home.astype(float) + away) / 2
+
+    def value(name):
+        return float(match[fields[name]])
+
+    return GoalLines(
+        *(value(f"over_{str(line).replace('.', '')}") for line in GOAL_LINES),
+        value("btts"),
+        # Casa marca: o mandante não passa em branco e o visitante não segura o zero
+        1.0 - (float(home[fields["failed_to_score"]]) + float(away[fields["clean_sheet"]])) / 2,
+        1.0 - (float(away[fields["failed_to_score"]]) + float(home[fields["clean_sheet"]])) / 2,
+        value("avg_goals"),
+        float(min(home[fields["games"]], away[fields["games"]]))
+    )
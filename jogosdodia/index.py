@@ -0,0 +1,38 @@
+"""Índices por time construídos uma vez, no carregamento de cada tabela.
+
+Substituem os filtros ``df[df['Team_Home'] == time]``, que varrem a coluna
+inteira a cada renderização, por uma consulta de dicionário.
+"""
+import numpy as np
+import pandas as pd
+
+
+def build_team_index(df, team_column):
+    """Mapeia cada time para as posições (``iloc``) das suas linhas em ``df``
+
+    Usa ``factorize`` + ``argsort`` em vez de ``groupby().indices``, que com
+    colunas de texto Arrow acessa o índice de grupos elemento a elemento.
+    """
+    if df.empty or team_column not in df.columns:
+        return {}
+    codes, teams = pd.factorize(df[team_column])
+    positions = np.argsort(codes, kind="stable")
+    positions = positions[codes[positions] >= 0]  # linhas sem time (NaN) ficam de fora
+    bounds = np.flatnonzero(np.diff(codes[positions])) + 1
+    return dict(zip(teams.tolist(), np.split(positions, bounds)))
+
+
+def rows_for(df, index, team):
+    """Linhas de ``team`` em ``df`` (DataFrame vazio se o time não existe)"""
+    positions = index.get(team)
+    if positions is None:
+        return df.iloc[0:0]
+    return df.iloc[positions]
+
+
+def rows_for_many(df, index, teams):
+    """Linhas de todos os ``teams``, na ordem original da tabela (como ``isin``)"""
+    found = [index[team] for team in teams if team in index]
+    if not found:
+        return df.iloc[0:0]
+    return df.iloc[np.unique(np.concatenate(found))]
@@ -0,0 +1,211 @@
+"""Motor de probabilidades ao longo do jogo a partir dos gols por faixa de 15 minutos.
+
+``Goals_Per_Time_Home/Away`` trazem, por time, gols marcados e sofridos em
+cada faixa (``0-15`` … ``76-90``). Cada faixa vira uma intensidade de
+Poisson constante (gols por minuto) para cada lado do jogo:
+
+    λ_casa[faixa] = (marcados_casa[faixa] / GP_casa + sofridos_fora[faixa] / GP_fora) / (2 · 15)
+
+e o simétrico para o visitante, com marcados do visitante (arquivo de fora)
+e sofridos do mandante (arquivo de casa). Os acréscimos contam dentro de
+``31-45`` e ``76-90``; o intervalo é o minuto 45.
+
+Os gols de cada time formam uma cadeia de Markov de nascimento puro: o
+estado é o número de gols e, entre dois minutos, a transição é uma matriz de
+incrementos de Poisson com a intensidade acumulada no trecho. A
+distribuição do placar num minuto qualquer, a partir de um placar e minuto
+iniciais, é o produto de um vetor de estado por essa matriz para cada time
+(os dois processos são independentes). O HT/FT cruza as diferenças de gols
+do primeiro tempo e do segundo.
+
+As intensidades por time ficam numa tabela por ``data_version``; uma
+consulta é só aritmética em vetores de 6 faixas e matrizes de
+``MAX_GOALS + 1`` estados.
+"""
+import functools
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .data import data_version, get_dataset, load_datasets
+from .schema import TIME_BANDS
+from .scoreline import poisson_pmf
+
+# Limites (minutos) das faixas de ``TIME_BANDS``
+BAND_EDGES = np.array([0, 15, 30, 45, 60, 75, 90], dtype=float)
+BAND_MINUTES = 15.0
+HALF_TIME = 45.0
+FULL_TIME = 90.0
+
+# Gols por time representados na cadeia (o último estado acumula "MAX_GOALS ou mais")
+MAX_GOALS = 10
+
+# Resultado (casa, empate, fora) nas linhas/colunas do HT/FT
+RESULTS = ("home", "draw", "away")
+
+INPLAY_SOURCES = {
+    "home": {"key": "goals_per_time_home_df", "team": "Team_Home"},
+    "away": {"key": "goals_per_time_away_df", "team": "Team_Away"}
+}
+
+
+# ----------------------------
+# INTENSIDADES POR TIME
+# ----------------------------
+def build_band_rates(side) -> pd.DataFrame:
+    """Por time de ``side``: gols marcados/sofridos por jogo em cada faixa
+
+    Colunas ``scored`` e ``conceded`` com um array de 6 faixas cada (médias por
+    jogo, não por minuto). Times sem ``GP`` válido ficam de fora; time repetido
+    (Apertura/Clausura) vale a primeira linha, como nos perfis.
+    """
+    source = INPLAY_SOURCES[side]
+    df = get_dataset(source["key"])
+    scored_columns = [f"{band}_Scored" for band in TIME_BANDS]
+    conceded_columns = [f"{band}_Conceded" for band in TIME_BANDS]
+    columns = [source["team"], "GP", *scored_columns, *conceded_columns]
+    if df.empty or any(column not in df.columns for column in columns):
+        return pd.DataFrame(columns=["scored", "conceded"])
+
+    frame = df[columns].drop_duplicates(source["team"])
+    games = frame["GP"].to_numpy(dtype=float)
+    valid = games > 0
+    games = games[valid, None]
+    scored = frame[scored_columns].to_numpy(dtype=float)[valid] / games
+    conceded = frame[conceded_columns].to_numpy(dtype=float)[valid] / games
+    valid_rows = ~(np.isnan(scored).any(axis=1) | np.isnan(conceded).any(axis=1))
+    teams = frame[source["team"]].astype("str").to_numpy()[valid][valid_rows]
+    return pd.DataFrame(
+        {"scored": list(scored[valid_rows]), "conceded": list(conceded[valid_rows])},
+        index=pd.Index(teams, name="team")
+    )
+
+
+# ----------------------------
+# CADEIA DE MARKOV
+# ----------------------------
+def band_exposure(start, end):
+    """Minutos de cada faixa dentro de ``[start, end)`` (array de 6)"""
+    return np.clip(np.minimum(end, BAND_EDGES[1:]) - np.maximum(start, BAND_EDGES[:-1]), 0.0, None)
+
+
+@functools.lru_cache(maxsize=4)
+def _increments(max_goals):
+    states = np.arange(max_goals + 1)
+    return states[None, :] - states[:, None]
+
+
+def transition_matrix(mu, max_goals=MAX_GOALS):
+    """P(gols no fim = j | gols no início = i) para ``mu`` gols esperados no trecho
+
+    Incrementos de Poisson; o último estado é absorvente e recebe a cauda.
+    """
+    pmf = poisson_pmf(mu, max_goals)
+    increments = _increments(max_goals)
+    matrix = np.where(increments >= 0, pmf[np.clip(increments, 0, max_goals)], 0.0)
+    matrix[:, -1] = 1.0 - matrix[:, :-1].sum(axis=1)
+    return matrix
+
+
+def _state(goals, max_goals):
+    state = np.zeros(max_goals + 1)
+    state[min(int(goals), max_goals)] = 1.0
+    return state
+
+
+def _goal_difference(home, away):
+    """P(diferença casa - fora = d), com ``d`` de ``-n`` a ``n`` (índice ``d + n``)"""
+    return np.convolve(home, away[::-1])
+
+
+def _result(difference):
+    """0 vitória da casa, 1 empate, 2 vitória de fora"""
+    return np.where(difference > 0, 0, np.where(difference == 0, 1, 2))
+
+
+@functools.lru_cache(maxsize=4)
+def _ht_ft_cells(size):
+    """Célula (``3 · intervalo + final``) de cada par de diferenças (1º tempo, 2º tempo)"""
+    offset = (size - 1) // 2
+    first = np.arange(size)[:, None] - offset
+    total = first + (np.arange(size)[None, :] - offset)
+    return (3 * _result(first) + _result(total)).ravel()
+
+
+class InPlayEngine:
+    """Distribuição do placar em qualquer minuto para um confronto
+
+    ``home_rates``/``away_rates`` são as intensidades (gols por minuto) de cada
+    faixa para o mandante e o visitante.
+    """
+
+    def __init__(self, home_rates, away_rates, max_goals=MAX_GOALS):
+        self.home_rates = np.asarray(home_rates, dtype=float)
+        self.away_rates = np.asarray(away_rates, dtype=float)
+        self.max_goals = max_goals
+
+    def expected_goals(self, start=0.0, end=FULL_TIME):
+        """Gols esperados ``(casa, fora)`` entre os minutos ``start`` e ``end``"""
+        exposure = band_exposure(start, end)
+        return float(self.home_rates @ exposure), float(self.away_rates @ exposure)
+
+    def score_distribution(self, minute, start=0.0, score=(0, 0)):
+        """Matriz ``[gols_casa, gols_fora]`` no minuto ``minute``, partindo de ``score`` em ``start``"""
+        mu_home, mu_away = self.expected_goals(start, minute)
+        home = _state(score[0], self.max_goals) @ transition_matrix(mu_home, self.max_goals)
+        away = _state(score[1], self.max_goals) @ transition_matrix(mu_away, self.max_goals)
+        return home[:, None] * away[None, :]
+
+    def prob_goal(self, end, start=0.0, side=None):
+        """P(ao menos um gol entre ``start`` e ``end``); ``side`` "home"/"away" restringe a um time"""
+        mu_home, mu_away = self.expected_goals(start, end)
+        mu = {"home": mu_home, "away": mu_away, None: mu_home + mu_away}[side]
+        return 1.0 - float(np.exp(-mu))
+
+    def prob_score(self, minute, home_goals, away_goals, start=0.0, score=(0, 0)):
+        """P(placar ``home_goals`` x ``away_goals`` no minuto ``minute``)"""
+        return float(self.score_distribution(minute, start, score)[home_goals, away_goals])
+
+    def ht_ft(self):
+        """Matriz 3x3 HT/FT: linha = resultado no intervalo, coluna = final (ordem ``RESULTS``)"""
+        first = [poisson_pmf(mu, self.max_goals) for mu in self.expected_goals(0.0, HALF_TIME)]
+        second = [poisson_pmf(mu, self.max_goals) for mu in self.expected_goals(HALF_TIME, FULL_TIME)]
+        joint = np.outer(_goal_difference(*first), _goal_difference(*second))
+        cells = _ht_ft_cells(joint.shape[0])
+        return np.bincount(cells, weights=joint.ravel(), minlength=9).reshape(3, 3)
+
+
+# ----------------------------
+# CACHE POR VERSÃO DOS DADOS
+# ----------------------------
+_rates = {}
+_lock = threading.Lock()
+
+
+def get_band_rates(side) -> pd.DataFrame:
+    """Tabela de ``build_band_rates(side)``, refeita só quando o arquivo de gols por faixa muda"""
+    key = INPLAY_SOURCES[side]["key"]
+    load_datasets([key])
+    version = data_version([key])
+
+    cached = _rates.get(side)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    with _lock:
+        cached = _rates.get(side)
+        if cached is None or cached[0] != version:
+            cached = _rates[side] = (version, build_band_rates(side))
+    return cached[1]
+
+
+def match_engine(home_team, away_team, max_goals=MAX_GOALS):
+    """``InPlayEngine`` do confronto, ou ``None`` se algum time não tem gols por faixa"""
+    home = get_band_rates("home")
+    away = get_band_rates("away")
+    if home_team not in home.index or away_team not in away.index:
+        return None
+    home_rates = (home.at[home_team, "scored"] + away.at[away_team, "conceded"]) / (2 * BAND_MINUTES)
+    away_rates = (away.at[away_team, "scored"] + home.at[home_team, "conceded"]) / (2 * BAND_MINUTES)
+    return InPlayEngine(home_rates, away_rates, max_goals)
@@ -0,0 +1,306 @@
+"""Agregados por liga e a força de cada time relativa à própria liga.
+
+As regras das abas de análise comparam PPG, gols e ranking com limites fixos
+(1.8, 1.2, 5 posições), iguais para todas as ligas. ``get_league_table()``
+resume cada ``Liga`` dos arquivos principais (média e desvio de PPG e gols
+como mandante e visitante, vantagem do mandante, times no ranking) e
+``get_league_zscores(side)`` dá, por time, o z-score dessas métricas na liga.
+
+As duas tabelas são calculadas com um ``groupby`` por arquivo e guardadas
+por ``data_version``: os apps só consultam linhas prontas.
+
+Os nomes de liga canônicos são os da coluna ``Liga`` dos arquivos
+principais. As demais tabelas e o feed do FootyStats escrevem a mesma liga
+de outro jeito (``england2``, ``Spain - La Liga``, ``ENGLAND 1``);
+``get_league_aliases(key)`` liga cada nome de uma tabela ao canônico pelo
+nome idêntico, pelos times em comum com os arquivos principais ou pelo
+código país + divisão (``league_from_code``, tabela ``LEAGUE_TIERS``).
+"""
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .data import DATASETS, data_version, get_dataset, load_datasets
+
+# Ranking ausente nos CSVs principais
+INVALID_RANK = 999
+
+# Tabela e colunas de cada lado; as métricas viram ``<métrica>_<lado>`` na tabela de ligas
+LEAGUE_SOURCES = {
+    "home": {
+        "key": "home_df",
+        "team": "Team_Home",
+        "columns": {"ppg": "PPG_Home", "gf": "GF_AVG_Home", "ga": "GA_AVG_Home", "rank": "Rank_Home"}
+    },
+    "away": {
+        "key": "away_df",
+        "team": "Team_Away",
+        "columns": {"ppg": "PPG_Away", "gf": "GF_AVG_Away", "ga": "GA_AVG_Away", "rank": "Rank_Away"}
+    }
+}
+
+LEAGUE_COLUMN = "Liga"
+METRICS = ["ppg", "gf", "ga"]
+
+# Arquivos com os nomes canônicos de liga (coluna ``Liga``)
+LEAGUE_KEYS = ["home_df", "away_df", "overall_df"]
+
+# Fração mínima dos times de uma liga de outra tabela que precisa cair na mesma liga canônica
+MIN_TEAM_OVERLAP = 0.5
+
+# País -> ligas canônicas por divisão (1ª, 2ª, ...), para os países com nome
+# "País - Liga" nos arquivos principais. Os demais usam o código do
+# soccerstats (``norway``, ``norway2``, ...), resolvido sem tabela. Ligas
+# divididas em Apertura/Clausura ficam de fora: o código não diz a fase.
+# "Premier League" reúne a Premier League e a Championship.
+LEAGUE_TIERS = {
+    "albania": ("Albania - Abissnet Superiore",),
+    "argentina": ("Argentina - Liga Profesional", "Argentina - Primera Nacional", "Argentina - Primera B"),
+    "armenia": ("Armenia - Premier League",),
+    "australia": ("Australia - A-League",),
+    "austria": ("Austria - Bundesliga", "Austria - 2. Liga"),
+    "azerbaijan": ("Azerbaijan - Premier League",),
+    "bahrain": ("Bahrain - Premier League",),
+    "bangladesh": ("Bangladesh - Premier League",),
+    "belarus": ("Belarus - Vysshaya Liga", "Belarus - First League"),
+    "belgium": ("Belgium - Pro League", "Belgium - Challenger Pro League"),
+    "bolivia": ("Bolivia - Primera Div. - Apertura",),
+    "brazil": ("Brazil - Serie A", "Brazil - Serie B", "Brazil - Serie C", "Brazil - Serie D"),
+    "bulgaria": ("Bulgaria - Parva Liga",),
+    "canada": ("Canada - Premier League",),
+    "chile": ("Chile - Primera Division", "Chile - Primera B"),
+    "china": ("China - Super League", "China - League One", "China - League Two"),
+    "costarica": ("Costa Rica - Primera Div. - Apertura",),
+    "czechrepublic": ("CzechRepublic - 1. Liga",),
+    "denmark": ("Denmark - Superligaen", "Denmark - 1st Division", "Denmark - 2nd Division"),
+    "ecuador": ("Ecuador - Liga Pro 1st Stage",),
+    "egypt": ("Egypt - Premier League",),
+    "england": ("Premier League", "Premier League", "League One", "League Two", "England - National League"),
+    "estonia": ("Estonia - Meistriliiga", "Estonia - Esiliiga"),
+    "faroeislands": ("FaroeIslands - Premier League", "FaroeIslands - 1. Deild"),
+    "finland": ("Finland - Veikkausliiga", "Finland - Ykkosliga", "Finland - Ykkonen"),
+    "france": ("France - Ligue 1", "France - Ligue 2", "France - National"),
+    "georgia": ("Georgia - Erovnuli Liga", "Georgia - Erovnuli Liga 2"),
+    "germany": ("Germany - Bundesliga", "Germany - 2. Bundesliga", "Germany - 3. Liga"),
+    "ghana": ("Ghana - Premier League",),
+    "gibraltar": ("Gibraltar - Premier Division",),
+    "greece": ("Greece - Super League",),
+    "hongkong": ("Hong Kong - Premier League",),
+    "hungary": ("Hungary - NB I", "Hungary - NB II"),
+    "iceland": ("Iceland - Besta deild", "Iceland - 1. Deild", "Iceland - 2. Deild"),
+    "india": ("India - Super League", "India - I-League"),
+    "indonesia": ("Indonesia - Liga 1",),
+    "iran": ("Iran - Pro League",),
+    "ireland": ("Ireland - Premier Division", "Ireland - First Division"),
+    "israel": ("Israel - Ligat HaAl", "Israel - Leumit League"),
+    "italy": ("Italy - Serie A", "Italy - Serie B"),
+    "jamaica": ("Jamaica - Premier League",),
+    "japan": ("Japan - J1 League", "Japan - J2 League", "Japan - J3 League"),
+    "jordan": ("Jordan - Premier League",),
+    "kazakhstan": ("Kazakhstan - Premier League",),
+    "kosovo": ("Kosovo - Superliga",),
+    "kuwait": ("Kuwait - Premier League",),
+    "latvia": ("Latvia - Virsliga",),
+    "lithuania": ("Lithuania - A Lyga", "Lithuania - 1st League"),
+    "luxembourg": ("Luxembourg - National Division",),
+    "malaysia": ("Malaysia - Super League",),
+    "malta": ("Malta - Premier League",),
+    "montenegro": ("Montenegro - First League",)
+}
+
+# "ENGLAND 1", "england2", "spain": país e divisão opcional no fim
+_LEAGUE_CODE = re.compile(r"([^\W\d_][^\d]*?)\s*(\d+)?")
+
+
+def _side_frame(side):
+    """Linhas de ``side`` com as colunas renomeadas para ``league``, ``team`` e as métricas"""
+    source = LEAGUE_SOURCES[side]
+    df = get_dataset(source["key"])
+    columns = {LEAGUE_COLUMN: "league", source["team"]: "team", **{v: k for k, v in source["columns"].items()}}
+    if df.empty or any(column not in df.columns for column in columns):
+        return pd.DataFrame(columns=list(columns.values()))
+    frame = df[list(columns)].rename(columns=columns)
+    frame["league"] = frame["league"].astype("str")
+    frame["rank"] = frame["rank"].where(frame["rank"] != INVALID_RANK)
+    return frame.dropna(subset=["league"])
+
+
+def build_league_table() -> pd.DataFrame:
+    """Uma linha por liga: média/desvio das métricas por lado, vantagem do mandante, times"""
+    parts = []
+    for side in LEAGUE_SOURCES:
+        frame = _side_frame(side)
+        if frame.empty:
+            continue
+        stats = frame.groupby("league", sort=True).agg(
+            **{f"{metric}_{side}_{func}": (metric, func) for metric in METRICS for func in ("mean", "std")},
+            **{f"teams_{side}": ("team", "nunique"), f"ranked_{side}": ("rank", "count")}
+        )
+        parts.append(stats)
+    if not parts:
+        return pd.DataFrame()
+
+    table = pd.concat(parts, axis=1, join="outer")
+    table.index.name = "league"
+    if "ppg_home_mean" in table and "ppg_away_mean" in table:
+        table["home_advantage"] = table["ppg_home_mean"] - table["ppg_away_mean"]
+        table["goal_home_advantage"] = table["gf_home_mean"] - table["gf_away_mean"]
+    return table
+
+
+def build_league_zscores(side) -> pd.DataFrame:
+    """Por time de ``side``: liga, z-score de PPG/gols na liga e posição relativa no ranking
+
+    ``rank_pct`` vai de 0 (líder) a 1 (último); z-scores ficam ``NaN`` em ligas
+    com um único time ou sem variação.
+    """
+    frame = _side_frame(side)
+    if frame.empty:
+        return pd.DataFrame()
+
+    groups = frame.groupby("league", sort=False)
+    zscores = pd.DataFrame({"team": frame["team"].astype("str"), "league": frame["league"]})
+    for metric in METRICS:
+        mean = groups[metric].transform("mean")
+        std = groups[metric].transform("std").replace(0, np.nan)
+        zscores[f"{metric}_z"] = (frame[metric] - mean) / std
+    last = groups["rank"].transform("max")
+    zscores["rank_pct"] = (frame["rank"] - 1) / (last - 1).where(last > 1)
+    # Time repetido na tabela (ex.: Apertura/Clausura): vale a primeira linha, como nos perfis
+    return zscores.drop_duplicates("team").set_index("team")
+
+
+# ----------------------------
+# CACHE POR VERSÃO DOS DADOS
+# ----------------------------
+_tables = {}
+_lock = threading.Lock()
+
+
+def _cached(name, build, keys=None):
+    keys = keys or [source["key"] for source in LEAGUE_SOURCES.values()]
+    load_datasets(keys)
+    version = data_version(keys)
+
+    cached = _tables.get(name)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    with _lock:
+        cached = _tables.get(name)
+        if cached is None or cached[0] != version:
+            cached = _tables[name] = (version, build())
+    return cached[1]
+
+
+def get_league_table() -> pd.DataFrame:
+    """Tabela de agregados por liga, recalculada só quando os arquivos principais mudam"""
+    return _cached("leagues", build_league_table)
+
+
+def get_league_zscores(side) -> pd.DataFrame:
+    """Z-scores por time de ``side`` ("home" ou "away"), em cache por versão dos dados"""
+    return _cached(f"zscores_{side}", lambda: build_league_zscores(side))
+
+
+def league_context(team, side):
+    """Z-scores de ``team`` e os agregados da sua liga (``None`` se o time não aparece)
+
+    Retorna ``(linha de z-scores, linha da liga)``; a linha da liga pode ser ``None``.
+    """
+    zscores = get_league_zscores(side)
+    if zscores.empty or team not in zscores.index:
+        return None
+    row = zscores.loc[team]
+    table = get_league_table()
+    league = table.loc[row["league"]] if row["league"] in table.index else None
+    return row, league
+
+
+# ----------------------------
+# NOMES CANÔNICOS
+# ----------------------------
+def league_names():
+    """Nomes canônicos de liga: coluna ``Liga`` dos arquivos principais"""
+    leagues = set()
+    for key in LEAGUE_KEYS:
+        df = get_dataset(key)
+        column = DATASETS[key].league_column
+        if column in df.columns:
+            leagues.update(df[column].dropna().astype("str"))
+    return sorted(leagues)
+
+
+def _country(text):
+    return re.sub(r"[^a-z]", "", text.casefold())
+
+
+def league_from_code(code, leagues=()):
+    """Liga canônica de um código país + divisão (``None`` se o código não está na tabela)
+
+    ``ENGLAND 2`` e ``england2`` usam ``LEAGUE_TIERS``; sem o país na tabela, o
+    código do soccerstats (``norway``, ``norway2``) é usado. Nos dois casos a
+    liga só é aceita se estiver em ``leagues``: um nome errado na tabela cai
+    para o fuzzy em vez de virar alias.
+    """
+    match = _LEAGUE_CODE.fullmatch(str(code).strip())
+    if match is None:
+        return None
+    country = _country(match.group(1))
+    tier = int(match.group(2) or 1)
+    if country in LEAGUE_TIERS:
+        tiers = LEAGUE_TIERS[country]
+        league = tiers[tier - 1] if 1 <= tier <= len(tiers) else None
+    else:
+        league = country if tier == 1 else f"{country}{tier}"
+    return league if league in leagues else None
+
+
+def _canonical_pairs():
+    """Pares (time, liga canônica) dos arquivos principais"""
+    frames = []
+    for key in LEAGUE_KEYS:
+        dataset = DATASETS[key]
+        df = get_dataset(key)
+        if dataset.team_column in df.columns and dataset.league_column in df.columns:
+            frames.append(df[[dataset.team_column, dataset.league_column]].set_axis(["team", "canonical"], axis=1))
+    if not frames:
+        return pd.DataFrame(columns=["team", "canonical"])
+    return pd.concat(frames).dropna().astype("str").drop_duplicates()
+
+
+def build_league_aliases(key) -> dict:
+    """Liga de ``key`` -> liga canônica (``None`` sem correspondência)
+
+    Nome idêntico; senão a liga canônica que reúne ao menos ``MIN_TEAM_OVERLAP``
+    dos times da liga (e mais que qualquer outra); senão o código país + divisão.
+    """
+    dataset = DATASETS[key]
+    df = get_dataset(key)
+    if df.empty or dataset.league_column not in df.columns:
+        return {}
+    leagues = set(league_names())
+    names = df[dataset.league_column].dropna().astype("str").unique().tolist()
+
+    votes = {}
+    if dataset.team_column in df.columns:
+        pairs = df[[dataset.team_column, dataset.league_column]].dropna().astype("str").drop_duplicates()
+        pairs = pairs.set_axis(["team", "league"], axis=1)
+        teams = pairs.groupby("league")["team"].nunique()
+        counts = pairs.merge(_canonical_pairs(), on="team").groupby(["league", "canonical"]).size()
+        for league, group in counts.groupby(level="league"):
+            best = group.max()
+            if (group == best).sum() == 1 and best >= MIN_TEAM_OVERLAP * teams[league]:
+                votes[league] = group.idxmax()[1]
+
+    return {
+        name: name if name in leagues else votes.get(name) or league_from_code(name, leagues)
+        for name in names
+    }
+
+
+def get_league_aliases(key) -> dict:
+    """``build_league_aliases(key)``, refeito só quando ``key`` ou os arquivos principais mudam"""
+    return _cached(f"aliases_{key}", lambda: build_league_aliases(key), list(dict.fromkeys(LEAGUE_KEYS + [key])))
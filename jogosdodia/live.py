@@ -0,0 +1,241 @@
+"""Probabilidades ao vivo, condicionadas ao minuto e ao placar atual.
+
+Para cada confronto, ``LiveMatch`` calcula uma vez, minuto a minuto (0 a
+90), os gols esperados no tempo restante e as tabelas de resultado final
+por diferença de gols atual, gols restantes e "ainda marca". Uma consulta
+``probabilities(minuto, gols_casa, gols_fora)`` só indexa essas tabelas,
+então dá para consultar dezenas de jogos a cada atualização.
+
+As intensidades por faixa de 15 minutos de cada time vêm dos perfis:
+
+- ``Goals_Per_Time_*`` (``gpt_``): gols marcados/sofridos por jogo em cada faixa;
+- sem faixas, a média de gols do arquivo principal (``ft_GF_AVG_*``,
+  ``ft_GA_AVG_*``) distribuída numa densidade linear no tempo com o minuto
+  médio dos gols de ``momento_do_gol_*`` (``gm_AVG_min_*``), ou uniforme sem
+  ele.
+
+O confronto combina as intensidades como ``inplay.match_engine``: média dos
+gols marcados de um lado com os sofridos do outro.
+"""
+import threading
+from collections import OrderedDict
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from .data import data_version, load_datasets
+from .inplay import BAND_EDGES, BAND_MINUTES, FULL_TIME, InPlayEngine, MAX_GOALS
+from .profile import get_team_profiles, source_keys
+from .schema import TIME_BANDS
+from .scoreline import poisson_pmf
+
+# Linhas de over/under (gols no jogo todo) devolvidas em cada consulta
+LIVE_LINES = (0.5, 1.5, 2.5, 3.5)
+
+# Minuto médio do gol fora de [30, 60] não cabe numa densidade linear positiva em [0, 90]
+_MAX_SLOPE = 1 / 45
+
+# Confrontos guardados em memória (cerca de 1 MB cada); os menos consultados saem primeiro
+MAX_MATCHES = 64
+_BAND_CENTERS = (BAND_EDGES[:-1] + BAND_EDGES[1:]) / 2 - FULL_TIME / 2
+
+
+class LiveProbabilities(NamedTuple):
+    """Probabilidades do jogo todo dado o minuto e o placar atuais"""
+    home: float
+    draw: float
+    away: float
+    over_05: float
+    over_15: float
+    over_25: float
+    over_35: float
+    btts: float
+    home_goal: float
+    away_goal: float
+    expected_home: float
+    expected_away: float
+
+
+# ----------------------------
+# INTENSIDADES POR TIME
+# ----------------------------
+def minute_shape(avg_minute):
+    """Peso de cada faixa de 15 minutos numa densidade linear com média ``avg_minute``
+
+    Densidade ``(1 + b·(t - 45)) / 90`` em [0, 90], com média ``45 + 675·b``;
+    ``NaN`` vira a distribuição uniforme. Retorna ``(n, 6)``, linhas somando 1.
+    """
+    slope = (np.asarray(avg_minute, dtype=float) - FULL_TIME / 2) / 675
+    slope = np.clip(np.nan_to_num(slope, nan=0.0), -_MAX_SLOPE, _MAX_SLOPE)
+    return (1 + slope[:, None] * _BAND_CENTERS) / len(TIME_BANDS)
+
+
+def _values(frame, column):
+    """Coluna ``column`` como array de float (``NaN`` se a coluna não existe)"""
+    if column not in frame:
+        return np.full(len(frame), np.nan)
+    return frame[column].to_numpy(dtype=float)
+
+
+def build_live_rates(side) -> pd.DataFrame:
+    """Por time de ``side``: gols marcados/sofridos por jogo em cada faixa e a fonte
+
+    ``source`` é ``"bands"`` (Goals_Per_Time), ``"minute"`` (média de gols com o
+    minuto médio) ou ``"average"`` (média de gols, uniforme no tempo).
+    """
+    profiles = get_team_profiles(side)
+    suffix = "Home" if side == "home" else "Away"
+    columns = [f"ft_GF_AVG_{suffix}", f"ft_GA_AVG_{suffix}"]
+    if profiles.empty or any(column not in profiles.columns for column in columns):
+        return pd.DataFrame(columns=["scored", "conceded", "source"])
+
+    avg_scored = _values(profiles, "gm_AVG_min_scored")
+    avg_conceded = _values(profiles, "gm_AVG_min_conceded")
+    scored = _values(profiles, columns[0])[:, None] * minute_shape(avg_scored)
+    conceded = _values(profiles, columns[1])[:, None] * minute_shape(avg_conceded)
+    timed = ~(np.isnan(avg_scored) & np.isnan(avg_conceded))
+    source = np.where(timed, "minute", "average").astype(object)
+
+    band_columns = [f"gpt_{band}_{kind}" for kind in ("Scored", "Conceded") for band in TIME_BANDS]
+    if "gpt_GP" in profiles and all(column in profiles for column in band_columns):
+        games = profiles["gpt_GP"].to_numpy(dtype=float)
+        bands = profiles[band_columns].to_numpy(dtype=float)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            bands = bands / games[:, None]
+        banded = (games > 0) & ~np.isnan(bands).any(axis=1)
+        scored[banded] = bands[banded, :len(TIME_BANDS)]
+        conceded[banded] = bands[banded, len(TIME_BANDS):]
+        source[banded] = "bands"
+
+    valid = ~(np.isnan(scored).any(axis=1) | np.isnan(conceded).any(axis=1))
+    return pd.DataFrame(
+        {"scored": list(scored[valid]), "conceded": list(conceded[valid]), "source": source[valid]},
+        index=pd.Index(profiles.index[valid].astype("str"), name="team")
+    )
+
+
+# ----------------------------
+# TABELAS DO CONFRONTO
+# ----------------------------
+class LiveMatch:
+    """Tabelas por minuto de um confronto; ``probabilities`` é só indexação"""
+
+    def __init__(self, engine, max_goals=MAX_GOALS):
+        self.engine = engine
+        self.max_goals = max_goals
+        goals = max_goals + 1
+        minutes = np.arange(int(FULL_TIME) + 1, dtype=float)[:, None]
+
+        # Minutos restantes de cada faixa a partir de cada minuto (91 x 6)
+        exposure = np.clip(np.minimum(FULL_TIME, BAND_EDGES[1:]) - np.maximum(minutes, BAND_EDGES[:-1]), 0.0, None)
+        mu_home = exposure @ engine.home_rates
+        mu_away = exposure @ engine.away_rates
+
+        # P(diferença dos gols restantes = e), e de -max_goals a max_goals, por minuto
+        home = poisson_pmf(mu_home, max_goals)
+        away = poisson_pmf(mu_away, max_goals)
+        joint = (home[:, :, None] * away[:, None, :]).reshape(len(mu_home), -1)
+        states = np.arange(goals)
+        difference = (states[:, None] - states[None, :] + max_goals).ravel()
+        difference = joint @ np.eye(2 * max_goals + 1)[difference]
+        below = np.cumsum(difference, axis=1) - difference
+
+        # Resultado final por diferença atual d (índice d + max_goals): precisa de e > -d, e = -d, e < -d
+        flip = np.arange(2 * max_goals, -1, -1)
+        exact = difference[:, flip]
+        results = np.stack([1.0 - below[:, flip] - exact, exact, below[:, flip]], axis=-1)
+        self._results = results.tolist()
+
+        # P(gols restantes no jogo >= k), k de 0 a max_goals + 1
+        total = poisson_pmf(mu_home + mu_away, max_goals)
+        survival = 1.0 - np.concatenate([np.zeros((len(total), 1)), np.cumsum(total, axis=1)], axis=1)
+        survival[:, 0] = 1.0
+        self._survival = np.clip(survival, 0.0, 1.0).tolist()
+        self._scores = np.stack([1.0 - np.exp(-mu_home), 1.0 - np.exp(-mu_away), mu_home, mu_away], axis=1).tolist()
+
+    def probabilities(self, minute, home_goals=0, away_goals=0) -> LiveProbabilities:
+        """Probabilidades do jogo todo no minuto ``minute`` com o placar ``home_goals`` x ``away_goals``
+
+        Minutos fracionários contam pelo minuto inteiro; acréscimos (> 90) valem 90.
+        """
+        minute = min(max(int(minute), 0), int(FULL_TIME))
+        difference = min(max(home_goals - away_goals, -self.max_goals), self.max_goals)
+        home, draw, away = self._results[minute][difference + self.max_goals]
+
+        survival = self._survival[minute]
+        goals = home_goals + away_goals
+        overs = [
+            1.0 if needed <= 0 else survival[min(needed, self.max_goals + 1)]
+            for needed in (int(line) + 1 - goals for line in LIVE_LINES)
+        ]
+        home_goal, away_goal, expected_home, expected_away = self._scores[minute]
+        btts = (1.0 if home_goals else home_goal) * (1.0 if away_goals else away_goal)
+        return LiveProbabilities(
+            home, draw, away, *overs, btts, home_goal, away_goal, expected_home, expected_away
+        )
+
+
+# ----------------------------
+# CACHE POR VERSÃO DOS DADOS
+# ----------------------------
+_rates = {}
+_matches = OrderedDict()
+_lock = threading.Lock()
+
+
+def get_live_rates(side) -> pd.DataFrame:
+    """Tabela de ``build_live_rates(side)``, refeita só quando algum CSV dos perfis muda"""
+    keys = source_keys()
+    load_datasets(keys)
+    version = data_version(keys)
+
+    cached = _rates.get(side)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    with _lock:
+        cached = _rates.get(side)
+        if cached is None or cached[0] != version:
+            cached = _rates[side] = (version, build_live_rates(side))
+    return cached[1]
+
+
+def live_match(home_team, away_team, max_goals=MAX_GOALS):
+    """``LiveMatch`` do confronto, ou ``None`` sem um dos times
+
+    Fica em cache por versão dos dados, com no máximo ``MAX_MATCHES``
+    confrontos (LRU): confrontos de uma versão antiga nunca mais são
+    consultados e saem conforme entram os novos.
+    """
+    keys = source_keys()
+    load_datasets(keys)
+    key = (home_team, away_team, max_goals, data_version(keys))
+
+    with _lock:
+        match = _matches.get(key)
+        if match is not None:
+            _matches.move_to_end(key)
+            return match
+
+    home = get_live_rates("home")
+    away = get_live_rates("away")
+    if home_team not in home.index or away_team not in away.index:
+        return None
+
+    home_rates = (home.at[home_team, "scored"] + away.at[away_team, "conceded"]) / (2 * BAND_MINUTES)
+    away_rates = (away.at[away_team, "scored"] + home.at[home_team, "conceded"]) / (2 * BAND_MINUTES)
+    match = LiveMatch(InPlayEngine(home_rates, away_rates, max_goals), max_goals)
+    with _lock:
+        _matches[key] = match
+        while len(_matches) > MAX_MATCHES:
+            _matches.popitem(last=False)
+    return match
+
+
+def live_probabilities(home_team, away_team, minute, home_goals=0, away_goals=0):
+    """``LiveProbabilities`` do confronto no minuto e placar dados (``None`` sem um dos times)"""
+    match = live_match(home_team, away_team)
+    if match is None:
+        return None
+    return match.probabilities(minute, home_goals, away_goals)
@@ -0,0 +1,289 @@
+"""Resolução de nomes de times e ligas entre fontes diferentes.
+
+Os CSVs e o feed do FootyStats nem sempre escrevem o mesmo nome do mesmo
+jeito (espaços sobrando, caixa, acentos, abreviações). O ``NameResolver``
+liga cada nome recebido a um nome canônico (os times das tabelas de perfil,
+as ligas dos arquivos principais):
+
+1. aliases já resolvidos (tabela persistida em disco) — consulta de dicionário;
+2. nome normalizado idêntico (caixa, acentos, pontuação e espaços);
+3. uma regra própria do tipo de nome (ligas: código país + divisão do
+   FootyStats, ``leagues.league_from_code``);
+4. os nomes restantes, todos de uma vez, com ``rapidfuzz.process.cdist``.
+
+Só os nomes novos passam pelos passos 2 a 4; o resultado é gravado em
+``aliases.json`` dentro de ``CACHE_DIR`` e reaproveitado nas próximas
+execuções.
+
+Times com a liga conhecida (``resolve_league_teams``) são procurados só
+entre os times daquela liga, com um resolvedor (e aliases) por liga; o
+fuzzy contra a lista inteira de times, bem mais sujeito a confundir nomes
+parecidos de países diferentes, exige uma pontuação maior.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import unicodedata
+
+import numpy as np
+from rapidfuzz import fuzz, process
+
+from .data import CACHE_DIR, data_version
+from .leagues import LEAGUE_KEYS, league_from_code, league_names
+from .profile import PROFILE_SOURCES, get_league_profiles, get_team_profiles, source_keys
+
+logger = logging.getLogger(__name__)
+
+ALIAS_FILE = os.path.join(CACHE_DIR, "aliases.json")
+
+# Versão do formato de aliases.json; tabelas de outra versão são descartadas
+ALIAS_FORMAT = 3
+
+# Pontuação mínima (0-100) do token_sort_ratio para aceitar um nome parecido
+# entre todos os nomes ("Internazionale" x "Internacional" dá 88.9) ...
+SCORE_CUTOFF = 92
+# ... e entre os times de uma única liga
+LEAGUE_SCORE_CUTOFF = 88
+
+# Marcadores de equipes B/sub-XX/femininas: dois nomes só casam se tiverem os mesmos
+MARKERS = {"b", "c", "ii", "iii", "u17", "u18", "u19", "u20", "u21", "u22", "u23", "w", "women", "fem", "res", "reserves"}
+
+# Aliases fixos (não são sobrescritos pelo fuzzy); antes ficavam em rename_leagues no
+# app.py, agora com os nomes da coluna ``Liga`` dos arquivos principais
+SEED_ALIASES = {
+    "leagues": {
+        "SWITZERLAND 1": "switzerland",
+        "SPAIN 1": "spain",
+        "ENGLAND 3": "League One",
+        "SERBIA 1": "serbia",
+        "TURKEY 1": "turkey",
+        "PARAGUAY 1": "paraguay",
+        "POLAND 1": "poland",
+        "SCOTLAND 1": "scotland",
+        "NETHERLANDS 1": "netherlands",
+        "ITALY 2": "Italy - Serie B"
+    }
+}
+
+
+# Todos os resolvedores (times, ligas, times de cada liga) gravam no mesmo
+# aliases.json: leitura, mescla e troca do arquivo ficam sob uma única trava
+_file_lock = threading.Lock()
+
+
+def normalize_name(name):
+    """``" Atlético-MG "`` -> ``"atletico mg"``"""
+    text = unicodedata.normalize("NFKD", str(name))
+    text = "".join(c for c in text if not unicodedata.combining(c)).casefold()
+    return " ".join(re.sub(r"[^\w]+", " ", text).split())
+
+
+def _markers(normalized):
+    return MARKERS.intersection(normalized.split())
+
+
+def _fingerprint(choices):
+    return hashlib.sha1("\n".join(sorted(choices)).encode("utf-8")).hexdigest()[:16]
+
+
+class NameResolver:
+    """Liga nomes de ``kind`` ("teams", "teams/<liga>" ou "leagues") a uma lista de nomes canônicos
+
+    ``rule(nome, canônicos)`` é tentada antes do fuzzy e devolve um canônico ou ``None``.
+    """
+
+    def __init__(self, kind, path=ALIAS_FILE, score_cutoff=SCORE_CUTOFF, rule=None):
+        self.kind = kind
+        self.path = path
+        self.score_cutoff = score_cutoff
+        self.rule = rule
+        self._aliases = dict(SEED_ALIASES.get(kind, {}))
+        self._choices_version = None
+        self._lock = threading.Lock()
+        self._load()
+
+    # ----------------------------
+    # PERSISTÊNCIA
+    # ----------------------------
+    def _read_file(self):
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                content = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("Tabela de aliases ilegível (%s): %s", self.path, e)
+            return {}
+        # Tabela de outro formato (ex.: fuzzy sem liga e com corte menor) é refeita do zero
+        if content.get("format") != ALIAS_FORMAT:
+            return {}
+        return content
+
+    def _load(self):
+        stored = self._read_file().get(self.kind, {})
+        self._choices_version = stored.get("choices")
+        for alias, name in stored.get("aliases", {}).items():
+            self._aliases.setdefault(alias, name)
+
+    def _save(self):
+        if not self.path:
+            return
+        tmp = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with _file_lock:
+            content = self._read_file()
+            content["format"] = ALIAS_FORMAT
+            content[self.kind] = {"choices": self._choices_version, "aliases": self._aliases}
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(content, f, ensure_ascii=False, indent=1, sort_keys=True)
+                os.replace(tmp, self.path)
+            except OSError as e:
+                logger.warning("Não foi possível gravar a tabela de aliases (%s): %s", self.path, e)
+
+    # ----------------------------
+    # RESOLUÇÃO
+    # ----------------------------
+    def _match(self, names, choices):
+        """Resolve ``names`` (ainda desconhecidos) contra ``choices`` de uma vez"""
+        normalized_choices = [normalize_name(c) for c in choices]
+        exact = {}
+        for choice, normalized in zip(choices, normalized_choices):
+            exact.setdefault(normalized, choice)
+
+        known = set(choices)
+        resolved = {}
+        pending = []
+        for name in names:
+            normalized = normalize_name(name)
+            ruled = self.rule(name, known) if self.rule else None
+            if normalized in exact:
+                resolved[name] = exact[normalized]
+            elif ruled is not None:
+                resolved[name] = ruled
+            else:
+                resolved[name] = None
+                pending.append((name, normalized))
+
+        if pending and choices:
+            scores = process.cdist(
+                [normalized for _, normalized in pending], normalized_choices,
+                scorer=fuzz.token_sort_ratio, score_cutoff=self.score_cutoff, workers=-1
+            )
+            best = scores.argmax(axis=1)
+            for row, (name, normalized) in enumerate(pending):
+                score = scores[row, best[row]]
+                # Empate entre dois candidatos fica sem resolução
+                if score == 0 or np.count_nonzero(scores[row] == score) > 1:
+                    continue
+                if _markers(normalized) == _markers(normalized_choices[best[row]]):
+                    resolved[name] = choices[best[row]]
+        return resolved
+
+    def resolve_many(self, names, choices, version=None):
+        """Dicionário ``nome -> nome canônico`` (``None`` sem correspondência).
+
+        ``choices`` pode ser uma função, chamada só quando há nomes novos.
+        ``version`` identifica a lista canônica (ex.: ``data_version``); sem
+        ela a lista é materializada e comparada por hash.
+        """
+        names = [name for name in dict.fromkeys(names) if isinstance(name, str)]
+        new = [name for name in names if name not in self._aliases]
+        if not new and (version == self._choices_version or all(self._aliases[name] for name in names)):
+            return {name: self._aliases[name] for name in names}
+
+        with self._lock:
+            if version is None:
+                choices = sorted(set(choices() if callable(choices) else choices))
+                version = _fingerprint(choices)
+            if version != self._choices_version:
+                # Lista canônica mudou: nomes sem correspondência voltam a ser tentados
+                self._aliases = {k: v for k, v in self._aliases.items() if v is not None}
+                self._choices_version = version
+            new = [name for name in names if name not in self._aliases]
+            if new:
+                if callable(choices):
+                    choices = sorted(set(choices()))
+                self._aliases.update(self._match(new, choices))
+                logger.info("%d nomes novos de %s resolvidos", len(new), self.kind)
+                self._save()
+        return {name: self._aliases.get(name) for name in names}
+
+    def resolve(self, name):
+        """Nome canônico já conhecido para ``name`` (consulta de dicionário)"""
+        return self._aliases.get(name)
+
+
+# ----------------------------
+# RESOLVEDORES PADRÃO
+# ----------------------------
+_resolvers = {}
+_resolvers_lock = threading.Lock()
+
+
+def get_resolver(kind, score_cutoff=SCORE_CUTOFF, rule=None):
+    with _resolvers_lock:
+        if kind not in _resolvers:
+            _resolvers[kind] = NameResolver(kind, score_cutoff=score_cutoff, rule=rule)
+        return _resolvers[kind]
+
+
+def team_names():
+    """Nomes canônicos de time: todos os times das tabelas de perfil"""
+    return get_team_profiles("home").index.union(get_team_profiles("away").index).tolist()
+
+
+def league_teams(league):
+    """Times das tabelas de perfil com linha na liga ``league``"""
+    teams = set()
+    for side in PROFILE_SOURCES:
+        index = get_league_profiles(side).index
+        if "league" in index.names:
+            teams.update(index.get_level_values("team")[index.get_level_values("league") == league])
+    return sorted(teams)
+
+
+def _profile_version():
+    return data_version(source_keys())
+
+
+def resolve_teams(names):
+    """Nome do time no perfil para cada nome de ``names``, entre todos os times"""
+    return get_resolver("teams").resolve_many(names, team_names, _profile_version())
+
+
+def resolve_league_teams(names, leagues):
+    """Nome do time no perfil para cada par de ``names`` e ``leagues`` (ligas canônicas)
+
+    O nome é procurado primeiro só entre os times da sua liga; sem liga, ou
+    sem correspondência nela, entre todos os times (``resolve_teams``).
+    Retorna uma lista na ordem de ``names``.
+    """
+    names = list(names)
+    version = _profile_version()
+    groups = {}
+    for position, league in enumerate(leagues):
+        groups.setdefault(league if isinstance(league, str) else None, []).append(position)
+
+    resolved = [None] * len(names)
+    for league, positions in groups.items():
+        group = [names[position] for position in positions]
+        aliases = {}
+        if league is not None:
+            resolver = get_resolver(f"teams/{league}", LEAGUE_SCORE_CUTOFF)
+            aliases = resolver.resolve_many(group, lambda league=league: league_teams(league), version)
+        missing = [name for name in group if not aliases.get(name)]
+        if missing:
+            aliases.update(resolve_teams(missing))
+        for position, name in zip(positions, group):
+            resolved[position] = aliases.get(name)
+    return resolved
+
+
+def resolve_leagues(names):
+    """Nome canônico da liga para cada nome de ``names``"""
+    resolver = get_resolver("leagues", rule=league_from_code)
+    return resolver.resolve_many(names, league_names, data_version(LEAGUE_KEYS))
@@ -0,0 +1,55 @@
+"""Conversões vetorizadas dos formatos de texto usados nos CSVs.
+
+Cada função recebe uma ``Series`` e devolve valores numéricos (``NaN`` quando
+a célula não segue o formato), sem laços Python por célula.
+"""
+import pandas as pd
+
+NUMBER = r"(-?\d+(?:[.,]\d+)?)"
+
+
+def _to_float(values):
+    return pd.to_numeric(values.str.replace(",", ".", regex=False), errors="coerce").astype("float64")
+
+
+def _as_text(series):
+    return series.astype("string").str.strip()
+
+
+def parse_number(series):
+    """``"1,5"`` / ``"1.50"`` / ``1.5`` -> 1.5"""
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype(float)
+    return _to_float(_as_text(series))
+
+
+def parse_percent(series):
+    """``"62%"`` / ``"38,5%"`` -> 62.0 / 38.5"""
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype(float)
+    return _to_float(_as_text(series).str.extract(rf"^{NUMBER}\s*%?$", expand=False))
+
+
+def parse_minutes(series):
+    """``"36 min."`` -> 36.0"""
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype(float)
+    return _to_float(_as_text(series).str.extract(rf"^{NUMBER}\s*(?:min\.?)?$", expand=False))
+
+
+def parse_pair(series):
+    """``"15 - 1"`` / ``"1-2"`` -> DataFrame com as colunas ``for`` e ``against``"""
+    parts = _as_text(series).str.extract(r"^(\d+)\s*-\s*(\d+)$")
+    return pd.DataFrame({
+        "for": _to_float(parts[0]),
+        "against": _to_float(parts[1]),
+    }, index=series.index)
+
+
+def parse_out_of(series):
+    """``"3 out of 8"`` -> DataFrame com as colunas ``count`` e ``total``"""
+    parts = _as_text(series).str.extract(r"^(\d+)\s+out\s+of\s+(\d+)$")
+    return pd.DataFrame({
+        "count": _to_float(parts[0]),
+        "total": _to_float(parts[1]),
+    }, index=series.index)
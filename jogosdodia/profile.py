@@ -0,0 +1,272 @@
+"""Perfil por time: todas as fontes de um lado (casa ou fora) numa única linha.
+
+Em vez de consultar oito tabelas a cada renderização, os apps leem uma linha
+de ``team_profile(time, "home")``. As tabelas são montadas uma vez por versão
+dos dados (``data_version``) e reaproveitadas até que algum CSV mude; também
+ficam em snapshot no disco, então um novo processo não refaz as conversões.
+
+As colunas de cada fonte recebem um prefixo (``ft_``, ``ht_``, ``cv_``,
+``fg_``, ``gm_``, ``gpt_``, ``half_``, ``form_``) e ``has_<prefixo>`` indica se
+o time aparece naquela fonte.
+
+O mesmo nome de time aparece em ligas diferentes (Boca Juniors na Argentina
+e na Colômbia), então a tabela completa (``get_league_profiles``) tem uma
+linha por (time, liga): a liga de cada fonte é levada ao nome canônico
+(``leagues.get_league_aliases``) e as fontes são juntadas pelas duas
+colunas. Fontes sem liga (CV) valem para o time em todas as ligas. Quando
+um time aparece mais de uma vez na mesma liga de uma tabela (ex.:
+Apertura/Clausura), vale a primeira linha, como nos filtros originais dos
+apps. Para consultas só pelo nome, ``get_team_profiles`` guarda uma linha
+por time: a da primeira liga em que ele aparece (a do arquivo principal),
+com as fontes que faltam nela completadas pela primeira liga do time que
+as tem, como nos filtros originais (primeira linha de cada tabela).
+``fixture_league`` dá a liga comum de um confronto, para ``team_profile``
+ler os dois times na mesma liga.
+"""
+import threading
+
+import pandas as pd
+
+from .data import DATASETS, data_version, get_dataset, get_snapshot_store, load_datasets
+from .leagues import LEAGUE_KEYS, get_league_aliases
+from .schema import text_columns
+
+PROFILE_SOURCES = {
+    "home": [
+        ("ft", "home_df"),
+        ("ht", "ppg_ht_home_df"),
+        ("cv", "cv_home_df"),
+        ("fg", "home_fg_df"),
+        ("gm", "goal_minute_home_df"),
+        ("gpt", "goals_per_time_home_df"),
+        ("half", "goals_half_df"),
+        ("form", "relative_form_df")
+    ],
+    "away": [
+        ("ft", "away_df"),
+        ("ht", "ppg_ht_away_df"),
+        ("cv", "cv_away_df"),
+        ("fg", "away_fg_df"),
+        ("gm", "goal_minute_away_df"),
+        ("gpt", "goals_per_time_away_df"),
+        ("half", "goals_half_df"),
+        ("form", "relative_form_df")
+    ]
+}
+
+# CV_Goals_HT_Away repete os nomes do arquivo da casa com sufixo ".1"
+CV_AWAY_COLUMNS = {"Avg..1": "Avg.", "0.1": "0", "1.1": "1", "2.1": "2", "3.1": "3", "4+.1": "4+"}
+
+
+# ----------------------------
+# AJUSTES DAS FONTES
+# ----------------------------
+def _rename_goals_ht(df):
+    return df.rename(columns=CV_AWAY_COLUMNS)
+
+
+# As colunas já chegam tipadas pelo esquema (schema.py); aqui só os ajustes de nome
+SOURCE_ADJUSTMENTS = {
+    "goals_ht": _rename_goals_ht
+}
+
+
+def _source_frame(prefix, key):
+    """Uma linha por (time, liga canônica), colunas prefixadas; sem coluna de liga, uma por time"""
+    dataset = DATASETS[key]
+    df = get_dataset(key)
+    if df.empty or dataset.team_column not in df.columns:
+        return pd.DataFrame()
+
+    df = df.dropna(subset=[dataset.team_column])
+    index = {dataset.team_column: "team"}
+    if dataset.league_column in df.columns:
+        # Liga sem nome canônico fica com o nome da fonte (não junta com as outras)
+        league = df[dataset.league_column].astype("str")
+        df = df.drop(columns=dataset.league_column)
+        df["league"] = league.map(get_league_aliases(key)).fillna(league)
+        index["league"] = "league"
+    df = df.drop_duplicates(list(index))
+
+    # Texto original ("15 - 1", "3 out of 8") fica fora: o perfil usa as colunas numéricas
+    df = df.drop(columns=text_columns(dataset.group), errors="ignore")
+    adjust = SOURCE_ADJUSTMENTS.get(dataset.group)
+    df = adjust(df) if adjust else df.copy()
+    df = df.set_index(list(index)).rename_axis(list(index.values()))
+
+    df = df.add_prefix(f"{prefix}_")
+    df[f"has_{prefix}"] = True
+    return df
+
+
+def build_team_profiles(side):
+    """Junta todas as fontes de ``side`` ("home" ou "away") numa tabela por (time, liga)"""
+    frames = [_source_frame(prefix, key) for prefix, key in PROFILE_SOURCES[side]]
+    frames = [frame for frame in frames if not frame.empty]
+    by_league = [frame for frame in frames if frame.index.nlevels == 2]
+    by_team = [frame for frame in frames if frame.index.nlevels == 1]
+    if not frames:
+        return pd.DataFrame()
+
+    # Ordem das linhas: a da primeira fonte que conhece o par (equipes_casa/fora antes das demais)
+    if by_league:
+        profile = pd.concat(by_league, axis=1, join="outer", sort=False)
+    else:
+        profile = pd.DataFrame(index=pd.MultiIndex.from_arrays([[], []], names=["team", "league"]))
+
+    # Fonte sem liga: junta pelo time em todas as ligas; time só nela fica sem liga
+    for frame in by_team:
+        teams = profile.index.get_level_values("team")
+        extra = frame.index.difference(teams, sort=False)
+        profile = profile.join(frame, on="team")
+        if len(extra):
+            index = pd.MultiIndex.from_arrays([extra, [None] * len(extra)], names=["team", "league"])
+            profile = pd.concat([profile, frame.loc[extra].set_axis(index)])
+
+    flags = profile.columns[profile.columns.str.startswith("has_")]
+    profile[flags] = profile[flags].fillna(False).astype(bool)
+    return profile
+
+
+def _source_columns(columns, flag):
+    """Colunas da fonte do indicador ``flag`` (``has_<prefixo>``), com o próprio indicador"""
+    return columns[columns.str.startswith(f"{flag[len('has_'):]}_")].append(pd.Index([flag]))
+
+
+def primary_profiles(profiles):
+    """Uma linha por time de ``profiles`` (a da primeira liga), com a liga na coluna ``league``
+
+    Fonte sem linha na primeira liga do time vem da primeira liga em que ele a tem.
+    """
+    if profiles.empty:
+        return profiles
+    profiles = profiles.reset_index("league")
+    primary = profiles[~profiles.index.duplicated()].copy()
+    for flag in profiles.columns[profiles.columns.str.startswith("has_")]:
+        with_source = profiles[profiles[flag]]
+        with_source = with_source[~with_source.index.duplicated()]
+        missing = primary.index[~primary[flag]].intersection(with_source.index)
+        if len(missing):
+            columns = _source_columns(profiles.columns, flag)
+            primary.loc[missing, columns] = with_source.loc[missing, columns]
+    return primary
+
+
+# ----------------------------
+# CACHE POR VERSÃO DOS DADOS
+# ----------------------------
+_profiles = {}
+_primary = {}
+_lock = threading.Lock()
+
+
+def source_keys(side=None):
+    """Tabelas dos perfis de ``side`` (sem ``side``, dos dois lados), para ``data_version``
+
+    Inclui os arquivos principais, que dão a liga canônica de cada fonte.
+    """
+    sides = list(PROFILE_SOURCES) if side is None else [side]
+    return list(dict.fromkeys([key for name in sides for _, key in PROFILE_SOURCES[name]] + LEAGUE_KEYS))
+
+
+def _load_profiles(side, version):
+    """Tabela de perfis do snapshot em disco ou, se não houver, construída agora"""
+    store = get_snapshot_store()
+    key = f"profile_{side}"
+    profiles = store.read(key, version)
+    if profiles is not None:
+        return profiles.set_index(["team", "league"])
+
+    profiles = build_team_profiles(side)
+    if not profiles.empty:
+        store.write(key, version, profiles.reset_index())
+    return profiles
+
+
+def get_league_profiles(side) -> pd.DataFrame:
+    """Tabela de perfis de ``side`` por (time, liga), reconstruída só quando os CSVs mudam"""
+    keys = source_keys(side)
+    load_datasets(keys)
+    version = data_version(keys)
+
+    cached = _profiles.get(side)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    with _lock:
+        cached = _profiles.get(side)
+        if cached is None or cached[0] != version:
+            cached = _profiles[side] = (version, _load_profiles(side, version))
+    return cached[1]
+
+
+def get_team_profiles(side) -> pd.DataFrame:
+    """Perfis de ``side`` com uma linha por time (``primary_profiles``), para consultas pelo nome"""
+    profiles = get_league_profiles(side)
+    version = data_version(source_keys(side))
+
+    cached = _primary.get(side)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    with _lock:
+        cached = _primary.get(side)
+        if cached is None or cached[0] != version:
+            cached = _primary[side] = (version, primary_profiles(profiles))
+    return cached[1]
+
+
+def _team_leagues(profiles, team):
+    """Ligas de ``team`` na tabela por (time, liga), na ordem da tabela"""
+    try:
+        leagues = profiles.xs(team, level="team").index
+    except KeyError:
+        return []
+    return [league for league in leagues if isinstance(league, str)]
+
+
+def fixture_league(home_team, away_team):
+    """Primeira liga do mandante (em casa) em que o visitante também joga fora; ``None`` sem nenhuma"""
+    home = get_league_profiles("home")
+    away = get_league_profiles("away")
+    if home.empty or away.empty:
+        return None
+    away_leagues = set(_team_leagues(away, away_team))
+    return next((league for league in _team_leagues(home, home_team) if league in away_leagues), None)
+
+
+def team_profile(team, side, league=None):
+    """Linha do perfil de ``team`` (``None`` se o time não aparece em nenhuma fonte)
+
+    Com ``league`` (nome canônico, ex.: ``fixture_league``), a linha do time
+    naquela liga, se houver; senão a da primeira liga do time. Fontes sem
+    dados na liga escolhida vêm do perfil principal (``get_team_profiles``).
+    """
+    profiles = get_team_profiles(side)
+    if team not in profiles.index:
+        return None
+    primary = profiles.loc[team]
+    if league is None or league == primary.get("league"):
+        return primary
+
+    by_league = get_league_profiles(side)
+    if (team, league) not in by_league.index:
+        return primary
+    row = pd.concat([pd.Series({"league": league}), by_league.loc[(team, league)]])
+    for flag in row.index[row.index.str.startswith("has_")]:
+        if not row[flag] and primary[flag]:
+            columns = _source_columns(row.index, flag)
+            row[columns] = primary[columns]
+    return row
+
+
+def has_source(profile, prefix):
+    """Indica se o perfil existe e contém dados da fonte ``prefix``"""
+    return profile is not None and bool(profile.get(f"has_{prefix}", False))
+
+
+def format_percent(value):
+    """62.0 -> ``"62%"`` (formato original dos CSVs)"""
+    if pd.isna(value):
+        return "—"
+    return f"{value:g}%"
@@ -0,0 +1,219 @@
+"""Instrumentação opcional do caminho de renderização dos apps.
+
+Ativada por ``JOGOSDODIA_PROFILE=1``. O parâmetro ``?profile=1`` na URL só
+vale com ``JOGOSDODIA_PROFILE_QUERY=1``: sem isso, qualquer visitante ligaria
+o ``tracemalloc`` do processo inteiro. Cada seção medida (funções
+``display_*``, blocos de aba) registra tempo de parede, memória alocada e
+pico de memória. Ao fim de cada rerun o resumo aparece num painel
+recolhível da barra lateral e é gravado como uma linha JSON em
+``JOGOSDODIA_PROFILE_FILE`` (padrão: ``CACHE_DIR/profile.jsonl``), para
+acompanhar regressões de latência; o arquivo passa para ``.1`` ao atingir
+``PROFILE_MAX_BYTES``.
+
+O ``tracemalloc`` é global ao processo: fica ligado só durante as seções
+medidas (e é desligado no fim, se foi ligado aqui). O tempo é medido em
+todas as sessões; a memória, só numa sessão de cada vez (``reset_peak`` de
+uma zeraria o pico da outra): uma seção externa que começa enquanto outra
+sessão mede memória não espera por ela e registra só o tempo (memória
+vazia no resumo). Alocações de sessões sem perfil no mesmo intervalo
+entram na conta.
+
+Desativado, ``wrap`` devolve a própria função e ``section`` não mede nada.
+"""
+import functools
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+from .data import CACHE_DIR, cache_stats, load_timings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_ENV = "JOGOSDODIA_PROFILE"
+PROFILE_QUERY_ENV = "JOGOSDODIA_PROFILE_QUERY"
+PROFILE_FILE = os.environ.get("JOGOSDODIA_PROFILE_FILE", os.path.join(CACHE_DIR, "profile.jsonl"))
+
+# Tamanho do profile.jsonl que dispara a rotação (mantém uma cópia anterior em ``.1``)
+PROFILE_MAX_BYTES = int(os.environ.get("JOGOSDODIA_PROFILE_MAX_BYTES", 5 * 1024 * 1024))
+
+_write_lock = threading.Lock()
+
+# Sessão (thread do Streamlit) que está medindo memória; as demais medem só o tempo
+_trace_lock = threading.Lock()
+
+
+def _enabled(value):
+    return value is not None and str(value).strip().lower() in ("1", "true", "yes", "on")
+
+
+def profiling_requested(query_value=None):
+    """Indica se o profiler foi pedido pela variável de ambiente ou, se permitido, pelo parâmetro da URL"""
+    if _enabled(os.environ.get(PROFILE_ENV)):
+        return True
+    return _enabled(os.environ.get(PROFILE_QUERY_ENV)) and _enabled(query_value)
+
+
+class RenderProfiler:
+    """Tempo e memória por seção de um rerun do Streamlit"""
+
+    def __init__(self, app, enabled=False, path=PROFILE_FILE):
+        self.app = app
+        self.enabled = enabled
+        self.path = path
+        self.sections = {}
+        self._stack = []
+        self._memory = False
+        self._start = time.perf_counter()
+        self._timings = load_timings()
+
+    # ----------------------------
+    # MEDIÇÃO
+    # ----------------------------
+    def section(self, name):
+        """Context manager que mede o bloco como a seção ``name``"""
+        if not self.enabled:
+            return nullcontext()
+        return self._measure(name)
+
+    @contextmanager
+    def _measure(self, name):
+        if self._stack:
+            with self._traced(name):
+                yield
+            return
+        # Seção externa: mede memória só se nenhuma outra sessão está medindo (sem esperar)
+        self._memory = _trace_lock.acquire(blocking=False)
+        started = False
+        try:
+            if self._memory:
+                started = not tracemalloc.is_tracing()
+                if started:
+                    tracemalloc.start()
+            with self._traced(name):
+                yield
+        finally:
+            if started:
+                tracemalloc.stop()
+            if self._memory:
+                self._memory = False
+                _trace_lock.release()
+
+    @contextmanager
+    def _traced(self, name):
+        if not self._memory:
+            start = time.perf_counter()
+            try:
+                yield
+            finally:
+                self._record(name, time.perf_counter() - start, None, None)
+            return
+
+        current, peak = tracemalloc.get_traced_memory()
+        if self._stack:
+            # O pico acumulado até aqui pertence à seção externa
+            self._stack[-1]["peak"] = max(self._stack[-1]["peak"], peak)
+        tracemalloc.reset_peak()
+        frame = {"start": current, "peak": current}
+        self._stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            current, peak = tracemalloc.get_traced_memory()
+            frame["peak"] = max(frame["peak"], peak)
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1]["peak"] = max(self._stack[-1]["peak"], frame["peak"])
+            self._record(name, elapsed, current - frame["start"], frame["peak"] - frame["start"])
+
+    def _record(self, name, seconds, allocated, peak):
+        """Acumula uma chamada da seção; ``allocated``/``peak`` ``None`` quando a memória não foi medida"""
+        entry = self.sections.setdefault(name, {"calls": 0, "seconds": 0.0, "allocated": None, "peak": None})
+        entry["calls"] += 1
+        entry["seconds"] += seconds
+        if allocated is not None:
+            entry["allocated"] = (entry["allocated"] or 0) + allocated
+            entry["peak"] = max(entry["peak"] or 0, peak)
+
+    def wrap(self, func=None, *, name=None):
+        """Decorador: mede cada chamada de ``func`` (seção com o nome da função)"""
+        if func is None:
+            return functools.partial(self.wrap, name=name)
+        if not self.enabled:
+            return func
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with self._measure(label):
+                return func(*args, **kwargs)
+        return wrapper
+
+    # ----------------------------
+    # RESULTADOS
+    # ----------------------------
+    def summary(self):
+        """Lista de seções ordenada pelo tempo total (mais lentas primeiro)"""
+        rows = [{"section": name, **values} for name, values in self.sections.items()]
+        return sorted(rows, key=lambda row: row["seconds"], reverse=True)
+
+    def record(self, **context):
+        """Registro do rerun: seções, tabelas carregadas nele e contadores do cache"""
+        timings = load_timings()
+        loads = {key: seconds for key, seconds in timings.items() if self._timings.get(key) != seconds}
+        return {
+            "ts": time.time(),
+            "app": self.app,
+            "total": time.perf_counter() - self._start,
+            "sections": self.summary(),
+            "loads": loads,
+            "cache": cache_stats(),
+            **context
+        }
+
+    def write(self, record):
+        """Acrescenta ``record`` ao arquivo JSON lines (girado ao passar de ``PROFILE_MAX_BYTES``)"""
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with _write_lock:
+                if os.path.exists(self.path) and os.path.getsize(self.path) >= PROFILE_MAX_BYTES:
+                    os.replace(self.path, f"{self.path}.1")
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except OSError as e:
+            logger.warning("Não foi possível gravar o perfil em %s: %s", self.path, e)
+
+    def report(self, **context):
+        """Fecha o rerun: grava a linha JSON e mostra o painel na barra lateral"""
+        if not self.enabled:
+            return None
+        import pandas as pd
+        import streamlit as st
+
+        record = self.record(**context)
+        self.write(record)
+        with st.sidebar.expander(f"⏱️ Perfil do rerun: {record['total'] * 1000:.0f} ms"):
+            if record["sections"]:
+                table = pd.DataFrame(record["sections"]).set_index("section")
+                table["ms"] = (table.pop("seconds") * 1000).round(1)
+                table["KiB"] = (table.pop("allocated").astype(float) / 1024).round(1)
+                table["pico KiB"] = (table.pop("peak").astype(float) / 1024).round(1)
+                st.dataframe(table, use_container_width=True)
+            if record["loads"]:
+                st.caption("Tabelas carregadas: " + ", ".join(
+                    f"{key} ({seconds * 1000:.0f} ms)" for key, seconds in record["loads"].items()
+                ))
+            st.caption(f"Gravado em {self.path}")
+        return record
+
+
+def get_profiler(app, query_value=None):
+    """Profiler do rerun atual, ativo conforme ``profiling_requested``"""
+    return RenderProfiler(app, enabled=profiling_requested(query_value))
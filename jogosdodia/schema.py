@@ -0,0 +1,253 @@
+"""Esquema de tipos das tabelas: conversão dos textos dos CSVs uma vez por carga.
+
+Cada grupo do registro (``DATA_URLS``) declara o tipo das suas colunas:
+
+- ``number``: ``"1,5"`` -> 1.5
+- ``percent``: ``"62%"`` -> 62.0 (a coluna é convertida no lugar)
+- ``minutes``: ``"36 min."`` -> 36.0
+- ``pair``: ``"15 - 1"`` -> duas colunas numéricas (``targets``)
+- ``out_of``: ``"3 out of 8"`` -> duas colunas numéricas (``targets``)
+
+Nas colunas ``pair``/``out_of`` o texto original continua na tabela para
+exibição, ao lado das colunas numéricas. A conversão roda em ``data._clean``,
+antes do snapshot, então os apps recebem as colunas já tipadas e não
+convertem nada a cada renderização.
+
+Células que tinham conteúdo mas não seguem o formato da coluna viram ``NaN``
+e são registradas em ``ingest(...).failures`` (linha, coluna e valor).
+
+Depois da conversão, ``compact`` reduz a memória da tabela: colunas de time,
+liga e textos repetidos (ex.: ``Classificação Ofensiva``) viram ``category``
+e os números passam para ``int16``/``int32``/``float32`` quando cabem.
+"""
+import fnmatch
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+from .parsing import parse_minutes, parse_number, parse_out_of, parse_pair, parse_percent
+
+# Muda quando alguma regra abaixo muda: snapshots de outra versão são descartados
+SCHEMA_VERSION = 2
+
+# Máximo de falhas guardadas por tabela (o total continua sendo contado)
+MAX_FAILURES = 50
+
+# Marcadores de "sem dado" nos CSVs: viram NaN sem contar como falha
+MISSING = ["", "-"]
+
+# Colunas de texto com até esta fração de valores distintos viram ``category``
+CATEGORY_RATIO = 0.5
+
+TIME_BANDS = ["0-15", "16-30", "31-45", "46-60", "61-75", "76-90"]
+
+PARSERS = {
+    "number": parse_number,
+    "percent": parse_percent,
+    "minutes": parse_minutes
+}
+
+SPLIT_PARSERS = {
+    "pair": (parse_pair, ("for", "against")),
+    "out_of": (parse_out_of, ("count", "total"))
+}
+
+
+@dataclass(frozen=True)
+class Field:
+    """Regra de conversão de uma coluna (``column`` aceita padrões como ``"AVG_*"``)"""
+    column: str
+    kind: str
+    targets: tuple = ()
+
+
+@dataclass(frozen=True)
+class Schema:
+    """Colunas tipadas de um grupo, renomeações e reparo das linhas antes da conversão"""
+    fields: tuple
+    aliases: dict = field(default_factory=dict)
+    repair: Optional[Callable] = None
+
+
+@dataclass
+class IngestResult:
+    frame: pd.DataFrame
+    failures: list
+    failure_count: int
+
+
+# ----------------------------
+# REPAROS
+# ----------------------------
+def _repair_goals_per_time(df):
+    """Remove os cabeçalhos repetidos no meio do arquivo e realinha linhas sem ``GP``.
+
+    Algumas ligas vêm sem a coluna GP, com todos os valores deslocados uma
+    coluna para a esquerda (a faixa ``0-15`` aparece em ``GP``).
+    """
+    if "GP" in df.columns:
+        text = df.astype("string")
+        header = text.isin(["GP", "1st H."]).any(axis=1).to_numpy()
+        df = df[~header].reset_index(drop=True)
+
+        shifted = df["GP"].astype("string").str.contains("-", regex=False).fillna(False).to_numpy()
+        if shifted.any():
+            columns = df.columns[df.columns.get_loc("GP"):]
+            values = df.loc[shifted, columns].astype(object).to_numpy()
+            df[columns] = df[columns].astype(object)
+            df.loc[shifted, columns[1:]] = values[:, :-1]
+            df.loc[shifted, "GP"] = np.nan
+    return df.loc[:, ~df.columns.str.startswith("Unnamed")]
+
+
+SCHEMAS = {
+    "main": Schema(fields=()),
+    "first_goal": Schema(
+        # O repositório firstgoal publica a porcentagem como "First_Gol"; os CSVs locais como "Perc."
+        aliases={"Perc.": "First_Gol"},
+        fields=(
+            Field("First_Gol", "percent"),
+            Field("Matches", "out_of", ("Matches_Scored_First", "Matches_Total")),
+            Field("Goals", "pair", ("Goals_For", "Goals_Against")),
+            Field("PPG", "number")
+        )
+    ),
+    "goal_minute": Schema(fields=(Field("AVG_min_*", "number"),)),
+    "goals_half": Schema(fields=(
+        Field("1st half", "percent"),
+        Field("2nd half", "percent"),
+        Field("Scored", "number"),
+        Field("Avg. minute", "number")
+    )),
+    "goals_ht": Schema(fields=(
+        Field("Avg.*", "number"),
+        Field("% Com Gols", "percent"),
+        Field("% Sem Gols", "percent"),
+        Field("Total_Jogos", "number")
+    )),
+    "goals_per_time": Schema(
+        repair=_repair_goals_per_time,
+        fields=(
+            Field("GP", "number"),
+            *(Field(band, "pair", (f"{band}_Scored", f"{band}_Conceded")) for band in TIME_BANDS + ["1st H.", "2nd H."]),
+            Field("AVG_*", "minutes")
+        )
+    ),
+    "goals_stats": Schema(fields=(
+        Field("GP", "number"),
+        Field("Avg", "number"),
+        Field("*.5+", "percent"),
+        *(Field(column, "percent") for column in ("BTS", "CS", "FTS", "WTN", "LTN"))
+    )),
+    "ppg_ht": Schema(fields=()),
+    "relative_form": Schema(fields=())
+}
+
+
+# ----------------------------
+# CONVERSÃO
+# ----------------------------
+def _columns(df, pattern):
+    if any(c in pattern for c in "*?["):
+        return [c for c in df.columns if fnmatch.fnmatchcase(c, pattern)]
+    return [pattern] if pattern in df.columns else []
+
+
+def _failures(source, parsed, column):
+    """Células com conteúdo em ``source`` que viraram ``NaN`` em ``parsed``"""
+    text = source.astype("string").str.strip()
+    failed = (text.notna() & ~text.isin(MISSING) & parsed.isna()).to_numpy(dtype=bool)
+    rows = np.flatnonzero(failed)
+    return [(int(row), column, str(source.iat[row])) for row in rows]
+
+
+def text_columns(group):
+    """Colunas de texto que têm versão numérica (``pair``/``out_of``) no grupo"""
+    schema = SCHEMAS.get(group)
+    if schema is None:
+        return []
+    return [f.column for f in schema.fields if f.kind in SPLIT_PARSERS]
+
+
+def percent_columns(group):
+    """Colunas do grupo guardadas como porcentagem (0-100)"""
+    schema = SCHEMAS.get(group)
+    if schema is None:
+        return []
+    return [f.column for f in schema.fields if f.kind == "percent"]
+
+
+def ingest(group, df) -> IngestResult:
+    """Aplica o esquema de ``group`` a ``df`` e devolve a tabela tipada e as falhas"""
+    schema = SCHEMAS.get(group)
+    if schema is None or df.empty:
+        return IngestResult(df, [], 0)
+
+    df = df.rename(columns=schema.aliases)
+    if schema.repair is not None:
+        df = schema.repair(df)
+    df = df.reset_index(drop=True)
+
+    failures = []
+    for rule in schema.fields:
+        for column in _columns(df, rule.column):
+            source = df[column]
+            if rule.kind in SPLIT_PARSERS:
+                parser, parts = SPLIT_PARSERS[rule.kind]
+                parsed = parser(source)
+                for target, part in zip(rule.targets, parts):
+                    df[target] = parsed[part]
+                failures.extend(_failures(source, parsed[parts[0]], column))
+            else:
+                df[column] = PARSERS[rule.kind](source)
+                failures.extend(_failures(source, df[column], column))
+
+    return IngestResult(df, failures[:MAX_FAILURES], len(failures))
+
+
+# ----------------------------
+# MEMÓRIA
+# ----------------------------
+def _is_text(series):
+    return series.dtype == object or pd.api.types.is_string_dtype(series)
+
+
+def _downcast(series):
+    """Menor tipo numérico que representa ``series`` sem mudar nenhum valor"""
+    kind = series.dtype.kind
+    if kind == "i" and len(series):
+        low, high = series.min(), series.max()
+        for dtype in (np.int16, np.int32):
+            info = np.iinfo(dtype)
+            if info.min <= low and high <= info.max:
+                return series.astype(dtype)
+    elif kind == "f" and series.dtype != np.float32:
+        # Só quando todos os valores são exatos em float32 (contagens, ,5, ,25...):
+        # 1.8 em float32 é 1.7999999523 e mudaria filtros como ``PPG >= 1.8``
+        small = series.astype(np.float32)
+        if np.array_equal(small.to_numpy(np.float64), series.to_numpy(np.float64), equal_nan=True):
+            return small
+    return series
+
+
+def compact(df, categorical=()) -> pd.DataFrame:
+    """Tabela com tipos compactos: ``category`` nos textos repetidos e números menores
+
+    As colunas de ``categorical`` (time, liga) viram ``category`` sempre; as
+    demais colunas de texto quando têm até ``CATEGORY_RATIO`` de valores distintos.
+    """
+    columns = {}
+    for column in df.columns:
+        series = df[column]
+        if _is_text(series):
+            if column in categorical or series.nunique() <= CATEGORY_RATIO * len(series):
+                columns[column] = series.astype("category")
+        elif series.dtype.kind in "if":
+            small = _downcast(series)
+            if small is not series:
+                columns[column] = small
+    if not columns:
+        return df
+    return df.assign(**columns)
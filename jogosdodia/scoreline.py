@@ -0,0 +1,143 @@
+"""Motor de placares por Poisson independente, vetorizado com NumPy.
+
+A partir da expectativa de gols de cada lado monta a matriz completa de
+placares (``matriz[gols_casa, gols_fora]``) como produto externo de dois
+vetores de probabilidade, e daí deriva os mercados: 1X2, over/under, BTTS,
+placar exato e handicap asiático.
+
+Todas as funções aceitam escalares ou arrays de expectativas; com arrays as
+matrizes ganham dimensões à esquerda (``(..., n, n)``) e cada mercado devolve
+um array com uma probabilidade por jogo.
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+MAX_GOALS = 10
+
+
+class AsianHandicap(NamedTuple):
+    """Resultado da aposta no mandante com handicap ``line``.
+
+    Em linhas de quarto (ex.: -0.75) a aposta é dividida em duas metades, e
+    ``win``/``push``/``loss`` somam a fração de stake em cada situação.
+    """
+    win: np.ndarray
+    push: np.ndarray
+    loss: np.ndarray
+    fair_odds: np.ndarray
+
+
+# ----------------------------
+# MATRIZ DE PLACARES
+# ----------------------------
+def poisson_pmf(mu, max_goals=MAX_GOALS):
+    """P(0..max_goals gols) para cada expectativa em ``mu`` (última dimensão = gols)"""
+    mu = np.asarray(mu, dtype=float)[..., None]
+    goals = np.arange(1, max_goals + 1)
+    # p(k) = p(k-1) * mu / k, começando em p(0) = e^-mu
+    factors = np.concatenate([np.exp(-mu), np.broadcast_to(mu / goals, mu.shape[:-1] + goals.shape)], axis=-1)
+    return np.cumprod(factors, axis=-1)
+
+
+def score_matrix(mu_home, mu_away, max_goals=MAX_GOALS):
+    """Matriz ``[gols_casa, gols_fora]`` com a probabilidade de cada placar"""
+    home = poisson_pmf(mu_home, max_goals)
+    away = poisson_pmf(mu_away, max_goals)
+    return home[..., :, None] * away[..., None, :]
+
+
+def expected_goals(ppg_home, ppg_away, gf_avg_home, gf_avg_away):
+    """Expectativa de gols (casa, fora) usada nas abas de análise.
+
+    A média total de gols (``gf_avg_home + gf_avg_away``) é dividida entre os
+    times na proporção do PPG de cada um.
+    """
+    ppg_home = np.asarray(ppg_home, dtype=float)
+    ppg_away = np.asarray(ppg_away, dtype=float)
+    total = np.asarray(gf_avg_home, dtype=float) + np.asarray(gf_avg_away, dtype=float)
+    ppg_total = ppg_home + ppg_away
+    with np.errstate(divide="ignore", invalid="ignore"):
+        home = np.where(ppg_total == 0, 0.0, ppg_home / ppg_total * total)
+    return home, total - home
+
+
+def _goals_grid(matrix):
+    goals = np.arange(matrix.shape[-1])
+    return goals[:, None], goals[None, :]
+
+
+# ----------------------------
+# MERCADOS
+# ----------------------------
+def match_odds(matrix):
+    """Probabilidades (casa, empate, fora)"""
+    home = np.tril(matrix, -1).sum(axis=(-2, -1))
+    draw = np.trace(matrix, axis1=-2, axis2=-1)
+    away = np.triu(matrix, 1).sum(axis=(-2, -1))
+    return home, draw, away
+
+
+def over_under(matrix, line=2.5):
+    """Probabilidades (over, under) da linha de gols ``line``"""
+    home_goals, away_goals = _goals_grid(matrix)
+    total = home_goals + away_goals
+    over = np.where(total > line, matrix, 0).sum(axis=(-2, -1))
+    under = np.where(total < line, matrix, 0).sum(axis=(-2, -1))
+    return over, under
+
+
+def btts(matrix):
+    """Probabilidade de ambos marcarem"""
+    return matrix[..., 1:, 1:].sum(axis=(-2, -1))
+
+
+def correct_score(matrix, home_goals, away_goals):
+    """Probabilidade do placar exato ``home_goals`` x ``away_goals``"""
+    if max(home_goals, away_goals) >= matrix.shape[-1]:
+        return np.zeros(matrix.shape[:-2])
+    return matrix[..., home_goals, away_goals]
+
+
+def top_scorelines(matrix, n=5):
+    """Os ``n`` placares mais prováveis de um jogo: ``[((casa, fora), prob), ...]``
+
+    Em caso de empate de probabilidade mantém a ordem casa/fora crescente,
+    como a ordenação estável do laço antigo.
+    """
+    flat = np.asarray(matrix).ravel()
+    order = np.argsort(-flat, kind="stable")[:n]
+    size = matrix.shape[-1]
+    return [((int(i // size), int(i % size)), float(flat[i])) for i in order]
+
+
+def _handicap_parts(line):
+    # Linhas de quarto (-0.25, -0.75, ...) viram duas apostas de meia stake
+    if (line * 4) % 2 == 1:
+        return [line - 0.25, line + 0.25]
+    return [line]
+
+
+def asian_handicap(matrix, line):
+    """Aposta no mandante com handicap ``line`` (ex.: -0.5, -0.75, +1)"""
+    home_goals, away_goals = _goals_grid(matrix)
+    margin = home_goals - away_goals
+    parts = _handicap_parts(line)
+
+    win = push = loss = 0
+    for part in parts:
+        adjusted = margin + part
+        win = win + np.where(adjusted > 0, matrix, 0).sum(axis=(-2, -1)) / len(parts)
+        push = push + np.where(adjusted == 0, matrix, 0).sum(axis=(-2, -1)) / len(parts)
+        loss = loss + np.where(adjusted < 0, matrix, 0).sum(axis=(-2, -1)) / len(parts)
+
+    # Odd justa: lucro esperado zero -> win * (odd - 1) = loss
+    with np.errstate(divide="ignore", invalid="ignore"):
+        odds = 1 + loss / win
+    return AsianHandicap(win, push, loss, odds)
+
+
+def fair_odds(probability):
+    """Odd justa (1 / probabilidade); ``inf`` quando a probabilidade é zero"""
+    with np.errstate(divide="ignore"):
+        return 1 / np.asarray(probability, dtype=float)
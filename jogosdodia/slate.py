@@ -0,0 +1,138 @@
+"""Avaliação em lote dos jogos do dia ("slate").
+
+Recebe a tabela de jogos (FootyStats: ``Home``/``Away`` e odds 1X2), liga cada
+time à sua linha de perfil (``names.resolve_league_teams``, entre os times da
+liga do jogo quando há ``Liga``; perfil e força do time lidos naquela liga) e calcula, de uma vez para todos os jogos, a
+expectativa de gols, as probabilidades Poisson (1X2, BTTS, Over 2.5, também
+combinadas com as frequências dos times em ``blend``), quem marca primeiro e
+em que minuto (``firstgoal``), as odds justas e o valor esperado contra as
+odds de mercado.
+
+É o mesmo modelo da aba "Analise" (λ do modelo de força ``strength`` ou, sem
+ele, ``expected_goals``, + ``score_matrix``), aplicado a arrays em vez de um
+jogo selecionado por vez.
+"""
+import numpy as np
+import pandas as pd
+
+from .blend import blend_goal_lines
+from .firstgoal import first_goal_slate
+from .names import resolve_league_teams, resolve_teams
+from .profile import get_league_profiles, get_team_profiles
+from .scoreline import btts, expected_goals, fair_odds, match_odds, over_under, score_matrix
+from .strength import get_strength_model
+
+# Colunas do perfil usadas pelo modelo
+PROFILE_COLUMNS = {
+    "home": {"ppg": "ft_PPG_Home", "gf": "ft_GF_AVG_Home"},
+    "away": {"ppg": "ft_PPG_Away", "gf": "ft_GF_AVG_Away"}
+}
+
+# Odds de mercado (FootyStats) comparadas com as probabilidades do modelo
+MARKET_ODDS = {"H": "Odd_H_FT", "D": "Odd_D_FT", "A": "Odd_A_FT"}
+
+FIXTURE_COLUMNS = ["Date", "Time", "League", "Liga", "Home", "Away"]
+
+
+def _profile_values(teams, side, field, leagues=None):
+    """Valor de ``field`` de cada time na liga do jogo; sem linha nela, no perfil principal"""
+    profiles = get_team_profiles(side)
+    column = PROFILE_COLUMNS[side][field]
+    if profiles.empty or column not in profiles.columns:
+        return np.full(len(teams), np.nan)
+    values = profiles[column].reindex(teams).to_numpy(dtype=float)
+    if leagues is None:
+        return values
+    by_league = get_league_profiles(side)[column]
+    in_league = by_league.reindex(pd.MultiIndex.from_arrays([teams, leagues])).to_numpy(dtype=float)
+    return np.where(np.isnan(in_league), values, in_league)
+
+
+def _best_outcome(slate, columns):
+    """Resultado (H/D/A) com o maior valor em ``columns``; vazio sem perfil"""
+    values = slate[columns].to_numpy(dtype=float)
+    best = np.where(np.isnan(values), -np.inf, values).argmax(axis=1)
+    outcomes = np.array([column[-1] for column in columns], dtype=object)[best]
+    return np.where(np.isnan(values).all(axis=1), None, outcomes)
+
+
+def _resolve(fixtures, column, league_column):
+    """Nomes de ``column`` nas tabelas de perfil (entre os times da liga, se houver ``league_column``)"""
+    if league_column in fixtures.columns:
+        return np.array(resolve_league_teams(fixtures[column], fixtures[league_column]), dtype=object)
+    return fixtures[column].map(resolve_teams(fixtures[column])).to_numpy()
+
+
+def evaluate_slate(fixtures, home_column="Home", away_column="Away", league_column="Liga"):
+    """Probabilidades do modelo para todos os jogos de ``fixtures``, ordenadas.
+
+    Jogos cujos times não têm perfil continuam na tabela (``Perfil = False``)
+    com probabilidades vazias, no fim da ordenação.
+    """
+    if fixtures is None or fixtures.empty:
+        return pd.DataFrame()
+
+    # Nomes do feed -> nomes das tabelas de perfil (aliases persistidos + rapidfuzz)
+    home_teams = _resolve(fixtures, home_column, league_column)
+    away_teams = _resolve(fixtures, away_column, league_column)
+
+    # Liga canônica de cada jogo: valores do perfil e força dos times naquela liga
+    leagues = fixtures[league_column].to_numpy(dtype=object) if league_column in fixtures.columns else None
+    ppg_home = _profile_values(home_teams, "home", "ppg", leagues)
+    ppg_away = _profile_values(away_teams, "away", "ppg", leagues)
+    gf_home = _profile_values(home_teams, "home", "gf", leagues)
+    gf_away = _profile_values(away_teams, "away", "gf", leagues)
+
+    xg_home, xg_away = get_strength_model().lambdas_many(home_teams, away_teams, leagues)
+    fallback_home, fallback_away = expected_goals(ppg_home, ppg_away, gf_home, gf_away)
+    without_model = np.isnan(xg_home) | np.isnan(xg_away)
+    xg_home = np.where(without_model, fallback_home, xg_home)
+    xg_away = np.where(without_model, fallback_away, xg_away)
+    matrices = score_matrix(xg_home, xg_away)
+    prob_home, prob_draw, prob_away = match_odds(matrices)
+    prob_over, _ = over_under(matrices, 2.5)
+    prob_btts = btts(matrices)
+
+    slate = fixtures[[c for c in FIXTURE_COLUMNS if c in fixtures.columns]].copy()
+    slate["Perfil"] = ~np.isnan(xg_home) & ~np.isnan(xg_away)
+    slate["xG_Home"] = xg_home
+    slate["xG_Away"] = xg_away
+    slate["Prob_H"] = prob_home
+    slate["Prob_D"] = prob_draw
+    slate["Prob_A"] = prob_away
+    slate["Prob_BTTS"] = prob_btts
+    slate["Prob_Over25"] = prob_over
+
+    # BTTS e Over 2.5 calibrados na liga e combinados com as frequências dos times (blend)
+    lines = blend_goal_lines(home_teams, away_teams, xg_home, xg_away, leagues)
+    slate["Prob_BTTS_Comb"] = lines["btts"].probability
+    slate["Prob_Over25_Comb"] = lines["over_25"].probability
+
+    # Primeiro gol (riscos competitivos, jogosdodia.firstgoal)
+    first = first_goal_slate(home_teams, away_teams)
+    slate["Prob_1G_H"] = first.home
+    slate["Prob_1G_A"] = first.away
+    slate["Minuto_1G"] = first.expected_minute
+    for outcome, probability in (("H", prob_home), ("D", prob_draw), ("A", prob_away)):
+        slate[f"Odd_Justa_{outcome}"] = fair_odds(probability)
+    slate["Odd_Justa_BTTS"] = fair_odds(prob_btts)
+    slate["Odd_Justa_Over25"] = fair_odds(prob_over)
+
+    # Valor esperado por unidade apostada: prob * odd de mercado - 1
+    ev_columns = []
+    for outcome, odd_column in MARKET_ODDS.items():
+        if odd_column in fixtures.columns:
+            market = pd.to_numeric(fixtures[odd_column], errors="coerce").to_numpy(dtype=float)
+            slate[odd_column] = market
+            slate[f"EV_{outcome}"] = slate[f"Prob_{outcome}"].to_numpy() * market - 1
+            ev_columns.append(f"EV_{outcome}")
+
+    if ev_columns:
+        slate["Melhor_EV"] = slate[ev_columns].max(axis=1)
+        slate["Aposta"] = _best_outcome(slate, ev_columns)
+        rank_column = "Melhor_EV"
+    else:
+        slate["Aposta"] = _best_outcome(slate, ["Prob_H", "Prob_D", "Prob_A"])
+        rank_column = "Prob_H"
+
+    return slate.sort_values(rank_column, ascending=False, na_position="last", kind="stable").reset_index(drop=True)
@@ -0,0 +1,138 @@
+"""Snapshots em disco (Feather) das tabelas já limpas e tipadas.
+
+Cada tabela é gravada como ``<chave>-<versão>.feather``, onde a versão é o
+hash do conteúdo de origem (o mesmo de ``data_version``). Um ``manifest.json``
+guarda, por chave, a versão atual, a URL de origem e quando o snapshot foi
+confirmado pela última vez. Num novo processo as tabelas são lidas do disco
+com memory-map em vez de baixadas e processadas de novo.
+
+Sem ``pyarrow`` instalado o armazenamento fica desativado e os apps seguem
+baixando os CSVs normalmente.
+"""
+import json
+import logging
+import os
+import threading
+import time
+
+try:
+    from pyarrow import feather
+except ImportError:  # pragma: no cover - pyarrow vem com o streamlit
+    feather = None
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = "manifest.json"
+
+
+class SnapshotStore:
+    """Diretório de snapshots Feather com um manifesto por chave"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return feather is not None and bool(self.directory)
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    # ----------------------------
+    # MANIFESTO
+    # ----------------------------
+    def manifest(self):
+        try:
+            with open(self._path(MANIFEST), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning("Manifesto de snapshots ilegível: %s", e)
+            return {}
+
+    def _write_json(self, name, content):
+        tmp = self._path(f"{name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(content, f, indent=1, sort_keys=True)
+        os.replace(tmp, self._path(name))
+
+    def _update_manifest(self, key, entry):
+        with self._lock:
+            manifest = self.manifest()
+            if entry is None:
+                manifest.pop(key, None)
+            else:
+                manifest[key] = entry
+            self._write_json(MANIFEST, manifest)
+
+    def entry(self, key, source=None):
+        """Entrada do manifesto para ``key`` (``None`` se não existe ou veio de outra origem)"""
+        if not self.enabled:
+            return None
+        entry = self.manifest().get(key)
+        if entry is None or (source is not None and entry.get("source") != source):
+            return None
+        return entry
+
+    # ----------------------------
+    # LEITURA E GRAVAÇÃO
+    # ----------------------------
+    def read(self, key, version):
+        """Tabela ``key`` na versão ``version`` (``None`` se o arquivo não existe)"""
+        if not self.enabled:
+            return None
+        path = self._path(f"{key}-{version}.feather")
+        try:
+            table = feather.read_table(path, memory_map=True)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("Snapshot ilegível %s: %s", path, e)
+            return None
+        return table.to_pandas()
+
+    def write(self, key, version, df, source=None, **extra):
+        """Grava ``df`` como versão atual de ``key`` e remove a versão anterior"""
+        if not self.enabled:
+            return False
+        filename = f"{key}-{version}.feather"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp = self._path(f"{filename}.{os.getpid()}.{threading.get_ident()}.tmp")
+            feather.write_feather(df.reset_index(drop=True), tmp)
+            os.replace(tmp, self._path(filename))
+            previous = self.entry(key)
+            self._update_manifest(key, {
+                "version": version, "file": filename, "source": source,
+                "saved": time.time(), "rows": len(df), **extra
+            })
+        except Exception as e:
+            logger.warning("Não foi possível gravar o snapshot de %s: %s", key, e)
+            return False
+
+        if previous and previous.get("file") not in (None, filename):
+            try:
+                os.remove(self._path(previous["file"]))
+            except OSError:
+                pass
+        return True
+
+    def touch(self, key, **extra):
+        """Marca o snapshot de ``key`` como confirmado agora (conteúdo não mudou)"""
+        entry = self.entry(key)
+        if entry is not None:
+            self._update_manifest(key, {**entry, "saved": time.time(), **extra})
+
+    def age(self, entry):
+        """Segundos desde a última confirmação de ``entry``"""
+        return time.time() - entry.get("saved", 0)
+
+    def clear(self):
+        """Apaga todos os snapshots e o manifesto"""
+        if not self.directory or not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            if name.endswith((".feather", ".json", ".tmp")):
+                os.remove(self._path(name))
@@ -0,0 +1,91 @@
+"""Filtros de estratégia aplicados à tabela de jogos do dia (FootyStats).
+
+Cada estratégia é uma regra vetorizada sobre o DataFrame do FootyStats
+(uma máscara booleana) e as colunas exibidas no app. Os limites são os
+mesmos que ficavam escritos dentro da aba "Jogos do Dia" do ``app.py``.
+"""
+from dataclasses import dataclass
+from typing import Callable
+
+import pandas as pd
+
+# Colunas que o arquivo do FootyStats precisa ter para os filtros
+REQUIRED_COLUMNS = {'PPG_Home', 'PPG_Away', 'Rodada', 'Odd_H_FT', 'Odd_DC_1X', 'League',
+                    'Date', 'Time', 'Home', 'Away', 'Odd_D_FT', 'Odd_A_FT', 'Odd_A_HT'}
+
+ODDS_COLUMNS = ('Time', 'Home', 'Away', 'Odd_H_FT', 'Odd_D_FT', 'Odd_A_FT')
+
+# Ligas (código FootyStats) fora do filtro "Back Home" com odd entre 1.9 e 2.2
+BACK_HOME_EXCLUDED_LEAGUES = [
+    'SOUTH KOREA 1', 'AUSTRIA 1', 'CHINA 1', 'ENGLAND 4', 'ESTONIA 1', 'GERMANY 2', 'IRELAND 1',
+    'NORWAY 1', 'NORWAY 2', 'POLAND 1', 'PORTUGAL 2', 'SLOVENIA 1', 'SLOVAKIA 1', 'SWITZERLAND 1'
+]
+
+
+@dataclass(frozen=True)
+class Strategy:
+    """Filtro nomeado: ``rule(df)`` devolve a máscara dos jogos selecionados"""
+    name: str
+    rule: Callable[[pd.DataFrame], pd.Series]
+    columns: tuple = ODDS_COLUMNS
+
+
+def _ha_025(df):
+    return (
+        (df['Rodada'] >= 10) &
+        (df['Odd_H_FT'].between(1.8, 2.0)) &
+        (df['PPG_Home'] >= 1.8) &
+        (df['PPG_Away'] <= 1.3)
+    )
+
+
+def _lay_visitante(df):
+    return (
+        (df['Rodada'] >= 5) &
+        (df['Odd_H_FT'] <= 2.4) &
+        (df['Odd_A_FT'] <= 12) &
+        (df['PPG_Home'] >= 1.8) &
+        (df['XG_Home_Pre'] >= 1.80)
+    )
+
+
+def _back_home_favorito(df):
+    return (
+        (df['Rodada'] >= 5) &
+        (df['Odd_H_FT'] >= 1.25) & (df['Odd_H_FT'] <= 1.9) &
+        (df['PPG_Away'] <= 0.50) &
+        (df['PPG_Home'] >= 1.50)
+    )
+
+
+def _back_home(df):
+    return (
+        (df['Rodada'] >= 5) &
+        (df['Odd_H_FT'] >= 1.9) &
+        (df['Odd_H_FT'] <= 2.20) &
+        (df['PPG_Home'] >= 1.8) &
+        ~df['League'].isin(BACK_HOME_EXCLUDED_LEAGUES)
+    )
+
+
+def _ha_mais_1(df):
+    return (
+        (df['Rodada'] >= 5) &
+        (df['Odd_H_FT'] >= 1.6) & (df['Odd_H_FT'] <= 2.4) &
+        (df['Odd_D_FT'] >= 3.5) & (df['Odd_D_FT'] <= 5.5) &
+        (df['PPG_Home'] <= 1.90) & (df['PPG_Away'] >= 1.30)
+    )
+
+
+STRATEGIES = [
+    Strategy("📈 HA 0.25", _ha_025, ODDS_COLUMNS + ('Odd_DC_1X',)),
+    Strategy("⚠️ Lay Visitante", _lay_visitante),
+    Strategy("💎 Back Home", _back_home_favorito),
+    Strategy("🎯 Back Home", _back_home),
+    Strategy("💰 HA +1", _ha_mais_1)
+]
+
+
+def apply_strategies(df, strategies=STRATEGIES):
+    """Lista ``[(estratégia, jogos selecionados), ...]`` na ordem de ``strategies``"""
+    return [(strategy, df[strategy.rule(df)]) for strategy in strategies]
@@ -0,0 +1,341 @@
+"""Modelo de força (ataque/defesa) por liga, ajustado aos totais de gols.
+
+Para cada liga o modelo é o Poisson multiplicativo de Maher/Dixon-Coles:
+
+    λ_casa = base · mando · ataque[casa] · defesa[fora]
+    λ_fora = base ·         ataque[fora] · defesa[casa]
+
+com ``defesa`` > 1 para quem sofre mais gols que a média. Os CSVs trazem só
+os totais por time (``GP``/``GF``/``GA`` em ``equipes_casa`` e
+``equipes_fora``), não os jogos, então o adversário de cada time é tratado
+como a média dos outros times da liga (tabela equilibrada) e o termo ρ de
+Dixon-Coles para placares baixos, que depende dos placares jogo a jogo, fica
+de fora.
+
+O ajuste é por máxima verossimilhança com atualizações de ponto fixo
+(ajuste proporcional iterativo): cada passo resolve a equação de score de
+ataques, defesas, mando e base com os demais fixos. Todas as ligas são
+ajustadas juntas, com somas por liga via ``np.bincount``; um ajuste anterior
+serve de ponto de partida (``init``), e quando um CSV muda o novo ajuste
+parte dos parâmetros antigos.
+
+``get_strength_model()`` guarda o modelo por ``data_version``;
+``lambdas(casa, fora)`` é uma consulta de dicionário e duas multiplicações.
+"""
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .data import data_version, get_dataset, load_datasets
+
+# Tabelas e colunas usadas no ajuste (totais da temporada por time)
+STRENGTH_SOURCES = {
+    "home": {"key": "home_df", "team": "Team_Home"},
+    "away": {"key": "away_df", "team": "Team_Away"}
+}
+LEAGUE_COLUMN = "Liga"
+
+# Gols "de média da liga" somados a cada time: evita força zero em quem não marcou
+PRIOR_GOALS = 1.0
+
+MAX_ITER = 500
+TOL = 1e-9
+
+FIT_COLUMNS = ["gp_home", "gf_home", "ga_home", "gp_away", "gf_away", "ga_away"]
+
+
+# ----------------------------
+# DADOS DE ENTRADA
+# ----------------------------
+def _side_totals(side):
+    source = STRENGTH_SOURCES[side]
+    df = get_dataset(source["key"])
+    columns = [LEAGUE_COLUMN, source["team"], "GP", "GF", "GA"]
+    if df.empty or any(column not in df.columns for column in columns):
+        return pd.DataFrame(columns=["league", "team", f"gp_{side}", f"gf_{side}", f"ga_{side}"])
+    frame = df[columns].astype({LEAGUE_COLUMN: "str", source["team"]: "str"})
+    frame.columns = ["league", "team", f"gp_{side}", f"gf_{side}", f"ga_{side}"]
+    return frame.dropna(subset=["league", "team"]).drop_duplicates(["league", "team"])
+
+
+def strength_inputs() -> pd.DataFrame:
+    """Uma linha por (liga, time) com jogos e gols pró/contra em casa e fora
+
+    Times que só aparecem num dos arquivos ficam com zero jogos do outro lado.
+    """
+    home = _side_totals("home")
+    away = _side_totals("away")
+    frame = home.merge(away, on=["league", "team"], how="left")
+    only_away = away.merge(home[["league", "team"]], on=["league", "team"], how="left", indicator=True)
+    only_away = only_away[only_away.pop("_merge") == "left_only"]
+    frame = pd.concat([frame, only_away], ignore_index=True)
+    frame[FIT_COLUMNS] = frame[FIT_COLUMNS].astype(float).fillna(0.0)
+    return frame
+
+
+# ----------------------------
+# AJUSTE
+# ----------------------------
+def _others_mean(values, codes, counts):
+    """Média dos outros times da liga (sem o próprio), por linha"""
+    totals = np.bincount(codes, weights=values, minlength=len(counts))
+    others = counts[codes] - 1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(others > 0, (totals[codes] - values) / others, 1.0)
+
+
+def _league_mean(values, codes, counts):
+    return (np.bincount(codes, weights=values, minlength=len(counts)) / counts)[codes]
+
+
+@dataclass
+class StrengthFit:
+    """Parâmetros ajustados: por time (``attack``/``defence``) e por liga (``base``/``home``)"""
+    teams: pd.DataFrame
+    leagues: pd.DataFrame
+    iterations: int
+    converged: bool
+
+
+def fit_strengths(frame, init=None, max_iter=MAX_ITER, tol=TOL) -> StrengthFit:
+    """Ajusta ataque/defesa de todos os times de ``frame`` (colunas de ``strength_inputs``)
+
+    ``init`` é um ``StrengthFit`` anterior: times e ligas que já existiam partem
+    dos parâmetros dele (warm start), os novos partem de 1.
+    """
+    frame = frame.reset_index(drop=True)
+    codes, leagues = pd.factorize(frame["league"])
+    counts = np.bincount(codes, minlength=len(leagues)).astype(float)
+    gp_home, gf_home, ga_home, gp_away, gf_away, ga_away = (frame[c].to_numpy(dtype=float) for c in FIT_COLUMNS)
+
+    attack = np.ones(len(frame))
+    defence = np.ones(len(frame))
+    base = np.ones(len(leagues))
+    home = np.ones(len(leagues))
+    if init is not None:
+        keys = pd.MultiIndex.from_arrays([frame["league"], frame["team"]])
+        previous = init.teams.set_index(["league", "team"]).reindex(keys)
+        attack = previous["attack"].fillna(1.0).to_numpy(dtype=float)
+        defence = previous["defence"].fillna(1.0).to_numpy(dtype=float)
+        previous_leagues = init.leagues.reindex(leagues)
+        base = previous_leagues["base"].fillna(1.0).to_numpy(dtype=float)
+        home = previous_leagues["home"].fillna(1.0).to_numpy(dtype=float)
+
+    goals_for = gf_home + gf_away
+    goals_against = ga_home + ga_away
+    home_goals = np.bincount(codes, weights=gf_home + ga_away, minlength=len(leagues))
+    total_goals = np.bincount(codes, weights=goals_for + goals_against, minlength=len(leagues))
+
+    converged = False
+    for iteration in range(1, max_iter + 1):
+        b, h = base[codes], home[codes]
+        defence_others = _others_mean(defence, codes, counts)
+        attack_others = _others_mean(attack, codes, counts)
+
+        # Equações de score de cada bloco com os demais fixos; PRIOR_GOALS puxa para a média (1)
+        exposure_attack = b * defence_others * (h * gp_home + gp_away)
+        exposure_defence = b * attack_others * (gp_home + h * gp_away)
+        new_attack = (goals_for + PRIOR_GOALS) / (exposure_attack + PRIOR_GOALS)
+        new_defence = (goals_against + PRIOR_GOALS) / (exposure_defence + PRIOR_GOALS)
+        # Identificação: média 1 por liga (o nível fica em ``base``)
+        new_attack /= _league_mean(new_attack, codes, counts)
+        new_defence /= _league_mean(new_defence, codes, counts)
+
+        defence_others = _others_mean(new_defence, codes, counts)
+        attack_others = _others_mean(new_attack, codes, counts)
+        scored_home = gp_home * new_attack * defence_others
+        conceded_away = gp_away * new_defence * attack_others
+        with np.errstate(divide="ignore", invalid="ignore"):
+            new_home = home_goals / (base * np.bincount(codes, weights=scored_home + conceded_away, minlength=len(leagues)))
+            expected = (
+                new_home[codes] * (scored_home + conceded_away)
+                + gp_home * new_defence * attack_others
+                + gp_away * new_attack * defence_others
+            )
+            new_base = total_goals / np.bincount(codes, weights=expected, minlength=len(leagues))
+        new_home = np.where(np.isfinite(new_home) & (new_home > 0), new_home, 1.0)
+        new_base = np.where(np.isfinite(new_base) & (new_base > 0), new_base, 1.0)
+
+        change = max(
+            np.abs(new_attack - attack).max(initial=0.0),
+            np.abs(new_defence - defence).max(initial=0.0),
+            np.abs(new_home - home).max(initial=0.0),
+            np.abs(new_base - base).max(initial=0.0)
+        )
+        attack, defence, home, base = new_attack, new_defence, new_home, new_base
+        if change < tol:
+            converged = True
+            break
+
+    teams = frame[["league", "team"]].assign(attack=attack, defence=defence)
+    league_table = pd.DataFrame(
+        {"base": base, "home": home, "teams": counts.astype(int)},
+        index=pd.Index(leagues, name="league")
+    )
+    return StrengthFit(teams, league_table, iteration if len(frame) else 0, converged)
+
+
+# ----------------------------
+# CONSULTA
+# ----------------------------
+def _codes(index, values):
+    """Posição de cada valor de ``values`` em ``index`` (-1 fora dele), com um ``get_indexer`` só sobre os distintos"""
+    codes, uniques = pd.factorize(values)
+    positions = np.append(index.get_indexer(uniques), -1)
+    return positions[codes]
+
+
+class StrengthModel:
+    """Consulta de λ casa/fora a partir de um ``StrengthFit``
+
+    Um time pode aparecer em mais de uma liga (campeonato nacional e
+    estadual, Apertura/Clausura). O jogo usa a liga dada (a ``Liga`` do
+    jogo), se os dois times estão nela; senão a primeira liga em comum entre
+    os dois; sem liga em comum, a primeira liga de cada um (ordem de
+    ``equipes_casa``), com base e mando da liga do mandante.
+    """
+
+    def __init__(self, fit):
+        self.fit = fit
+        leagues = fit.leagues.reindex(fit.teams["league"])
+        self._params = {}
+        self._leagues = {}
+        for league, team, attack, defence, base, home in zip(
+            fit.teams["league"].tolist(), fit.teams["team"].tolist(),
+            fit.teams["attack"].tolist(), fit.teams["defence"].tolist(),
+            leagues["base"].tolist(), leagues["home"].tolist()
+        ):
+            self._params[league, team] = (attack, defence, base, home)
+            self._leagues.setdefault(team, []).append(league)
+
+        # Mesmos parâmetros em arrays alinhados às linhas de ``fit.teams``, para ``lambdas_many``;
+        # cada linha tem a chave inteira ``código da liga * nº de times + código do time``
+        self._attack = fit.teams["attack"].to_numpy(dtype=float)
+        self._defence = fit.teams["defence"].to_numpy(dtype=float)
+        self._base = leagues["base"].to_numpy(dtype=float)
+        self._home = leagues["home"].to_numpy(dtype=float)
+        self._row_teams, self._teams = pd.factorize(fit.teams["team"])
+        self._row_leagues, self._league_names = pd.factorize(fit.teams["league"])
+        self._keys = pd.Index(self._row_leagues * len(self._teams) + self._row_teams)
+        self._first_rows, counts = np.unique(self._row_teams, return_index=True, return_counts=True)[1:]
+        self._several = counts > 1
+
+    def __contains__(self, team):
+        return team in self._leagues
+
+    def _match_leagues(self, home_team, away_team, league=None):
+        home_leagues = self._leagues.get(home_team)
+        away_leagues = self._leagues.get(away_team)
+        if not home_leagues or not away_leagues:
+            return None
+        if league in home_leagues and league in away_leagues:
+            return league, league
+        for league in home_leagues:
+            if league in away_leagues:
+                return league, league
+        return home_leagues[0], away_leagues[0]
+
+    def lambdas(self, home_team, away_team, league=None):
+        """``(λ_casa, λ_fora)`` do jogo (na liga ``league``, se dada), ou ``None`` se algum time não está no modelo"""
+        leagues = self._match_leagues(home_team, away_team, league)
+        if leagues is None:
+            return None
+        attack_home, defence_home, base, advantage = self._params[leagues[0], home_team]
+        attack_away, defence_away, _, _ = self._params[leagues[1], away_team]
+        return base * advantage * attack_home * defence_away, base * attack_away * defence_home
+
+    def lambdas_many(self, home_teams, away_teams, leagues=None):
+        """λ casa/fora para arrays de jogos (``NaN`` onde falta algum time); ``leagues``: liga de cada jogo
+
+        Mesmas regras de ``lambdas``, resolvidas por indexação: a linha de
+        cada time na liga dada, depois na primeira liga em comum e, por fim,
+        a primeira linha de cada um.
+        """
+        teams = _codes(self._teams, np.concatenate([np.asarray(home_teams, dtype=object), np.asarray(away_teams, dtype=object)]))
+        home_codes, away_codes = teams[:len(home_teams)], teams[len(home_teams):]
+        home_rows = np.full(len(home_codes), -1)
+        away_rows = np.full(len(away_codes), -1)
+        known = (home_codes >= 0) & (away_codes >= 0)
+
+        # Liga dada, com os dois times nela
+        if leagues is not None:
+            league_codes = _codes(self._league_names, np.asarray(leagues, dtype=object))
+            given = np.flatnonzero(known & (league_codes >= 0))
+            offset = league_codes[given] * len(self._teams)
+            home_given = self._keys.get_indexer(offset + home_codes[given])
+            away_given = self._keys.get_indexer(offset + away_codes[given])
+            found = (home_given >= 0) & (away_given >= 0)
+            home_rows[given[found]] = home_given[found]
+            away_rows[given[found]] = away_given[found]
+
+        # Primeira liga do mandante (na ordem das suas linhas) em que o visitante também está:
+        # a primeira de todas numa consulta direta, as seguintes só para quem tem mais de uma
+        rest = np.flatnonzero(known & (home_rows < 0))
+        home_first = self._first_rows[home_codes[rest]]
+        away_first = self._keys.get_indexer(self._row_leagues[home_first] * len(self._teams) + away_codes[rest])
+        found = away_first >= 0
+        home_rows[rest[found]] = home_first[found]
+        away_rows[rest[found]] = away_first[found]
+        rest = rest[~found & self._several[home_codes[rest]]]
+        if len(rest):
+            rows = pd.DataFrame({"league": self._row_leagues, "team": self._row_teams, "row": np.arange(len(self._keys))})
+            games = pd.DataFrame({"game": rest, "home": home_codes[rest], "away": away_codes[rest]})
+            common = (
+                games.merge(rows.rename(columns={"team": "home", "row": "home_row"}), on="home")
+                .merge(rows.rename(columns={"team": "away", "row": "away_row"}), on=["away", "league"])
+                .sort_values("home_row", kind="stable")
+                .drop_duplicates("game")
+            )
+            home_rows[common["game"].to_numpy()] = common["home_row"].to_numpy()
+            away_rows[common["game"].to_numpy()] = common["away_row"].to_numpy()
+
+        # Sem liga em comum: a primeira linha de cada time
+        rest = known & (home_rows < 0)
+        home_rows[rest] = self._first_rows[home_codes[rest]]
+        away_rows[rest] = self._first_rows[away_codes[rest]]
+
+        # Base e mando da liga do mandante; jogos sem um dos times ficam NaN
+        valid = home_rows >= 0
+        home_rows, away_rows = home_rows[valid], away_rows[valid]
+        base = self._base[home_rows]
+        lambda_home = np.full(len(home_codes), np.nan)
+        lambda_away = np.full(len(home_codes), np.nan)
+        lambda_home[valid] = base * self._home[home_rows] * self._attack[home_rows] * self._defence[away_rows]
+        lambda_away[valid] = base * self._attack[away_rows] * self._defence[home_rows]
+        return lambda_home, lambda_away
+
+
+# ----------------------------
+# CACHE POR VERSÃO DOS DADOS
+# ----------------------------
+_model = None
+_lock = threading.Lock()
+
+
+def get_strength_model() -> StrengthModel:
+    """Modelo ajustado para a versão atual de ``equipes_casa``/``equipes_fora``
+
+    Quando os CSVs mudam, o novo ajuste parte dos parâmetros do anterior.
+    """
+    global _model
+    keys = [source["key"] for source in STRENGTH_SOURCES.values()]
+    load_datasets(keys)
+    version = data_version(keys)
+
+    cached = _model
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    with _lock:
+        cached = _model
+        if cached is None or cached[0] != version:
+            init = cached[1].fit if cached is not None else None
+            cached = _model = (version, StrengthModel(fit_strengths(strength_inputs(), init=init)))
+    return cached[1]
+
+
+def strength_lambdas(home_team, away_team):
+    """``(λ_casa, λ_fora)`` do modelo de força, ou ``None`` sem um dos times"""
+    return get_strength_model().lambdas(home_team, away_team)
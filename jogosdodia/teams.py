@@ -0,0 +1,143 @@
+"""Universo de times da barra lateral, montado uma vez por versão dos dados.
+
+Substitui a lista ``sorted(set(...))`` que os apps recalculavam a cada rerun
+sobre as colunas de time de várias tabelas. ``get_team_universe(keys)`` junta
+as colunas de time de ``keys`` uma única vez por ``data_version`` e devolve:
+
+- ``teams``: array ordenado com os nomes (opções do ``selectbox``);
+- ``positions``: time -> posição em ``teams`` (``index=`` do ``selectbox``);
+- ``coverage``: por time, a liga e em quais tabelas ele aparece.
+
+Nomes válidos são os que têm ao menos uma letra, de qualquer alfabeto; o
+filtro antigo ``^[A-Za-z\\s]+$`` descartava times com acento ou número
+(``Atlético``, ``1. FC Köln``). Os nomes recusados ficam em ``rejected``.
+"""
+import re
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .data import DATASETS, data_version, get_dataset, load_datasets
+
+# Tabelas da lista de times de cada app (app.py/appft.py: "ft"; appht.py: "ht")
+SIDEBAR_KEYS = {
+    "ft": [
+        "home_df", "away_df", "away_fav_df", "overall_df", "home_fg_df", "away_fg_df",
+        "goal_minute_home_df", "goal_minute_away_df", "goals_half_df",
+        "goals_per_time_home_df", "goals_per_time_away_df", "ppg_ht_home_df", "ppg_ht_away_df"
+    ],
+    "ht": [
+        "home_fg_df", "away_fg_df", "goal_minute_home_df", "goal_minute_away_df", "goals_half_df",
+        "goals_per_time_home_df", "goals_per_time_away_df", "ppg_ht_home_df", "ppg_ht_away_df"
+    ]
+}
+
+# Ao menos uma letra (``\w`` sem dígitos e sem ``_``), com ou sem acento
+VALID_NAME = r"[^\W\d_]"
+_VALID_NAME = re.compile(VALID_NAME)
+
+
+@dataclass(frozen=True)
+class TeamUniverse:
+    """Times de um conjunto de tabelas, com posição e cobertura por tabela"""
+    keys: tuple
+    teams: np.ndarray
+    positions: dict
+    coverage: pd.DataFrame
+    rejected: tuple = ()
+
+    def __len__(self):
+        return len(self.teams)
+
+    def __contains__(self, team):
+        return team in self.positions
+
+    def index(self, team, default=0):
+        """Posição de ``team`` nas opções (``default`` se o time não existe)"""
+        return self.positions.get(team, default)
+
+    def coverage_summary(self):
+        """Por tabela: quantos times do universo ela tem e a fração (0-100)"""
+        counts = self.coverage[list(self.keys)].sum()
+        total = max(len(self.teams), 1)
+        return pd.DataFrame({"teams": counts, "percent": (counts / total * 100).round(1)})
+
+
+def _team_leagues(key):
+    """Times da tabela ``key`` e a liga da primeira linha de cada um (dois arrays)"""
+    dataset = DATASETS[key]
+    df = get_dataset(key)
+    if df.empty or dataset.team_column not in df.columns:
+        return np.array([], dtype=object), np.array([], dtype=object)
+    # factorize é direto nos códigos quando a coluna é ``category``
+    codes, teams = pd.factorize(df[dataset.team_column])
+    _, first = np.unique(codes, return_index=True)
+    first = first[codes[first] >= 0]
+    if dataset.league_column in df.columns:
+        leagues = df[dataset.league_column].iloc[first].to_numpy(dtype=object)
+    else:
+        leagues = np.full(len(first), None, dtype=object)
+    return np.array(teams.tolist(), dtype=object), leagues
+
+
+def build_team_universe(keys) -> TeamUniverse:
+    """Monta o universo de times das tabelas ``keys`` (sem cache)"""
+    keys = tuple(dict.fromkeys(keys))
+    sources = [_team_leagues(key) for key in keys]
+
+    # Um único factorize sobre os times de todas as tabelas; as posições no
+    # array ordenado saem da ordem (argsort) dos nomes distintos
+    names = np.concatenate([teams for teams, _ in sources])
+    codes, uniques = pd.factorize(names)
+    valid = np.array([_VALID_NAME.search(name) is not None for name in uniques], dtype=bool)
+    order = np.argsort(uniques[valid], kind="stable")
+    rank = np.full(len(uniques), -1, dtype=np.intp)
+    rank[np.flatnonzero(valid)[order]] = np.arange(len(order))
+
+    teams = uniques[valid][order]
+    positions = dict(zip(teams.tolist(), range(len(teams))))
+    rejected = tuple(sorted(uniques[~valid]))
+
+    # Matriz time x tabela e a liga da primeira tabela de ``keys`` que conhece o time
+    rows = rank[codes]
+    columns = np.repeat(np.arange(len(keys)), [len(teams) for teams, _ in sources])
+    leagues = np.concatenate([leagues for _, leagues in sources])
+    known = rows >= 0
+    flags = np.zeros((len(teams), len(keys)), dtype=bool)
+    flags[rows[known], columns[known]] = True
+
+    team_leagues = np.full(len(teams), None, dtype=object)
+    with_league = np.flatnonzero(known & pd.notna(leagues))
+    # Atribuição na ordem inversa: a primeira tabela que conhece o time escreve por último
+    team_leagues[rows[with_league[::-1]]] = leagues[with_league[::-1]]
+
+    coverage = pd.DataFrame(flags, index=pd.Index(teams, name="team"), columns=list(keys))
+    coverage.insert(0, "sources", flags.sum(axis=1))
+    coverage.insert(0, "league", team_leagues)
+    return TeamUniverse(keys, teams, positions, coverage, rejected)
+
+
+# ----------------------------
+# CACHE POR VERSÃO DOS DADOS
+# ----------------------------
+_universes = {}
+_lock = threading.Lock()
+
+
+def get_team_universe(keys) -> TeamUniverse:
+    """Universo de times de ``keys``, reconstruído só quando alguma dessas tabelas muda"""
+    keys = tuple(dict.fromkeys(keys))
+    load_datasets(keys)
+    version = data_version(keys)
+
+    cached = _universes.get(keys)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    with _lock:
+        cached = _universes.get(keys)
+        if cached is None or cached[0] != version:
+            cached = _universes[keys] = (version, build_team_universe(keys))
+    return cached[1]
@@ -0,0 +1,51 @@
+"""Componentes HTML dos apps (renderizados com ``st.markdown(..., unsafe_allow_html=True)``).
+
+A barra de frequência de gols mostrava um ``<div>`` por ponto percentual,
+concatenado com ``html +=`` (até ~100 elementos por barra). Aqui cada faixa
+de gols é um único segmento com largura em porcentagem da barra (1% por
+ponto percentual), então a barra cabe em qualquer largura de coluna; os
+blocos de 1% continuam visíveis por um gradiente repetido no fundo. O HTML
+de cada combinação de frequências é gerado uma vez e reaproveitado.
+"""
+import functools
+
+import pandas as pd
+
+# Cor de cada faixa de gols (0, 1, 2, 3, 4+)
+GOAL_COLORS = {
+    "0": "#d9534f",
+    "1": "#20de6e",
+    "2": "#16ed48",
+    "3": "#24da1e",
+    "4": "#56b72d"
+}
+
+# Proporção entre um bloco (1%) e o espaço depois dele
+BLOCK_WIDTH = 6
+BLOCK_GAP = 2
+
+
+@functools.lru_cache(maxsize=4096)
+def _frequency_bar(blocks):
+    fill = f"{100 * BLOCK_WIDTH / (BLOCK_WIDTH + BLOCK_GAP):g}%"
+    # Segmento com ``count``% da largura e ``count`` blocos (o gradiente repete a cada 1/count)
+    segments = "".join(
+        f'<div style="flex:0 0 {count}%;height:20px;margin:1px 0;'
+        f'background:linear-gradient(90deg,{color} 0 {fill},transparent {fill} 100%) 0 0/calc(100% / {count}) 100% repeat-x">'
+        '</div>'
+        for color, count in blocks if count > 0
+    )
+    return f'<div style="display:flex;flex-wrap:wrap;padding-left:1px">{segments}</div>'
+
+
+def frequency_bar(frequencies, colors=None):
+    """HTML da barra de frequência: ``{"0": 25.0, "1": 40.0, ...}`` -> um segmento por faixa
+
+    Cada ponto percentual (parte inteira) vale um bloco; ``NaN`` conta como zero.
+    """
+    colors = GOAL_COLORS if colors is None else colors
+    blocks = tuple(
+        (colors[goals], 0 if pd.isna(freq) else int(freq))
+        for goals, freq in frequencies.items()
+    )
+    return _frequency_bar(blocks)
@@ -0,0 +1,22 @@
+"""Configuração comum dos testes: CSVs do próprio repositório e cache isolado."""
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Antes de importar o pacote: CACHE_DIR é lido na importação
+os.environ["JOGOSDODIA_CACHE_DIR"] = tempfile.mkdtemp(prefix="jogosdodia-tests-")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from jogosdodia.data import set_base_url  # noqa: E402
+
+
+@pytest.fixture
+def local_data():
+    """Dados lidos dos CSVs da raiz do repositório"""
+    set_base_url(ROOT)
+    return ROOT
@@ -0,0 +1,37 @@
+"""Calibração por liga com ajuste cruzado por time."""
+import numpy as np
+
+from jogosdodia.blend import MARKETS, Calibration, fit_calibration, team_folds
+
+
+def _inputs(count=200, seed=3):
+    rng = np.random.default_rng(seed)
+    model = {market: rng.uniform(0.2, 0.8, count) for market in MARKETS}
+    return {
+        "team": np.array([f"Time {index}" for index in range(count)], dtype=object),
+        "league": np.array(["Liga A", "Liga B"] * (count // 2), dtype=object),
+        "games": rng.integers(5, 30, count).astype(float),
+        **{f"model_{market}": values for market, values in model.items()},
+        **{f"observed_{market}": np.clip(values + rng.normal(0, 0.1, count), 0, 1) for market, values in model.items()}
+    }
+
+
+def test_team_frequencies_do_not_shape_their_own_curves():
+    inputs = _inputs()
+    changed = {**inputs, "observed_over_25": inputs["observed_over_25"].copy()}
+    changed["observed_over_25"][0] = 1.0 - changed["observed_over_25"][0]
+
+    before, after = fit_calibration(inputs), fit_calibration(changed)
+    team, other = inputs["team"][0], inputs["team"][1:]
+    # Curvas dos jogos de "Time 0": iguais com qualquer adversário
+    rows = Calibration.pair_rows([team] * len(other), other)
+    np.testing.assert_array_equal(before.curves[rows], after.curves[rows])
+    # As demais usam a frequência alterada
+    unused = np.setdiff1d(np.arange(len(before.curves)), rows)
+    assert not np.array_equal(before.curves[unused], after.curves[unused])
+
+
+def test_pair_rows_are_symmetric():
+    teams = [f"Time {index}" for index in range(50)]
+    assert len(set(team_folds(teams))) > 1
+    np.testing.assert_array_equal(Calibration.pair_rows(teams, teams[::-1]), Calibration.pair_rows(teams[::-1], teams))
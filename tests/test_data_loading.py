@@ -0,0 +1,102 @@
+"""Carga das tabelas por HTTP: ``_fetch_all`` em paralelo, erros por tabela e revalidação."""
+import functools
+import glob
+import os
+import shutil
+import threading
+import time
+from dataclasses import replace
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+
+from jogosdodia import data
+from jogosdodia.snapshot import SnapshotStore
+
+from conftest import ROOT
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def served(monkeypatch, tmp_path):
+    """Cópia dos CSVs do repositório servida por HTTP, sem snapshots em disco"""
+    for path in glob.glob(os.path.join(ROOT, "*.csv")):
+        shutil.copy(path, tmp_path)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(_QuietHandler, directory=str(tmp_path)))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(data, "_snapshots", SnapshotStore(None))
+    data.set_base_url(f"http://127.0.0.1:{server.server_address[1]}")
+    yield tmp_path
+    server.shutdown()
+    server.server_close()
+    # Desfaz as trocas do teste antes de voltar aos CSVs locais
+    monkeypatch.undo()
+    data.set_base_url(ROOT)
+
+
+def test_parallel_load_matches_sequential(served):
+    keys = list(data.DATASETS)
+    sequential = {key: data._load_dataset(data.DATASETS[key]) for key in keys}
+    data.clear_cache()
+
+    parallel = data._fetch_all(keys)
+    assert list(parallel) == keys
+    for key in keys:
+        assert parallel[key][1] == sequential[key][1]
+        pd.testing.assert_frame_equal(parallel[key][0], sequential[key][0])
+
+    data.clear_cache()
+    frames = data.load_datasets(keys)
+    assert list(frames) == keys
+    assert data.load_errors() == {}
+    for key in keys:
+        pd.testing.assert_frame_equal(frames[key], sequential[key][0])
+        assert data.table_versions()[key] == sequential[key][1]
+
+
+def test_failing_url_marks_only_its_key(served, monkeypatch):
+    keys = list(data.DATASETS)
+    broken = keys[0]
+    dataset = data.DATASETS[broken]
+    monkeypatch.setitem(data.DATASETS, broken, replace(dataset, url=dataset.url.replace(".csv", "_inexistente.csv")))
+
+    frames = data.load_datasets(keys)
+    assert list(data.load_errors()) == [broken]
+    assert frames[broken].empty
+    versions = data.table_versions()
+    assert versions[broken] == "erro"
+    for key in keys[1:]:
+        assert versions[key] != "erro"
+        assert not frames[key].empty
+
+
+def test_refresh_swaps_only_changed_tables(served):
+    keys = ["home_df", "away_df"]
+    data.load_datasets(keys)
+    versions = data.table_versions()
+    team = data.get_dataset("home_df")["Team_Home"].iloc[-1]
+    assert not data.lookup("home_df", team).empty
+
+    # Remove o último time de equipes_casa.csv (mtime adiantado: o 304 compara segundos)
+    path = served / os.path.basename(data.DATASETS["home_df"].url)
+    lines = path.read_text(encoding="utf-8-sig").splitlines(keepends=True)
+    path.write_text("".join(lines[:-1]), encoding="utf-8")
+    os.utime(path, (time.time() + 10, time.time() + 10))
+
+    assert data.refresh_if_stale(max_age=3600) is False
+    assert data.refresh_if_stale(max_age=1e-9) is True
+    deadline = time.time() + 30
+    while data._refreshing.is_set() and time.time() < deadline:
+        time.sleep(0.01)
+
+    assert data.table_versions()["home_df"] != versions["home_df"]
+    assert data.table_versions()["away_df"] == versions["away_df"]
+    assert data.lookup("home_df", team).empty
+    # Só as tabelas já carregadas são revalidadas
+    assert set(data.table_versions()) == set(keys)
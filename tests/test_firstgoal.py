@@ -0,0 +1,50 @@
+"""Riscos competitivos do primeiro gol (``first_goal_from_hazards``)."""
+import numpy as np
+import pytest
+
+from jogosdodia.firstgoal import first_goal_from_hazards
+
+
+def _curves(band_rates):
+    """Intensidade acumulada ``(jogos, 91)`` a partir de gols por minuto em cada faixa de 15"""
+    per_minute = np.repeat(np.atleast_2d(band_rates), 15, axis=1)
+    return np.concatenate([np.zeros((len(per_minute), 1)), np.cumsum(per_minute, axis=1)], axis=1)
+
+
+HOME = _curves([[0.012, 0.014, 0.017, 0.016, 0.019, 0.024], [0.030, 0.030, 0.030, 0.030, 0.030, 0.030]])
+AWAY = _curves([[0.009, 0.010, 0.012, 0.012, 0.014, 0.018], [0.001, 0.002, 0.002, 0.003, 0.003, 0.004]])
+
+
+@pytest.mark.parametrize("shift", [0.0, 0.7, np.array([-1.2, 2.0])])
+def test_outcomes_and_bands_add_up(shift):
+    result = first_goal_from_hazards(HOME, AWAY, shift)
+    np.testing.assert_allclose(result.home + result.away + result.none, 1.0, atol=1e-12)
+    np.testing.assert_allclose(result.home_bands.sum(axis=1), result.home, atol=1e-12)
+    np.testing.assert_allclose(result.away_bands.sum(axis=1), result.away, atol=1e-12)
+    assert result.home_bands.shape == result.away_bands.shape == (2, 6)
+    # Sem gol: exp(-(H_casa + H_fora)) aos 90 minutos
+    np.testing.assert_allclose(result.none, np.exp(-(HOME[:, -1] + AWAY[:, -1])))
+
+
+def test_equal_hazards_split_evenly():
+    result = first_goal_from_hazards(HOME, HOME, 0.0)
+    np.testing.assert_allclose(result.home, result.away, atol=1e-12)
+    np.testing.assert_allclose(result.home_bands, result.away_bands, atol=1e-12)
+    np.testing.assert_allclose(result.home, (1 - result.none) / 2, atol=1e-12)
+
+
+def test_constant_hazards_match_closed_form():
+    home, away = 0.02, 0.01
+    result = first_goal_from_hazards(_curves([[home] * 6]), _curves([[away] * 6]))
+    scored = 1 - np.exp(-(home + away) * 90)
+    assert result.home[0] == pytest.approx(home / (home + away) * scored)
+    assert result.away[0] == pytest.approx(away / (home + away) * scored)
+
+
+def test_shift_moves_the_split_but_not_the_timing():
+    base = first_goal_from_hazards(HOME, AWAY, 0.0)
+    shifted = first_goal_from_hazards(HOME, AWAY, 0.8)
+    assert np.all(shifted.home > base.home)
+    np.testing.assert_allclose(shifted.none, base.none)
+    np.testing.assert_allclose(shifted.expected_minute, base.expected_minute)
+    np.testing.assert_allclose(shifted.median_minute, base.median_minute)
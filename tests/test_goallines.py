@@ -0,0 +1,58 @@
+"""Frequências de linhas de gols por time e por confronto (``goallines``)."""
+import numpy as np
+import pytest
+
+from jogosdodia.goallines import FIELDS, GOAL_LINES, get_goal_line_store, goal_lines, team_goal_lines
+
+UNKNOWN = "Zzqx Xyzzy FC"
+OVERS = [f"over_{str(line).replace('.', '')}" for line in GOAL_LINES]
+
+
+def _total_goals(overs):
+    """P(0, 1, …, 5, 6+ gols) implícita nas linhas de over 0.5 … 5.5"""
+    overs = np.asarray(overs, dtype=float)
+    return np.concatenate([[1 - overs[0]], overs[:-1] - overs[1:], [overs[-1]]])
+
+
+def test_team_goal_lines_leave_unknown_teams_empty(local_data):
+    values = team_goal_lines(["Arsenal", UNKNOWN, "Flamengo"], "home")
+    assert values.shape == (3, len(FIELDS))
+    assert np.isnan(values[1]).all()
+    assert not np.isnan(values[[0, 2]]).any()
+
+    store = get_goal_line_store("home")
+    np.testing.assert_array_equal(values[0], store.values[store.row("Arsenal")])
+
+
+def test_team_goal_lines_use_the_league_row(local_data):
+    store = get_goal_line_store("home")
+    team, league = next(key for key in store.rows if store.rows[key] != store.teams[key[0]])
+    values = team_goal_lines([team, team], "home", [None, league])
+    np.testing.assert_array_equal(values[0], store.values[store.teams[team]])
+    np.testing.assert_array_equal(values[1], store.values[store.rows[team, league]])
+
+
+@pytest.mark.parametrize("side", ["home", "away", "overall"])
+def test_stored_over_lines_are_monotone_and_add_up(local_data, side):
+    store = get_goal_line_store(side)
+    overs = store.values[:, [store.fields[name] for name in OVERS]].astype(float)
+    assert np.all((overs >= 0) & (overs <= 1))
+    assert np.all(np.diff(overs, axis=1) <= 1e-6)
+    totals = np.apply_along_axis(_total_goals, 1, overs)
+    np.testing.assert_allclose(totals.sum(axis=1), 1.0, atol=1e-6)
+
+
+def test_match_lines_average_both_sides(local_data):
+    lines = goal_lines("Arsenal", "Chelsea", "Premier League")
+    home = team_goal_lines(["Arsenal"], "home", ["Premier League"])[0]
+    away = team_goal_lines(["Chelsea"], "away", ["Premier League"])[0]
+    fields = get_goal_line_store("home").fields
+
+    overs = [getattr(lines, name) for name in OVERS]
+    assert overs == pytest.approx([(home[fields[name]] + away[fields[name]]) / 2 for name in OVERS])
+    assert all(later <= earlier for earlier, later in zip(overs, overs[1:]))
+    assert _total_goals(overs).sum() == pytest.approx(1.0)
+    assert np.all(_total_goals(overs) >= -1e-6)
+    assert 0 <= lines.home_scores <= 1 and 0 <= lines.away_scores <= 1
+
+    assert goal_lines("Arsenal", UNKNOWN) is None
@@ -0,0 +1,45 @@
+"""Cadeia de Markov dos gols por faixa de 15 minutos (``InPlayEngine``)."""
+import numpy as np
+import pytest
+
+from jogosdodia.inplay import BAND_MINUTES, InPlayEngine, transition_matrix
+from jogosdodia.scoreline import match_odds, score_matrix
+
+# Gols por minuto em cada faixa (0-15 … 76-90), crescendo ao longo do jogo
+HOME_RATES = np.array([0.012, 0.014, 0.017, 0.016, 0.019, 0.024])
+AWAY_RATES = np.array([0.009, 0.010, 0.012, 0.012, 0.014, 0.018])
+
+
+@pytest.mark.parametrize("mu", [0.0, 0.05, 1.3, 4.0])
+def test_transition_rows_sum_to_one(mu):
+    matrix = transition_matrix(mu)
+    np.testing.assert_allclose(matrix.sum(axis=1), 1.0, atol=1e-12)
+    # Gols não diminuem, e o último estado ("MAX_GOALS ou mais") é absorvente
+    assert np.all(np.tril(matrix, -1) == 0)
+    assert matrix[-1, -1] == pytest.approx(1.0)
+
+
+def test_full_match_from_kickoff_is_independent_poisson():
+    engine = InPlayEngine(HOME_RATES, AWAY_RATES)
+    distribution = engine.score_distribution(90)
+    mu_home, mu_away = HOME_RATES.sum() * BAND_MINUTES, AWAY_RATES.sum() * BAND_MINUTES
+
+    assert engine.expected_goals() == pytest.approx((mu_home, mu_away))
+    # Fora do último estado (que acumula a cauda) é exatamente a matriz de Poisson
+    expected = score_matrix(mu_home, mu_away)
+    np.testing.assert_allclose(distribution[:-1, :-1], expected[:-1, :-1], rtol=1e-12)
+    assert distribution.sum() == pytest.approx(1.0, abs=1e-12)
+
+
+def test_ht_ft_is_a_distribution_consistent_with_each_half():
+    engine = InPlayEngine(HOME_RATES, AWAY_RATES)
+    table = engine.ht_ft()
+    assert table.shape == (3, 3)
+    # Só falta a cauda acima de MAX_GOALS gols por tempo
+    assert table.sum() == pytest.approx(1.0, abs=1e-6)
+
+    # Linhas: resultado no intervalo; colunas: resultado final
+    half_time = match_odds(engine.score_distribution(45))
+    full_time = match_odds(engine.score_distribution(90))
+    np.testing.assert_allclose(table.sum(axis=1), half_time, atol=1e-6)
+    np.testing.assert_allclose(table.sum(axis=0), full_time, atol=1e-6)
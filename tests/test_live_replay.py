@@ -0,0 +1,33 @@
+"""Replay de jogos ao vivo sintéticos (``benchmarks/replay.py``) como testes."""
+import pytest
+
+from jogosdodia import live
+from replay import CHECKPOINTS, replay, synthetic_matches
+
+
+@pytest.fixture
+def replayed(local_data):
+    return replay(synthetic_matches(20, seed=7))
+
+
+def test_replay_has_no_problems(replayed):
+    _, _, problems = replayed
+    assert problems == []
+
+
+def test_replay_brier_falls_during_the_match(replayed):
+    _, brier, _ = replayed
+    assert list(brier) == list(CHECKPOINTS)
+    values = list(brier.values())
+    assert all(later <= earlier for earlier, later in zip(values, values[1:]))
+
+
+def test_live_match_cache_is_bounded(local_data, monkeypatch):
+    monkeypatch.setattr(live, "MAX_MATCHES", 3)
+    home = live.get_live_rates("home").index[:5]
+    away = live.get_live_rates("away").index[5:6]
+    matches = [live.live_match(team, away[0]) for team in home]
+    assert len(live._matches) == 3
+    # O mais recente continua em cache; o primeiro saiu e é refeito
+    assert live.live_match(home[-1], away[0]) is matches[-1]
+    assert live.live_match(home[0], away[0]) is not matches[0]
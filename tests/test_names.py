@@ -0,0 +1,26 @@
+"""Tabela de aliases compartilhada pelos resolvedores de nomes."""
+import json
+import threading
+
+from jogosdodia.names import NameResolver
+
+
+def test_concurrent_resolvers_keep_every_kind(tmp_path):
+    path = str(tmp_path / "aliases.json")
+    resolvers = [NameResolver(f"teams/Liga {index}", path=path) for index in range(8)]
+
+    def resolve(resolver, index):
+        for round_ in range(10):
+            name = f"Time {index} {round_}"
+            resolver.resolve_many([name], [name], version=str(round_))
+
+    threads = [threading.Thread(target=resolve, args=(r, i)) for i, r in enumerate(resolvers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    with open(path, encoding="utf-8") as f:
+        content = json.load(f)
+    assert {kind for kind in content if kind.startswith("teams/")} == {r.kind for r in resolvers}
+    assert [p.name for p in tmp_path.iterdir()] == ["aliases.json"]
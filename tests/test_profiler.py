@@ -0,0 +1,38 @@
+"""Perfil de renderização com sessões simultâneas."""
+import threading
+import time
+import tracemalloc
+
+from jogosdodia.profiler import RenderProfiler
+
+
+def test_concurrent_sessions_do_not_wait_for_each_other():
+    first, second = RenderProfiler("a", enabled=True, path=None), RenderProfiler("b", enabled=True, path=None)
+    inside = threading.Event()
+    elapsed = {}
+
+    def measure_first():
+        with first.section("outer"):
+            values = [0] * 10000
+            inside.set()
+            time.sleep(0.3)
+            del values
+
+    def measure_second():
+        inside.wait()
+        start = time.perf_counter()
+        with second.section("outer"):
+            pass
+        elapsed["second"] = time.perf_counter() - start
+
+    threads = [threading.Thread(target=measure_first), threading.Thread(target=measure_second)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert elapsed["second"] < 0.2
+    assert first.sections["outer"]["allocated"] is not None
+    # Sessão que começou durante a medição da outra: só o tempo
+    assert second.sections["outer"]["allocated"] is None
+    assert not tracemalloc.is_tracing()
@@ -0,0 +1,76 @@
+"""Conversão dos textos dos CSVs (``parse_csv`` + ``ingest``) e registro das falhas."""
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from jogosdodia import data
+from jogosdodia.schema import ingest
+from jogosdodia.snapshot import SnapshotStore
+
+FIRST_GOAL_CSV = (
+    "\ufeffTeam_Home,Matches,Perc.,W,D,L,Goals,Pts,PPG,League\n"
+    "Independiente,6 out of 8,75%,6,0,0,15 - 1,18,3.00,argentina\n"
+    "Boca Juniors ,7 out of 8,38.5%,7,0,0,14-2,21,\"2,5\",argentina\n"
+    "Lanus,seis de oito,-,1,0,0,3 - x,3,,argentina\n"
+).encode("utf-8")
+
+
+def test_first_goal_columns_are_typed():
+    result = ingest("first_goal", data.parse_csv(FIRST_GOAL_CSV))
+    df = result.frame
+
+    # "Perc." vira "First_Gol" e é convertida no lugar; "-" é falta de dado, não falha
+    assert "Perc." not in df.columns
+    assert df["First_Gol"].dtype == np.float64
+    np.testing.assert_array_equal(df["First_Gol"], [75.0, 38.5, np.nan])
+
+    # "out of" e placares em duas colunas numéricas, com o texto original mantido
+    for column in ("Matches_Scored_First", "Matches_Total", "Goals_For", "Goals_Against"):
+        assert df[column].dtype == np.float64
+    np.testing.assert_array_equal(df["Matches_Scored_First"], [6.0, 7.0, np.nan])
+    np.testing.assert_array_equal(df["Matches_Total"], [8.0, 8.0, np.nan])
+    np.testing.assert_array_equal(df["Goals_For"], [15.0, 14.0, np.nan])
+    np.testing.assert_array_equal(df["Goals_Against"], [1.0, 2.0, np.nan])
+    assert df["Matches"].tolist() == ["6 out of 8", "7 out of 8", "seis de oito"]
+
+    # Número com vírgula decimal
+    np.testing.assert_array_equal(df["PPG"], [3.0, 2.5, np.nan])
+
+    assert result.failure_count == 2
+    assert result.failures == [(2, "Matches", "seis de oito"), (2, "Goals", "3 - x")]
+
+
+def test_goals_per_time_minutes_and_pairs():
+    content = (
+        "League,Team_Home,GP,0-15,16-30,31-45,46-60,61-75,76-90,,1st H.,2nd H.,,AVG_Scored_Home,AVG_Conceded_Home\n"
+        "Argentina - Liga Profesional,A. Tucuman,8,1-2,3-1,4-2,1-1,1-2,3-2,,8-5,5-5,,49 min.,47 min.\n"
+    ).encode("utf-8")
+    df = ingest("goals_per_time", data.parse_csv(content)).frame
+    assert df.loc[0, "0-15_Scored"] == 1.0 and df.loc[0, "0-15_Conceded"] == 2.0
+    assert df.loc[0, "1st H._Scored"] == 8.0 and df.loc[0, "2nd H._Conceded"] == 5.0
+    assert df["AVG_Scored_Home"].dtype == np.float64
+    assert df.loc[0, "AVG_Scored_Home"] == 49.0
+
+
+@pytest.fixture
+def first_goal_file(monkeypatch, tmp_path):
+    """Tabela ``home_fg_df`` lida de um CSV em ``tmp_path``, sem snapshots e sem sujar o estado global"""
+    path = tmp_path / "scored_first_home.csv"
+    path.write_bytes(FIRST_GOAL_CSV)
+    monkeypatch.setattr(data, "_snapshots", SnapshotStore(None))
+    for name in ("_failures", "_memory", "_errors", "_timings"):
+        monkeypatch.setattr(data, name, {})
+    return replace(data.DATASETS["home_fg_df"], url=str(path))
+
+
+def test_malformed_cells_reach_parse_failures(first_goal_file):
+    df, version = data._load_dataset(first_goal_file)
+    assert version != "erro"
+    assert df["Team_Home"].tolist() == ["Independiente", "Boca Juniors", "Lanus"]
+    assert df["Matches_Scored_First"].tolist()[:2] == [6.0, 7.0]
+
+    failures = data.parse_failures()
+    assert failures == {
+        "home_fg_df": {"count": 2, "cells": [[2, "Matches", "seis de oito"], [2, "Goals", "3 - x"]]}
+    }
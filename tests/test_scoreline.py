@@ -0,0 +1,74 @@
+"""Matriz de placares e mercados derivados, contra contas feitas à mão."""
+import math
+
+import numpy as np
+import pytest
+
+from jogosdodia.scoreline import asian_handicap, btts, match_odds, over_under, score_matrix
+
+
+def _pmf(mu, goals):
+    return math.exp(-mu) * mu ** goals / math.factorial(goals)
+
+
+@pytest.mark.parametrize("mu_home, mu_away", [(0.4, 0.3), (1.2, 0.8), (2.6, 1.9)])
+def test_score_matrix_mass_matches_poisson_with_tail(mu_home, mu_away):
+    matrix = score_matrix(mu_home, mu_away)
+    size = matrix.shape[-1]
+    # O que fica fora da matriz é só a cauda acima de ``max_goals`` de cada lado
+    inside = sum(_pmf(mu_home, k) for k in range(size)) * sum(_pmf(mu_away, k) for k in range(size))
+    assert matrix.sum() == pytest.approx(inside, abs=1e-12)
+    assert matrix.sum() == pytest.approx(1.0, abs=1e-4)
+    assert score_matrix(mu_home, mu_away, max_goals=40).sum() == pytest.approx(1.0, abs=1e-12)
+
+
+def test_score_matrix_stacks_games():
+    matrices = score_matrix([1.2, 2.0], [0.8, 0.5])
+    assert matrices.shape == (2, 11, 11)
+    np.testing.assert_allclose(matrices[1], score_matrix(2.0, 0.5))
+
+
+def test_markets_match_hand_computed_pair():
+    mu_home, mu_away = 1.2, 0.8
+    matrix = score_matrix(mu_home, mu_away, max_goals=30)
+    cells = [(h, a, _pmf(mu_home, h) * _pmf(mu_away, a)) for h in range(31) for a in range(31)]
+
+    home, draw, away = match_odds(matrix)
+    assert home == pytest.approx(sum(p for h, a, p in cells if h > a), abs=1e-12)
+    assert draw == pytest.approx(sum(p for h, a, p in cells if h == a), abs=1e-12)
+    assert away == pytest.approx(sum(p for h, a, p in cells if h < a), abs=1e-12)
+    assert home + draw + away == pytest.approx(1.0, abs=1e-12)
+
+    # Ambos marcam: (1 - e^-λc)(1 - e^-λf)
+    assert btts(matrix) == pytest.approx((1 - math.exp(-mu_home)) * (1 - math.exp(-mu_away)), abs=1e-12)
+
+    # Total de gols ~ Poisson(λc + λf = 2): under 2.5 = e^-2 (1 + 2 + 2)
+    over, under = over_under(matrix, 2.5)
+    assert under == pytest.approx(5 * math.exp(-2), abs=1e-12)
+    assert over == pytest.approx(1 - 5 * math.exp(-2), abs=1e-12)
+
+
+def _three_outcomes():
+    # 1x0 com 50%, 0x0 com 30%, 0x1 com 20%
+    matrix = np.zeros((3, 3))
+    matrix[1, 0], matrix[0, 0], matrix[0, 1] = 0.5, 0.3, 0.2
+    return matrix
+
+
+@pytest.mark.parametrize("line, win, push, loss", [
+    # -0.25 = metade em -0.5 (ganha 0.5) e metade em 0 (ganha 0.5, devolve 0.3)
+    (-0.25, 0.5, 0.15, 0.35),
+    # -0.75 = metade em -1 (devolve 0.5) e metade em -0.5 (ganha 0.5)
+    (-0.75, 0.25, 0.25, 0.5),
+    # +0.25 = metade em 0 (ganha 0.5, devolve 0.3) e metade em +0.5 (ganha 0.8)
+    (0.25, 0.65, 0.15, 0.2),
+    (-1.0, 0.0, 0.5, 0.5),
+])
+def test_asian_handicap_quarter_lines_split_the_stake(line, win, push, loss):
+    result = asian_handicap(_three_outcomes(), line)
+    assert result.win == pytest.approx(win)
+    assert result.push == pytest.approx(push)
+    assert result.loss == pytest.approx(loss)
+    assert result.win + result.push + result.loss == pytest.approx(1.0)
+    if win:
+        assert result.fair_odds == pytest.approx(1 + loss / win)
@@ -0,0 +1,63 @@
+"""Avaliação em lote dos jogos do dia (``evaluate_slate``)."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from jogosdodia.scoreline import btts, match_odds, over_under, score_matrix
+from jogosdodia.slate import evaluate_slate
+from jogosdodia.strength import get_strength_model
+
+PROBABILITIES = ["xG_Home", "xG_Away", "Prob_H", "Prob_D", "Prob_A", "Prob_BTTS", "Prob_Over25"]
+
+
+@pytest.fixture
+def slate(local_data):
+    fixtures = pd.DataFrame({
+        "Home": ["Arsenal", "Zzqx Xyzzy FC", "Flamengo"],
+        "Away": ["Chelsea", "Qwvx Yyzz", "Palmeiras"],
+        "Liga": ["Premier League", "Nowhere - Liga", "Brazil - Serie A"],
+        "Odd_H_FT": [1.9, 2.0, 2.2],
+        "Odd_D_FT": [3.6, 3.2, 3.1],
+        "Odd_A_FT": [4.2, 3.5, 3.4],
+    })
+    return evaluate_slate(fixtures)
+
+
+def test_unknown_teams_stay_in_the_slate_without_probabilities(slate):
+    assert len(slate) == 3
+    unknown = slate.iloc[-1]
+    assert unknown["Home"] == "Zzqx Xyzzy FC"
+    assert not unknown["Perfil"]
+    assert unknown[PROBABILITIES].isna().all()
+    assert pd.isna(unknown["Aposta"])
+    assert slate["Perfil"].iloc[:2].all()
+
+
+def test_known_games_match_the_single_game_model(slate):
+    model = get_strength_model()
+    for _, game in slate[slate["Perfil"]].iterrows():
+        lambdas = model.lambdas(game["Home"], game["Away"], game["Liga"])
+        assert (game["xG_Home"], game["xG_Away"]) == pytest.approx(lambdas)
+
+        matrix = score_matrix(*lambdas)
+        assert (game["Prob_H"], game["Prob_D"], game["Prob_A"]) == pytest.approx(match_odds(matrix))
+        assert game["Prob_BTTS"] == pytest.approx(btts(matrix))
+        assert game["Prob_Over25"] == pytest.approx(over_under(matrix, 2.5)[0])
+        assert game["Prob_H"] + game["Prob_D"] + game["Prob_A"] == pytest.approx(1.0, abs=1e-4)
+        assert game["Prob_1G_H"] + game["Prob_1G_A"] <= 1.0
+
+
+def test_expected_value_and_ranking(slate):
+    known = slate[slate["Perfil"]]
+    for outcome in "HDA":
+        expected = known[f"Prob_{outcome}"] * known[f"Odd_{outcome}_FT"] - 1
+        np.testing.assert_allclose(known[f"EV_{outcome}"], expected)
+    best = known[["EV_H", "EV_D", "EV_A"]].to_numpy()
+    np.testing.assert_allclose(known["Melhor_EV"], best.max(axis=1))
+    assert known["Aposta"].tolist() == [column[-1] for column in np.array(["EV_H", "EV_D", "EV_A"])[best.argmax(axis=1)]]
+    assert known["Melhor_EV"].is_monotonic_decreasing
+
+
+def test_empty_fixtures_give_an_empty_slate():
+    assert evaluate_slate(pd.DataFrame()).empty
+    assert evaluate_slate(None).empty